@@ -1,6 +1,404 @@
-def main():
-    print("Hello from compute-node-cli!")
+import argparse
+import asyncio
+import os
+import platform
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# The profile is read by the compute service, so it is built from the service's own models
+COMPUTE_SERVICE_DIR = Path(
+    os.environ.get(
+        "SPLITUP_CLIENT_COMPUTE_SERVICE_DIR",
+        Path(__file__).resolve().parents[2] / "services" / "compute-service",
+    )
+)
+sys.path.insert(0, str(COMPUTE_SERVICE_DIR))
+
+from src.models import (  # noqa: E402
+    DeviceBenchmark,
+    EncodingBenchmark,
+    NodeProfile,
+    ThroughputBenchmark,
+)
+from src.storage import DEFAULT_DOWNLOAD_DIR_PATH  # noqa: E402
+from src.tinygrad_backend.cost_model import NodeCalibration  # noqa: E402
+from src.tinygrad_backend.serialize_tensors import (  # noqa: E402
+    TensorEncoding,
+    TensorSerializer,
+)
+from tinygrad import Device, Tensor, dtypes  # noqa: E402
+from tinygrad.device import is_dtype_supported  # noqa: E402
+
+# Default location of the profile, where the compute service looks for it
+DEFAULT_PROFILE_PATH = Path.home() / ".splitup" / "node-profile.json"
+
+# Backends probed by --devices all; the others are not compute devices
+PROBED_DEVICES = ("CUDA", "NV", "AMD", "HIP", "METAL", "GPU", "QCOM", "WEBGPU", "LLVM", "CLANG")
+
+# Dtypes whose matmul throughput is measured
+BENCHMARK_DTYPES = {
+    "float32": dtypes.float32,
+    "float16": dtypes.float16,
+    "bfloat16": dtypes.bfloat16,
+    "int8": dtypes.int8,
+}
+
+# Encodings whose serialization rates are measured
+BENCHMARK_ENCODINGS = ("raw", "zstd", "float16", "zstd+float16")
+
+#####
+# Logic For Timing
+#####
+
+
+def best_time(fn: Callable[[], None], repeats: int) -> float:
+    """Run fn once to warm up, then return its fastest of `repeats` runs in seconds."""
+    fn()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+#####
+# Logic For Benchmarking Devices
+#####
+
+
+def available_devices(requested: str) -> List[str]:
+    """Resolve --devices to backend names, keeping only those that open."""
+    if requested == "default":
+        return [Device.DEFAULT]
+    names = PROBED_DEVICES if requested == "all" else requested.upper().split(",")
+
+    devices = []
+    for name in names:
+        try:
+            Device[name]
+            devices.append(name)
+        except Exception:
+            continue
+    return devices
+
+
+def benchmark_device(device: str, matmul_size: int, transfer_bytes: int, repeats: int) -> DeviceBenchmark:
+    """Measure matmul throughput per dtype, memory bandwidth, transfers and launch overhead."""
+    result = DeviceBenchmark(device=device)
+    sync = Device[device].synchronize
+
+    for dtype_name, dtype in BENCHMARK_DTYPES.items():
+        if not is_dtype_supported(dtype, device):
+            continue
+        try:
+            a = Tensor.rand(matmul_size, matmul_size, device=device).cast(dtype).realize()
+            b = Tensor.rand(matmul_size, matmul_size, device=device).cast(dtype).realize()
+
+            def matmul():
+                (a @ b).realize()
+                sync()
+
+            result.flops[dtype_name] = 2 * matmul_size**3 / best_time(matmul, repeats)
+        except Exception as e:
+            result.errors[f"flops.{dtype_name}"] = str(e)
+
+    elements = transfer_bytes // 4
+    host = np.random.default_rng(0).standard_normal(elements, dtype=np.float32)
+
+    try:
+        x = Tensor(host, device=device).realize()
+
+        def copy():
+            (x + 1).realize()
+            sync()
+
+        # One read and one write per element
+        result.memory_bandwidth = 2 * host.nbytes / best_time(copy, repeats)
+    except Exception as e:
+        result.errors["memory_bandwidth"] = str(e)
+
+    try:
+
+        def upload():
+            Tensor(host, device=device).realize()
+            sync()
+
+        result.host_to_device = host.nbytes / best_time(upload, repeats)
+    except Exception as e:
+        result.errors["host_to_device"] = str(e)
+
+    try:
+        x = Tensor(host, device=device).realize()
+        result.device_to_host = host.nbytes / best_time(lambda: x.numpy(), repeats)
+    except Exception as e:
+        result.errors["device_to_host"] = str(e)
+
+    try:
+        one = Tensor([1.0], device=device).realize()
+
+        def launch():
+            (one + 1).realize()
+            sync()
+
+        result.launch_overhead = best_time(launch, repeats * 10)
+    except Exception as e:
+        result.errors["launch_overhead"] = str(e)
+
+    return result
+
+
+#####
+# Logic For Benchmarking Storage
+#####
+
+
+def benchmark_disk(directory: Path, nbytes: int) -> ThroughputBenchmark:
+    """
+    Measure writing and reading a file in the object cache directory.
+
+    Writes are flushed to disk before they are timed as done. The file was
+    just written, so the read may be served from the page cache and is an
+    upper bound on cold reads.
+    """
+    result = ThroughputBenchmark(location=str(directory))
+    data = os.urandom(nbytes)
+
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directory, prefix=".benchmark-") as f:
+            start = time.perf_counter()
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            result.write = nbytes / (time.perf_counter() - start)
+
+            with open(f.name, "rb") as g:
+                start = time.perf_counter()
+                while g.read(1 << 24):
+                    pass
+                result.read = nbytes / (time.perf_counter() - start)
+    except Exception as e:
+        result.error = str(e)
+
+    return result
+
+
+async def benchmark_storage(nbytes: int) -> ThroughputBenchmark:
+    """
+    Measure uploading and downloading an object through the service's storage path.
+
+    Only the SPLITUP_STORAGE_* settings are needed. The object goes to
+    remote storage whole, bypassing chunking and the local store, and is
+    deleted afterwards along with its download.
+    """
+    from src.environment import load_env_config
+    from src.storage import StorageConfig, StorageService
+
+    config = load_env_config(StorageConfig)
+    if config.status == "failure":
+        return ThroughputBenchmark(location="unconfigured", error=config.error)
+
+    try:
+        storage_service = StorageService(
+            config.data.model_copy(update={"SPLITUP_STORAGE_LOCAL_STORE_DIR": None})
+        )
+    except Exception as e:
+        return ThroughputBenchmark(location="unconfigured", error=str(e))
+
+    result = ThroughputBenchmark(location=storage_service.config.SPLITUP_STORAGE_API_ENDPOINT)
+    key = f"benchmark/{platform.node()}-{uuid.uuid4()}.bin"
+
+    try:
+        with tempfile.NamedTemporaryFile(prefix=".benchmark-") as f:
+            f.write(os.urandom(nbytes))
+            f.flush()
+
+            start = time.perf_counter()
+            put_result = await storage_service.put_object(key, f.name, chunked=False)
+            if put_result.status == "failure":
+                result.error = put_result.error
+                return result
+            result.write = nbytes / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        get_result = await storage_service.get_object(key)
+        if get_result.status == "failure":
+            result.error = get_result.error
+            return result
+        result.read = nbytes / (time.perf_counter() - start)
+    finally:
+        deleted = await storage_service.delete_object(key)
+        if deleted.status == "failure":
+            result.error = result.error or deleted.error
+
+    return result
+
+
+#####
+# Logic For Benchmarking Serialization
+#####
+
+
+def benchmark_serializer(nbytes: int, repeats: int) -> Dict[str, EncodingBenchmark]:
+    """Measure TensorSerializer encode and decode rates of a float32 tensor per encoding."""
+    host = np.random.default_rng(0).standard_normal(nbytes // 4, dtype=np.float32)
+    tensor = Tensor(host).realize()
+
+    results = {}
+    for spec in BENCHMARK_ENCODINGS:
+        encoding = TensorEncoding.parse(spec)
+        data = TensorSerializer.tensor_to_bytes(tensor, encoding)
+        encode = best_time(lambda: TensorSerializer.tensor_to_bytes(tensor, encoding), repeats)
+        decode = best_time(lambda: TensorSerializer.tensor_from_bytes(data).realize(), repeats)
+        results[spec] = EncodingBenchmark(
+            encode=host.nbytes / encode,
+            decode=host.nbytes / decode,
+            ratio=host.nbytes / len(data),
+        )
+    return results
+
+
+#####
+# Logic For Building The Profile
+#####
+
+
+def calibration_from(device: DeviceBenchmark) -> NodeCalibration:
+    """Cost model constants of a device, keeping defaults for anything not measured."""
+    defaults = NodeCalibration()
+    return NodeCalibration(
+        peak_flops=device.flops.get("float32", defaults.peak_flops),
+        memory_bandwidth=device.memory_bandwidth or defaults.memory_bandwidth,
+        copy_bandwidth=device.host_to_device or defaults.copy_bandwidth,
+        launch_overhead=device.launch_overhead or defaults.launch_overhead,
+    )
+
+
+def command_benchmark(args: argparse.Namespace) -> int:
+    devices = available_devices(args.devices)
+    if not devices:
+        print(f"No Usable Devices In: {args.devices}", file=sys.stderr)
+        return 1
+
+    profile = NodeProfile(
+        created_at=int(time.time()),
+        hostname=platform.node(),
+        default_device=devices[0],
+    )
+
+    for device in devices:
+        print(f"Benchmarking {device}...", file=sys.stderr)
+        profile.devices.append(
+            benchmark_device(
+                device,
+                matmul_size=args.matmul_size,
+                transfer_bytes=args.transfer_size * 2**20,
+                repeats=args.repeats,
+            )
+        )
+
+    print(f"Benchmarking Disk At {args.cache_dir}...", file=sys.stderr)
+    profile.disk = benchmark_disk(Path(args.cache_dir), args.disk_size * 2**20)
+
+    if not args.skip_storage:
+        print("Benchmarking Storage Endpoint...", file=sys.stderr)
+        profile.storage = asyncio.run(benchmark_storage(args.transfer_size * 2**20))
+
+    print("Benchmarking Tensor Serialization...", file=sys.stderr)
+    profile.serializer = benchmark_serializer(args.transfer_size * 2**20, args.repeats)
+
+    profile.calibration = calibration_from(profile.devices[0]).to_dict()
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(profile.model_dump_json(indent=2))
+
+    print_profile(profile)
+    print(f"Wrote Node Profile To {output}", file=sys.stderr)
+    return 0
+
+
+def print_profile(profile: NodeProfile) -> None:
+    """Print a readable summary of a profile."""
+
+    def rate(value: Optional[float], unit: str = "B/s") -> str:
+        return "-" if value is None else f"{value / 1e9:.3f} G{unit}"
+
+    for device in profile.devices:
+        print(f"{device.device}:")
+        for dtype, flops in device.flops.items():
+            print(f"  matmul {dtype:<10} {rate(flops, 'FLOP/s')}")
+        print(f"  memory bandwidth  {rate(device.memory_bandwidth)}")
+        print(f"  host to device    {rate(device.host_to_device)}")
+        print(f"  device to host    {rate(device.device_to_host)}")
+        if device.launch_overhead is not None:
+            print(f"  launch overhead   {device.launch_overhead * 1e6:.1f} us")
+        for name, error in device.errors.items():
+            print(f"  {name} failed: {error.splitlines()[0] if error else ''}")
+
+    for label, throughput in (("disk", profile.disk), ("storage", profile.storage)):
+        if throughput is None:
+            continue
+        print(f"{label} ({throughput.location}):")
+        if throughput.error:
+            print(f"  failed: {throughput.error}")
+        else:
+            print(f"  write {rate(throughput.write)}, read {rate(throughput.read)}")
+
+    print("serializer:")
+    for spec, rates in profile.serializer.items():
+        print(
+            f"  {spec:<14} encode {rate(rates.encode)}, decode {rate(rates.decode)}, "
+            f"ratio {rates.ratio:.2f}"
+        )
+
+
+#####
+# Logic For The Command Line
+#####
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="splitup-node")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    benchmark = commands.add_parser(
+        "benchmark", help="Measure the node's performance and write its profile"
+    )
+    benchmark.add_argument(
+        "--devices",
+        default="default",
+        help='Backends to measure: "default", "all" or a comma-separated list, e.g. CUDA,CLANG',
+    )
+    benchmark.add_argument(
+        "--output", default=str(DEFAULT_PROFILE_PATH), help="Where to write the profile"
+    )
+    benchmark.add_argument(
+        "--cache-dir", default=str(DEFAULT_DOWNLOAD_DIR_PATH), help="Object cache directory"
+    )
+    benchmark.add_argument("--matmul-size", type=int, default=1024, help="Matmul side length")
+    benchmark.add_argument(
+        "--transfer-size", type=int, default=64, help="MiB moved per transfer measurement"
+    )
+    benchmark.add_argument(
+        "--disk-size", type=int, default=256, help="MiB written and read from disk"
+    )
+    benchmark.add_argument("--repeats", type=int, default=3, help="Timed runs per measurement")
+    benchmark.add_argument(
+        "--skip-storage", action="store_true", help="Do not measure the storage endpoint"
+    )
+    benchmark.set_defaults(handler=command_benchmark)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,6 +1,303 @@
-def main():
-    print("Hello from model-deploy-cli!")
+import argparse
+import io
+import json
+import os
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+# Programs are pickled, so they must be built from the same modules the compute service loads
+COMPUTE_SERVICE_DIR = Path(
+    os.environ.get(
+        "SPLITUP_CLIENT_COMPUTE_SERVICE_DIR",
+        Path(__file__).resolve().parents[2] / "services" / "compute-service",
+    )
+)
+sys.path.insert(0, str(COMPUTE_SERVICE_DIR))
+
+from src.tinygrad_backend.core import GraphProgram  # noqa: E402
+from src.tinygrad_backend.partitioning import auto_partition  # noqa: E402
+from src.tinygrad_backend.quantization import should_quantize  # noqa: E402
+from src.tinygrad_backend.storage_manager import get_uuid_from_bytes  # noqa: E402
+from src.tinygrad_backend.weight_shards import WeightManifest, shard_weights  # noqa: E402
+from tinygrad.nn.state import safe_load  # noqa: E402
+
+# Placeholder prefix of the tensors passed between partitions
+BOUNDARY_PREFIX = "partition"
+
+#####
+# Logic For Uploading Content-Addressed Objects
+#####
+
+
+@dataclass
+class UploadStats:
+    """What an upload run did."""
+
+    uploaded: int = 0
+    skipped: int = 0
+    bytes_uploaded: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+class Uploader:
+    """
+    Uploads objects in parallel, skipping keys that already exist.
+
+    At most `jobs` objects upload at once, each as a multipart transfer when
+    large, and at most twice that many are held in memory waiting.
+    """
+
+    def __init__(self, s3_client, bucket: str, jobs: int, chunk_size: int):
+        self.s3 = s3_client
+        self.bucket = bucket
+        self.stats = UploadStats()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(jobs * 2)
+        self._executor = ThreadPoolExecutor(max_workers=jobs)
+        self._futures: List[Future] = []
+        self._transfer = TransferConfig(
+            multipart_threshold=chunk_size,
+            multipart_chunksize=chunk_size,
+            max_concurrency=4,
+        )
+
+    def submit(self, key: str, data: bytes, overwrite: bool = False) -> None:
+        """Queue an object for upload, blocking while too many are pending."""
+        self._slots.acquire()
+        future = self._executor.submit(self._upload, key, data, overwrite)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    def wait(self) -> UploadStats:
+        """Wait for every queued upload to finish."""
+        for future in self._futures:
+            future.result()
+        self._futures.clear()
+        return self.stats
+
+    def close(self) -> UploadStats:
+        """Wait for every queued upload, then stop the upload threads."""
+        stats = self.wait()
+        self._executor.shutdown()
+        return stats
+
+    def _upload(self, key: str, data: bytes, overwrite: bool) -> None:
+        try:
+            if not overwrite and self._exists(key):
+                with self._lock:
+                    self.stats.skipped += 1
+                return
+
+            self.s3.upload_fileobj(
+                io.BytesIO(data), self.bucket, key, Config=self._transfer
+            )
+            with self._lock:
+                self.stats.uploaded += 1
+                self.stats.bytes_uploaded += len(data)
+        except Exception as e:
+            with self._lock:
+                self.stats.errors.append(f"{key}: {str(e)}")
+
+    def _exists(self, key: str) -> bool:
+        try:
+            self.s3.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+
+#####
+# Logic For Deploying Models
+#####
+
+
+def content_key(prefix: str, data: bytes, suffix: str) -> str:
+    """Storage key derived from an object's content."""
+    return f"{prefix}/{get_uuid_from_bytes(data)}{suffix}"
+
+
+def deploy_model(
+    program: GraphProgram,
+    weights: Dict[str, Any],
+    uploader: Uploader,
+    name: str,
+    target_vram: int,
+    key_prefix: str,
+    bits: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Partition a model and upload its programs, weight shards and description.
+
+    The description replaces the previous deployment's, so it is uploaded
+    only once everything it points at has been stored.
+
+    Returns:
+        Dict[str, Any]: The deployment description, also uploaded
+
+    Raises:
+        ValueError: If the model cannot be partitioned or an upload failed
+    """
+    partitions = auto_partition(program, target_vram, boundary_prefix=BOUNDARY_PREFIX)
+    if isinstance(partitions, ValueError):
+        raise partitions
+
+    stages = []
+    for index, partition in enumerate(partitions):
+        data = partition.to_bytes()
+        key = content_key(f"{key_prefix}/tasks", data, ".pkl")
+        uploader.submit(key, data)
+
+        boundary = f"{BOUNDARY_PREFIX}_{index - 1}" if index > 0 else None
+        stages.append(
+            {
+                "task_storage_key": key,
+                "input_placeholder": boundary,
+                "inputs": [
+                    ph.name
+                    for ph in partition.placeholders
+                    if ph.name != boundary and ph.name not in weights
+                ],
+            }
+        )
+
+    # Shard one tensor at a time so only the pending uploads are held in memory
+    shards = {}
+    for tensor_name, tensor in weights.items():
+        quantize = bits is not None and should_quantize(tensor, min_elements=4096)
+        manifest, blobs = shard_weights(
+            {tensor_name: tensor},
+            key_prefix=f"{key_prefix}/weights",
+            bits=bits if quantize else None,
+        )
+        shards.update(manifest.shards)
+        for key, data in blobs.items():
+            uploader.submit(key, data)
+
+    manifest_data = WeightManifest(shards).to_bytes()
+    manifest_key = content_key(f"{key_prefix}/manifests", manifest_data, ".json")
+    uploader.submit(manifest_key, manifest_data)
+
+    deployment = {
+        "name": name,
+        "target_vram": target_vram,
+        "stages": stages,
+        "weights_manifest_key": manifest_key,
+    }
+    failed = len(uploader.wait().errors)
+    if failed:
+        raise ValueError(f"{failed} Uploads Failed, Deployment Description Not Updated")
+
+    deployment_data = json.dumps(deployment, indent=2).encode()
+    uploader.submit(f"{key_prefix}/{name}.json", deployment_data, overwrite=True)
+    return deployment
+
+
+#####
+# Logic For The Command Line
+#####
+
+
+def create_s3_client(endpoint: Optional[str], region: str):
+    """Create an S3 client; credentials come from the usual AWS settings."""
+    return boto3.client(
+        "s3",
+        region_name=region,
+        endpoint_url=endpoint,
+        config=Config(signature_version="s3v4", region_name=region),
+    )
+
+
+def command_deploy(args: argparse.Namespace) -> int:
+    with open(args.model, "rb") as f:
+        program = GraphProgram.from_bytes(f.read())
+    if isinstance(program, ValueError):
+        print(f"Error Importing Model: {program}", file=sys.stderr)
+        return 1
+
+    weights = safe_load(args.weights) if args.weights else {}
+
+    if not args.bucket:
+        print("No Bucket Given: Set SPLITUP_CLIENT_S3_BUCKET Or --bucket", file=sys.stderr)
+        return 1
+
+    uploader = Uploader(
+        create_s3_client(args.endpoint, args.region),
+        args.bucket,
+        jobs=args.jobs,
+        chunk_size=args.chunk_size * 2**20,
+    )
+
+    try:
+        deployment = deploy_model(
+            program,
+            weights,
+            uploader,
+            name=args.name,
+            target_vram=int(args.target_vram * 2**30),
+            key_prefix=args.key_prefix,
+            bits=args.quantize,
+        )
+    except ValueError as e:
+        for error in uploader.close().errors:
+            print(f"Upload Failed: {error}", file=sys.stderr)
+        print(f"Error Deploying Model: {e}", file=sys.stderr)
+        return 1
+
+    stats = uploader.close()
+    for error in stats.errors:
+        print(f"Upload Failed: {error}", file=sys.stderr)
+
+    print(json.dumps(deployment, indent=2))
+    print(
+        f"{len(deployment['stages'])} Partitions, {stats.uploaded} Objects Uploaded "
+        f"({stats.bytes_uploaded / 2**20:.1f} MiB), {stats.skipped} Already Stored",
+        file=sys.stderr,
+    )
+    return 1 if stats.errors else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="splitup-deploy")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    deploy = commands.add_parser(
+        "deploy", help="Partition a model and upload its programs and weights"
+    )
+    deploy.add_argument("--model", required=True, help="Serialized GraphProgram of the model")
+    deploy.add_argument("--weights", help="Safetensors file of the model's weights")
+    deploy.add_argument("--name", required=True, help="Name of the deployment")
+    deploy.add_argument(
+        "--target-vram", type=float, required=True, help="Memory budget per partition, in GiB"
+    )
+    deploy.add_argument(
+        "--quantize", type=int, choices=(8, 4), help="Store weights quantized to this many bits"
+    )
+    deploy.add_argument("--key-prefix", default="models", help="Storage key prefix")
+    deploy.add_argument("--jobs", type=int, default=8, help="Objects uploaded at once")
+    deploy.add_argument(
+        "--chunk-size", type=int, default=64, help="Multipart chunk size, in MiB"
+    )
+    deploy.add_argument("--bucket", default=os.environ.get("SPLITUP_CLIENT_S3_BUCKET"))
+    deploy.add_argument("--endpoint", default=os.environ.get("SPLITUP_CLIENT_S3_ENDPOINT"))
+    deploy.add_argument(
+        "--region", default=os.environ.get("SPLITUP_CLIENT_S3_REGION", "eu-west-2")
+    )
+    deploy.set_defaults(handler=command_deploy)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -184,6 +184,19 @@ export interface PromiseRejectedResult {
   reason: unknown;
 }
 
+/**
+ * Capacity snapshot reported by the compute service
+ */
+export interface NodeCapacity {
+  queue_depth: number;
+  active_executions: number;
+  free_device_memory: number | null; // bytes
+  free_host_memory: number | null; // bytes
+  resident_models: string[];
+  cached_programs: number;
+  throughput: number; // completed executions per second
+}
+
 /**
  * Status update from compute service to heartbeat service
  */
@@ -191,6 +204,7 @@ export interface ComputeStatus {
   status: "offline" | "idle" | "busy" | "error";
   hasCapacity: boolean;
   lastUpdated: number; // timestamp
+  capacity?: NodeCapacity | null;
 }
 
 /**
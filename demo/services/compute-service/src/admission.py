@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+from tinygrad.helpers import GlobalCounters
+from .result import create_success, create_failure, Result
+
+
+# Memory-aware admission control
+class MemoryAdmission:
+    """
+    Admits Tasks Only When Their Estimated Peak Memory Fits On The Device.
+
+    Free memory is the device capacity minus what tinygrad currently has
+    allocated and what admitted tasks have reserved but may not have
+    allocated yet. Tasks that can never fit are refused; tasks that do not
+    fit right now wait until memory is released or the wait times out.
+
+    tinygrad only counts allocations across every device, so where several
+    devices share one process, each device's usage is given by `used`
+    instead, e.g. the weights kept resident on it.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        capacity: int,
+        poll_interval: float = 0.5,
+        max_wait: float = 300.0,
+        used: Optional[Callable[[], int]] = None,
+    ):
+        self.logger = logger
+        self.capacity = capacity
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self.reserved = 0
+        self.used = used or (lambda: GlobalCounters.mem_used)
+        self._released = asyncio.Event()
+
+    def free(self) -> int:
+        """Estimate Device Memory Not Used Or Reserved, In Bytes."""
+        return max(0, self.capacity - self.used() - self.reserved)
+
+    def fits(self, nbytes: int) -> bool:
+        """Check Whether A Task Needing `nbytes` Could Be Admitted Right Now."""
+        return nbytes <= self.free()
+
+    async def admit(self, nbytes: int) -> Result[int, str]:
+        """
+        Reserve Device Memory For A Task, Waiting Until Enough Is Free.
+
+        Returns:
+            Result[int, str]: The reserved bytes, to be passed to `release`,
+            or an error if the task can never fit or the wait timed out
+        """
+        if nbytes > self.capacity:
+            return create_failure(
+                f"Task Needs {nbytes} Bytes Of Device Memory But The Device Has {self.capacity}"
+            )
+
+        deadline = time.monotonic() + self.max_wait
+        while not self.fits(nbytes):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return create_failure(
+                    f"Timed Out Waiting For {nbytes} Bytes Of Device Memory ({self.free()} Free)"
+                )
+
+            # Memory is freed either by a release here or by tinygrad, so poll as well
+            self._released.clear()
+            try:
+                await asyncio.wait_for(
+                    self._released.wait(), timeout=min(self.poll_interval, remaining)
+                )
+            except asyncio.TimeoutError:
+                pass
+
+        self.reserved += nbytes
+        return create_success(nbytes)
+
+    def release(self, nbytes: int) -> None:
+        """Return Memory Reserved By `admit`."""
+        self.reserved = max(0, self.reserved - nbytes)
+        self._released.set()
@@ -1,14 +1,57 @@
+from typing import Iterable, Optional, Set
+from .models import SystemConfig
 from .storage import StorageService
 from .result import create_failure, create_success, Result
+from .tinygrad_backend.types import ActualTensors
+from .tinygrad_backend.weight_shards import WeightManifest, WeightShard, bind_shard
 
 
 async def ensure_weights_cached(
-    weights_data_key: str, storage_service: StorageService
-) -> Result[bool, str]:
-    if storage_service.is_downloaded(weights_data_key):
-        return create_success(True)
+    config: SystemConfig, storage_service: StorageService
+) -> Result[Optional[WeightManifest], str]:
+    """
+    Make The Configured Weights Available Locally.
+
+    Sharded weights only need their manifest up front; the shards themselves
+    are fetched when a task references them. Monolithic weights are
+    downloaded in full.
+    """
+    if config.weights_manifest_key is not None:
+        result = await storage_service.get_object(config.weights_manifest_key)
+        if result.status == "failure":
+            return create_failure(result.error)
+
+        with open(result.data, "rb") as f:
+            manifest = WeightManifest.from_bytes(f.read())
+        if isinstance(manifest, ValueError):
+            return create_failure(f"Error Importing Weight Manifest: {manifest}")
+        return create_success(manifest)
+
+    if storage_service.is_downloaded(config.weights_data_key):
+        return create_success(None)
     else:
-        result = await storage_service.get_object(weights_data_key)
+        result = await storage_service.get_object(config.weights_data_key)
         if result.status == "failure":
             return create_failure(result.error)
-    return create_success(True)
+    return create_success(None)
+
+
+async def load_weight_shards(
+    shards: Iterable[WeightShard],
+    referenced: Set[str],
+    storage_service: StorageService,
+) -> Result[ActualTensors, str]:
+    """Fetch Weight Shards, Reusing Local Copies, And Bind Them To Placeholders."""
+    weights: ActualTensors = {}
+    for shard in shards:
+        # Shard keys are content addressed, so a local copy is never stale
+        result = await storage_service.get_object(shard.key, use_cache=True)
+        if result.status == "failure":
+            return create_failure(result.error)
+
+        with open(result.data, "rb") as f:
+            tensors = bind_shard(shard, f.read(), referenced)
+        if isinstance(tensors, ValueError):
+            return create_failure(f"Error Loading Weight Shard: {tensors}")
+        weights.update(tensors)
+    return create_success(weights)
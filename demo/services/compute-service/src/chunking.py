@@ -0,0 +1,192 @@
+import argparse
+import asyncio
+import hashlib
+import sys
+from typing import List, Literal, Optional, Tuple, Union
+import numpy as np
+from pydantic import BaseModel
+
+# Marks a stored object that is a manifest of chunks rather than the data itself
+CHUNKED_MAGIC = b"splitup-chunked\n"
+
+# Storage key prefix of chunks, each stored once under its hash
+CHUNK_KEY_PREFIX = "chunks"
+
+# Bytes hashed to decide each content-defined boundary
+WINDOW_SIZE = 48
+
+# Bytes hashed per numpy pass, bounding memory use on large objects
+SCAN_BLOCK_SIZE = 8 << 20
+
+# Random value per byte; fixed so every node finds the same boundaries
+GEAR = np.random.default_rng(0x73706C6974).integers(
+    0, np.iinfo(np.uint64).max, 256, dtype=np.uint64, endpoint=True
+)
+
+Chunking = Literal["fixed", "cdc"]
+
+
+class ChunkRef(BaseModel):
+    """One chunk of a chunked object."""
+
+    hash: str  # sha256 of the chunk, hex
+    size: int
+
+
+class ChunkManifest(BaseModel):
+    """A stored object split into chunks, listed in order."""
+
+    version: int = 1
+    chunking: Chunking
+    size: int  # bytes of the whole object
+    chunks: List[ChunkRef]
+
+    def to_bytes(self) -> bytes:
+        """Convert The Manifest To Bytes For Storage."""
+        return CHUNKED_MAGIC + self.model_dump_json().encode()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Union["ChunkManifest", ValueError]:
+        """Parse A Stored Manifest, Or Return ValueError If The Data Is Not One."""
+        if not is_chunked(data):
+            return ValueError("Data Is Not A Chunk Manifest")
+        try:
+            return cls.model_validate_json(data[len(CHUNKED_MAGIC) :])
+        except Exception as e:
+            return ValueError(f"Invalid Chunk Manifest: {str(e)}")
+
+
+def is_chunked(data: bytes) -> bool:
+    """Check Whether Stored Data Is A Chunk Manifest."""
+    return data.startswith(CHUNKED_MAGIC)
+
+
+def chunk_key(digest: str) -> str:
+    """Get The Storage Key Of A Chunk From Its Hash."""
+    return f"{CHUNK_KEY_PREFIX}/{digest[:2]}/{digest}"
+
+
+#####
+# Logic For Finding Chunk Boundaries
+#####
+
+
+def fixed_boundaries(length: int, chunk_size: int) -> List[int]:
+    """Get The End Offsets Of Fixed-Size Chunks."""
+    return [min(end, length) for end in range(chunk_size, length + chunk_size, chunk_size)]
+
+
+def _boundary_candidates(data: bytes, mask: int) -> np.ndarray:
+    """
+    Find Every Offset After Which A Content-Defined Boundary May Fall.
+
+    The hash at each byte is the wrapping sum of a random value per byte over
+    the last WINDOW_SIZE bytes, so it depends only on nearby content and an
+    insertion moves boundaries only around it. Sums are taken with cumsum,
+    keeping the scan in numpy.
+    """
+    arr = np.frombuffer(data, dtype=np.uint8)
+    candidates = []
+    for start in range(0, len(arr), SCAN_BLOCK_SIZE):
+        lo = max(0, start - WINDOW_SIZE)
+        sums = np.cumsum(GEAR[arr[lo : start + SCAN_BLOCK_SIZE]], dtype=np.uint64)
+        hashes = sums[WINDOW_SIZE:] - sums[:-WINDOW_SIZE]
+        hits = np.nonzero((hashes & np.uint64(mask)) == 0)[0]
+        candidates.append(hits + lo + WINDOW_SIZE + 1)
+    return np.concatenate(candidates) if candidates else np.array([], dtype=np.int64)
+
+
+def content_defined_boundaries(data: bytes, average_size: int) -> List[int]:
+    """
+    Get The End Offsets Of Content-Defined Chunks.
+
+    Chunks average about average_size bytes, rounded to a power of two, and
+    are kept between a quarter of it and four times it.
+    """
+    average = 1 << max(average_size.bit_length() - 1, 6)
+    min_size, max_size = average // 4, average * 4
+
+    ends: List[int] = []
+    last = 0
+    for candidate in _boundary_candidates(data, average - 1).tolist():
+        while candidate - last > max_size:
+            last += max_size
+            ends.append(last)
+        if candidate - last >= min_size:
+            ends.append(candidate)
+            last = candidate
+
+    while len(data) - last > max_size:
+        last += max_size
+        ends.append(last)
+    if last < len(data):
+        ends.append(len(data))
+    return ends
+
+
+def split_chunks(
+    data: bytes, chunking: Chunking, chunk_size: int
+) -> Tuple[ChunkManifest, List[Tuple[str, memoryview]]]:
+    """
+    Split Data Into Chunks Keyed By Their Hash.
+
+    Args:
+        data: The object to split
+        chunking: "fixed" for fixed-size chunks, "cdc" for content-defined ones
+        chunk_size: Size of fixed chunks, or average size of content-defined ones
+
+    Returns:
+        The manifest, and each chunk's hash and data in order
+    """
+    if chunking == "fixed":
+        ends = fixed_boundaries(len(data), chunk_size)
+    else:
+        ends = content_defined_boundaries(data, chunk_size)
+
+    view = memoryview(data)
+    chunks: List[Tuple[str, memoryview]] = []
+    start = 0
+    for end in ends:
+        chunk = view[start:end]
+        chunks.append((hashlib.sha256(chunk).hexdigest(), chunk))
+        start = end
+
+    manifest = ChunkManifest(
+        chunking=chunking,
+        size=len(data),
+        chunks=[ChunkRef(hash=digest, size=len(chunk)) for digest, chunk in chunks],
+    )
+    return manifest, chunks
+
+
+#####
+# Logic For The Command Line
+#####
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Upload A File As A Chunked Object, E.g. A New Revision Of Some Weights."""
+    from .storage import StorageService
+
+    parser = argparse.ArgumentParser(description="Upload a file as a chunked object.")
+    parser.add_argument("file", help="Path to the file")
+    parser.add_argument("key", help="Storage key of the object")
+    parser.add_argument("--chunking", choices=("fixed", "cdc"), default="cdc")
+    parser.add_argument("--chunk-size", type=int, default=1 << 20, help="Bytes per chunk")
+    args = parser.parse_args(argv)
+
+    storage_service = StorageService()
+    result = asyncio.run(
+        storage_service.put_object_chunked(
+            args.key, args.file, chunking=args.chunking, chunk_size=args.chunk_size
+        )
+    )
+    if result.status == "failure":
+        print(f"Error: {result.error}", file=sys.stderr)
+        return 1
+    print(result.data)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
+from tinygrad import Device, Tensor
+from .admission import MemoryAdmission
+from .models import DeviceUsage
+from .result import create_success, create_failure, Result
+from .tinygrad_backend.types import ActualTensors
+from .tinygrad_backend.weight_shards import WeightShard
+
+# Device indices probed when devices are discovered automatically
+MAX_AUTO_DEVICES = 16
+
+# Backends whose extra instances share the same hardware, so only one is used
+# unless more are listed explicitly
+SINGLE_INSTANCE_BACKENDS = {"CLANG", "LLVM", "PYTHON", "METAL", "WEBGPU"}
+
+# Window over which device utilization is reported, in seconds
+UTILIZATION_WINDOW = 60.0
+
+
+def discover_devices(spec: str = "") -> Union[List[str], ValueError]:
+    """
+    Find The Devices Tasks Run On.
+
+    Args:
+        spec: Empty for the default device, "auto" for every instance of the
+            default backend, or a comma-separated list such as
+            "PYTHON:0,PYTHON:1" (several CPU instances are useful for testing)
+
+    Returns:
+        Union[List[str], ValueError]: Canonical device names, or ValueError
+        if a listed device cannot be opened
+    """
+    spec = spec.strip()
+    if not spec:
+        return [Device.DEFAULT]
+
+    if spec.lower() == "auto":
+        backend = Device.DEFAULT.split(":")[0]
+        if backend in SINGLE_INSTANCE_BACKENDS:
+            return [Device.DEFAULT]
+        devices: List[str] = []
+        for index in range(MAX_AUTO_DEVICES):
+            try:
+                devices.append(Device[f"{backend}:{index}"].device)
+            except Exception:
+                break
+        return devices or [Device.DEFAULT]
+
+    devices = []
+    for name in spec.split(","):
+        if not name.strip():
+            continue
+        try:
+            device = Device[name.strip()].device
+        except Exception as e:
+            return ValueError(f"Cannot Open Device {name.strip()}: {str(e)}")
+        if device not in devices:
+            devices.append(device)
+    return devices or [Device.DEFAULT]
+
+
+def worker_devices(count: int) -> List[str]:
+    """
+    Name One Device Per Worker Process When No Devices Are Listed.
+
+    CPU backends get one instance per worker, so a node can use every core;
+    other backends only get their default device.
+    """
+    backend = Device.DEFAULT.split(":")[0]
+    if backend not in SINGLE_INSTANCE_BACKENDS:
+        return [Device.DEFAULT]
+    return [Device.canonicalize(f"{backend}:{index}") for index in range(max(1, count))]
+
+
+class DeviceSlot:
+    """
+    One Device Of The Node, Running One Task At A Time.
+
+    Weight shards a task loads are kept on the device afterwards, so later
+    tasks using the same weights do not copy them again.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        device: str,
+        memory: int = 0,
+        shared_counters: bool = True,
+    ):
+        self.device = device
+        self.active_execution: Optional[str] = None
+        self.completed = 0
+        self.resident_weights: Dict[str, ActualTensors] = {}  # shard key -> bound tensors
+        self.resident_bytes = 0
+        self.busy_since: Optional[float] = None
+        self.busy_intervals: Deque[Tuple[float, float]] = deque(maxlen=4096)
+        # tinygrad's allocation counter covers every device, so it is only
+        # used when this is the node's only device
+        self.admission: Optional[MemoryAdmission] = None
+        if memory > 0:
+            self.admission = MemoryAdmission(
+                logger,
+                memory,
+                used=None if shared_counters else (lambda: self.resident_bytes),
+            )
+
+    @property
+    def busy(self) -> bool:
+        """Whether A Task Is Running On The Device."""
+        return self.busy_since is not None
+
+    def free(self) -> Optional[int]:
+        """Estimate Free Device Memory In Bytes, None If Unknown."""
+        return self.admission.free() if self.admission is not None else None
+
+    def fits(self, nbytes: int) -> bool:
+        """Check Whether A Task Needing `nbytes` Fits On The Device Right Now."""
+        return self.admission is None or self.admission.fits(nbytes)
+
+    def fits_without_weights(self, nbytes: int) -> bool:
+        """Check Whether A Task Would Fit Once Resident Weights Are Dropped."""
+        return self.admission is None or nbytes <= self.admission.free() + self.resident_bytes
+
+    def utilization(self, now: float) -> float:
+        """Fraction Of The Recent Window Spent Executing."""
+        start = now - UTILIZATION_WINDOW
+        busy = sum(
+            end - max(begin, start) for begin, end in self.busy_intervals if end > start
+        )
+        if self.busy_since is not None:
+            busy += now - max(self.busy_since, start)
+        return min(1.0, busy / UTILIZATION_WINDOW)
+
+    def resident_nbytes(self, shards: Iterable[WeightShard]) -> int:
+        """Bytes Of The Given Shards Already Resident On The Device."""
+        return sum(shard.nbytes for shard in shards if shard.key in self.resident_weights)
+
+    def get_weights(self, shard: WeightShard, referenced: Set[str]) -> Optional[ActualTensors]:
+        """Get A Resident Shard's Tensors, None If Any Referenced Tensor Is Missing."""
+        tensors = self.resident_weights.get(shard.key)
+        needed = referenced.intersection(shard.placeholder_names())
+        if tensors is None or not needed.issubset(tensors):
+            return None
+        return {name: tensors[name] for name in needed}
+
+    def keep_weights(self, shard: WeightShard, tensors: ActualTensors) -> ActualTensors:
+        """Move A Shard's Tensors To The Device And Keep Them There."""
+        placed = {name: tensor.to(self.device) for name, tensor in tensors.items()}
+        Tensor.realize(*placed.values())
+        kept = {**self.resident_weights.get(shard.key, {}), **placed}
+        self.resident_weights[shard.key] = kept
+        self.resident_bytes = sum(
+            tensor.nbytes() for shard_tensors in self.resident_weights.values()
+            for tensor in shard_tensors.values()
+        )
+        return placed
+
+    def record_worker_weights(self, keys: List[str], nbytes: int) -> None:
+        """Record The Shards A Worker Process Keeps On The Device, Which Holds The Tensors."""
+        self.resident_weights = {key: {} for key in keys}
+        self.resident_bytes = nbytes
+
+    def evict_weights(self) -> None:
+        """Drop Every Weight Kept On The Device."""
+        self.resident_weights.clear()
+        self.resident_bytes = 0
+
+    def usage(self, now: float) -> DeviceUsage:
+        """Get The Device's Current Utilization."""
+        return DeviceUsage(
+            device=self.device,
+            busy=self.busy,
+            active_execution=self.active_execution,
+            completed_executions=self.completed,
+            utilization=self.utilization(now),
+            free_memory=self.free(),
+            resident_weights=len(self.resident_weights),
+        )
+
+
+# Task placement across devices
+class DevicePool:
+    """
+    Places Tasks On The Node's Devices.
+
+    Each device runs one task at a time with its own memory accounting. A
+    task goes to an idle device it fits on, preferring the device holding
+    most of its weights, then the least utilized one.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        devices: List[str],
+        memory: int = 0,
+        max_wait: float = 300.0,
+        poll_interval: float = 0.5,
+    ):
+        self.logger = logger
+        self.memory = memory  # bytes per device, 0 if unknown
+        self.max_wait = max_wait
+        self.poll_interval = poll_interval
+        self.slots = [
+            DeviceSlot(logger, device, memory, shared_counters=len(devices) == 1)
+            for device in devices
+        ]
+        self._released = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def _choose(
+        self, nbytes: int, shards: List[WeightShard], device: Optional[str] = None
+    ) -> Optional[DeviceSlot]:
+        """Pick The Best Idle Device For A Task, None If None Fits."""
+        idle = [
+            slot
+            for slot in self.slots
+            if not slot.busy and (device is None or slot.device == device)
+        ]
+        fitting = [slot for slot in idle if slot.fits(nbytes)]
+
+        # Weights kept on an idle device give way to a task that needs the room
+        if not fitting:
+            evictable = [slot for slot in idle if slot.fits_without_weights(nbytes)]
+            if not evictable:
+                return None
+            slot = min(evictable, key=lambda slot: slot.resident_bytes)
+            self.logger.info(f"Dropping Weights Kept On {slot.device} To Fit {nbytes} Bytes")
+            slot.evict_weights()
+            fitting = [slot]
+
+        now = time.monotonic()
+        return min(
+            fitting,
+            key=lambda slot: (
+                -slot.resident_nbytes(shards),
+                slot.utilization(now),
+                -(slot.free() or 0),
+            ),
+        )
+
+    async def acquire(
+        self,
+        execution_id: str,
+        nbytes: int = 0,
+        shards: Optional[List[WeightShard]] = None,
+        on_wait: Optional[Callable[[], None]] = None,
+        device: Optional[str] = None,
+    ) -> Result[Tuple[DeviceSlot, int], str]:
+        """
+        Place A Task On A Device, Waiting Until One Is Idle And Has Room.
+
+        Args:
+            execution_id: The task's execution
+            nbytes: The task's estimated peak device memory
+            shards: Weight shards the task uses
+            on_wait: Called once if the task has to wait
+            device: The only device to place the task on, any if None
+
+        Returns:
+            Result[Tuple[DeviceSlot, int], str]: The device and the bytes
+            reserved on it, to be passed to `release`, or an error if the
+            task fits no device or the wait timed out
+        """
+        if self.memory > 0 and nbytes > self.memory:
+            return create_failure(
+                f"Task Needs {nbytes} Bytes Of Device Memory But Each Device Has {self.memory}"
+            )
+
+        deadline = time.monotonic() + self.max_wait
+        waited = False
+        while (slot := self._choose(nbytes, shards or [], device)) is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return create_failure(
+                    f"Timed Out Waiting For A Device With {nbytes} Bytes Of Memory Free"
+                )
+            if not waited and on_wait is not None:
+                on_wait()
+            waited = True
+
+            # Devices free up on release, and memory also as tinygrad frees it
+            self._released.clear()
+            try:
+                await asyncio.wait_for(
+                    self._released.wait(), timeout=min(self.poll_interval, remaining)
+                )
+            except asyncio.TimeoutError:
+                pass
+
+        reserved = 0
+        if slot.admission is not None:
+            admitted = await slot.admission.admit(nbytes)
+            if admitted.status == "failure":
+                return create_failure(admitted.error)
+            reserved = admitted.data
+
+        slot.active_execution = execution_id
+        slot.busy_since = time.monotonic()
+        return create_success((slot, reserved))
+
+    def release(self, slot: DeviceSlot, reserved: int, completed: bool = True) -> None:
+        """Mark A Device Idle Again And Return Memory Reserved By `acquire`."""
+        if reserved and slot.admission is not None:
+            slot.admission.release(reserved)
+        if slot.busy_since is not None:
+            slot.busy_intervals.append((slot.busy_since, time.monotonic()))
+        slot.busy_since = None
+        slot.active_execution = None
+        if completed:
+            slot.completed += 1
+        self._released.set()
+
+    def free_memory(self) -> Optional[int]:
+        """Estimate Free Memory Across Every Device, None If Unknown."""
+        if self.memory <= 0:
+            return None
+        return sum(slot.free() or 0 for slot in self.slots)
+
+    def evict_weights(self) -> None:
+        """Drop Weights Kept On Every Device, E.g. When The Model Changes."""
+        for slot in self.slots:
+            slot.evict_weights()
+
+    def usage(self) -> List[DeviceUsage]:
+        """Get The Current Utilization Of Every Device."""
+        now = time.monotonic()
+        return [slot.usage(now) for slot in self.slots]
@@ -1,7 +1,8 @@
 from .result import create_success, create_failure, Result
 from pydantic import BaseModel, model_validator
 from urllib.parse import urlparse
-from typing import TypeVar, Type, Optional, Callable, Any, Dict
+from typing import TypeVar, Type, Optional, Callable, Any, Dict, Literal
+from pathlib import Path
 import os
 
 T = TypeVar("T", bound=BaseModel)
@@ -73,12 +74,43 @@ class EnvSettings(BaseModel):
     SPLITUP_STORAGE_API_ENDPOINT: str
     SPLITUP_STORAGE_API_KEY: str
     SPLITUP_STORAGE_REGION: str = "eu-west-2"
+    SPLITUP_STORAGE_CHUNKING: Literal["off", "fixed", "cdc"] = "off"
+    SPLITUP_STORAGE_CHUNK_SIZE: int = 1 << 20
+    SPLITUP_STORAGE_LOCAL_STORE_DIR: Optional[str] = None
+    SPLITUP_STORAGE_LOCAL_STORE_SIZE: int = 1 << 30
+    SPLITUP_STORAGE_LOCAL_STORE_TTL: float = 3600.0
     SPLITUP_COMPUTE_SERVICE_NAME: str = "compute-service"
     SPLITUP_COMPUTE_SERVICE_LOG_LEVEL: str = "INFO"
     SPLITUP_COMPUTE_SERVICE_API_PORT: int = 6068
     SPLITUP_COMPUTE_SERVICE_HEARTBEAT_URL: str
     SPLITUP_COMPUTE_SERVICE_LISTENER_URL: str
     SPLITUP_COMPUTE_SERVICE_CONFIG_URL: str
+    SPLITUP_COMPUTE_SERVICE_STATE_DIR: str = str(
+        Path.home() / ".splitup" / "compute-service"
+    )
+    SPLITUP_COMPUTE_SERVICE_RESULT_CACHE_SIZE: int = 1024
+    SPLITUP_COMPUTE_SERVICE_RESULT_TTL: int = 3600
+    SPLITUP_COMPUTE_SERVICE_RESULT_RETENTION: int = 7 * 24 * 3600
+    SPLITUP_COMPUTE_SERVICE_STATUS_INTERVAL: float = 15.0
+    SPLITUP_COMPUTE_SERVICE_STATUS_MIN_INTERVAL: float = 1.0
+    SPLITUP_COMPUTE_SERVICE_MAX_QUEUE_DEPTH: int = 16
+    SPLITUP_COMPUTE_SERVICE_MAX_TASK_STARTS: int = 3
+    SPLITUP_COMPUTE_SERVICE_DEVICES: str = ""
+    SPLITUP_COMPUTE_SERVICE_EXECUTOR: Literal["inline", "process"] = "inline"
+    SPLITUP_COMPUTE_SERVICE_WORKERS: int = 0
+    SPLITUP_COMPUTE_SERVICE_WORKER_MEMORY: int = 0
+    SPLITUP_COMPUTE_SERVICE_WORKER_MAX_TASKS: int = 0
+    SPLITUP_COMPUTE_SERVICE_PEER_URL: Optional[str] = None
+    SPLITUP_COMPUTE_SERVICE_PEER_CACHE_SIZE: int = 1 << 30
+    SPLITUP_COMPUTE_SERVICE_PEER_CACHE_TTL: float = 600.0
+    SPLITUP_COMPUTE_SERVICE_DEVICE_MEMORY: int = 0
+    SPLITUP_COMPUTE_SERVICE_ADMISSION_MAX_WAIT: float = 300.0
+    SPLITUP_COMPUTE_SERVICE_NOTIFICATION_BATCH_SIZE: int = 32
+    SPLITUP_COMPUTE_SERVICE_NOTIFICATION_MAX_ATTEMPTS: int = 20
+    SPLITUP_COMPUTE_SERVICE_WARMUP_TASKS: str = ""
+    SPLITUP_COMPUTE_SERVICE_NODE_PROFILE: str = str(
+        Path.home() / ".splitup" / "node-profile.json"
+    )
 
     model_config = {"validate_assignment": True}
 
@@ -90,6 +122,8 @@ class EnvSettings(BaseModel):
             self.SPLITUP_COMPUTE_SERVICE_LISTENER_URL,
             self.SPLITUP_COMPUTE_SERVICE_CONFIG_URL,
         ]
+        if self.SPLITUP_COMPUTE_SERVICE_PEER_URL is not None:
+            urls.append(self.SPLITUP_COMPUTE_SERVICE_PEER_URL)
 
         for url in urls:
             try:
@@ -0,0 +1,84 @@
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set, Tuple
+from .models import ExecutionEvent
+
+# Events that end an execution
+TERMINAL_EVENTS = ("completed", "failed")
+
+
+class EventSubscription:
+    """A Subscriber's View Of The Execution Event Bus."""
+
+    def __init__(self, bus: "ExecutionEventBus", subscriber_id: int, queue: asyncio.Queue):
+        self._bus = bus
+        self._subscriber_id = subscriber_id
+        self._queue = queue
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[ExecutionEvent]:
+        """Wait For The Next Event, Returning None If The Timeout Expires."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        """Stop Receiving Events."""
+        self._bus._subscribers.pop(self._subscriber_id, None)
+
+
+# Execution event bus
+class ExecutionEventBus:
+    """
+    Fans Out Execution Progress Events To Subscribers.
+
+    The latest event of recent executions is retained so that a subscriber
+    joining late immediately learns the current state of an execution.
+    """
+
+    def __init__(self, max_retained: int = 4096, max_pending: int = 256):
+        self.max_retained = max_retained
+        self.max_pending = max_pending
+        self._latest: "OrderedDict[str, ExecutionEvent]" = OrderedDict()
+        self._subscribers: Dict[int, Tuple[Optional[Set[str]], asyncio.Queue]] = {}
+        self._next_id = 0
+
+    def publish(self, event: ExecutionEvent) -> None:
+        """Publish An Event To All Interested Subscribers."""
+        self._latest[event.execution_id] = event
+        self._latest.move_to_end(event.execution_id)
+        while len(self._latest) > self.max_retained:
+            self._latest.popitem(last=False)
+
+        for execution_ids, queue in self._subscribers.values():
+            if execution_ids is not None and event.execution_id not in execution_ids:
+                continue
+            # Drop the oldest pending event rather than block on a slow subscriber
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def latest(self, execution_id: str) -> Optional[ExecutionEvent]:
+        """Get The Latest Retained Event For An Execution."""
+        return self._latest.get(execution_id)
+
+    def subscribe(
+        self, execution_ids: Optional[Iterable[str]] = None
+    ) -> EventSubscription:
+        """
+        Subscribe To Events For The Given Executions.
+
+        Args:
+            execution_ids: Executions to follow, None follows every execution
+
+        Returns:
+            A subscription that receives every matching event published from now on
+        """
+        wanted = set(execution_ids) if execution_ids is not None else None
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending)
+
+        subscriber_id = self._next_id
+        self._next_id += 1
+        self._subscribers[subscriber_id] = (wanted, queue)
+
+        return EventSubscription(self, subscriber_id, queue)
@@ -1,37 +1,125 @@
 import asyncio
+import hashlib
+import json
 import logging
 import time
 import pathlib
 import uuid
 import tempfile
-from typing import Dict, Optional, List
-from .models import TaskExecutionRequest, ComputeResult, TaskScheduledData
+from collections import deque
+from typing import AsyncIterator, Callable, Deque, Dict, Optional, List, Set, Tuple, Union
+from .models import (
+    TaskExecutionRequest,
+    ChainedStage,
+    ComputeResult,
+    TaskScheduledData,
+    NodeCapacity,
+    ExecutionEvent,
+    InputReference,
+    InputSlice,
+    WarmupStatus,
+)
 from .result import create_success, create_failure, Result
-from .notification import notify_completed_execution
+from .outbox import NotificationOutbox
+from .journal import TaskJournal
 from .storage import StorageService
+from .result_store import ResultStore
+from .status_reporter import StatusReporter, get_free_host_memory
+from .events import ExecutionEventBus, TERMINAL_EVENTS
+from .devices import DevicePool, DeviceSlot
+from .process_pool import WorkerPool
+from .peer_cache import PeerResultCache
+from .cache_models import load_weight_shards
+from .input_slices import fetch_tensor_slice
+from .result_hashes import merkle_key
 from .tinygrad_backend.core import GraphProgram
 from .tinygrad_backend.core import execute_graph_on_gpu
 from .tinygrad_backend.types import ActualTensors
-from .tinygrad_backend.serialize_tensors import TensorSerializer
-from tinygrad import Tensor
+from .tinygrad_backend.serialize_tensors import TensorSerializer, TensorEncoding
+from .tinygrad_backend.memory_analysis import (
+    ESTIMATE_VERSION,
+    MemoryEstimate,
+    estimate_peak_memory,
+)
+from .tinygrad_backend.weight_shards import WeightManifest, WeightShard
+from .tinygrad_backend.merkle import MerkleTree
+from tinygrad import Device, Tensor
+
+# Window over which recent throughput is reported, in seconds
+THROUGHPUT_WINDOW = 60
 
 
 # Task execution service
 class ExecutionService:
     """Service Class to Handle Task Execution Queue and Processing."""
 
-    def __init__(self, logger: logging.Logger, listener_url: str):
+    def __init__(
+        self,
+        logger: logging.Logger,
+        listener_url: str,
+        task_results: ResultStore,
+        outbox: NotificationOutbox,
+        journal: TaskJournal,
+        status_reporter: Optional[StatusReporter] = None,
+        device_memory: int = 0,
+        admission_max_wait: float = 300.0,
+        weight_manifest: Optional[Callable[[], Optional[WeightManifest]]] = None,
+        devices: Optional[List[str]] = None,
+        workers: Optional[WorkerPool] = None,
+        peer_cache: Optional[PeerResultCache] = None,
+        max_task_starts: int = 3,
+    ):
         self.logger = logger
         self.listener_url = listener_url
         self.task_queue: asyncio.Queue = asyncio.Queue()
         self.active_tasks: Dict[str, asyncio.Task] = {}  # execution_id -> task
-        self.task_results: Dict[str, ComputeResult] = {}  # execution_id -> result
+        self.task_results = task_results  # execution_id -> result
+        self.outbox = outbox
+        self.journal = journal
+        self.resumed_executions: Set[str] = set()  # replayed from the journal
+        self.max_task_starts = max_task_starts  # starts before a replayed task is failed
+        self.status_reporter = status_reporter
+        self.device_memory = device_memory  # memory of each device, 0 if unknown
+        self.cached_programs: Set[str] = set()  # task storage keys fetched
+        # Manifest of the current sharded weights, None for monolithic weights
+        self.weight_manifest = weight_manifest or (lambda: None)
+        self.resident_manifest: Optional[WeightManifest] = None  # weights kept on devices
+        self.memory_estimates: Dict[str, MemoryEstimate] = {}  # program digest -> estimate
+        # Each device runs one task at a time, admitted by memory when its capacity is known
+        self.devices = DevicePool(
+            logger, devices or [Device.DEFAULT], device_memory, max_wait=admission_max_wait
+        )
+        # Process pool running programs outside the service, None to run them here
+        self.workers = workers
+        # Results kept to serve peer nodes directly, None if results are only uploaded
+        self.peer_cache = peer_cache
+        self.completion_times: Deque[float] = deque(maxlen=4096)
+        self.events = ExecutionEventBus()
+        self.warmup = WarmupStatus()  # progress of the latest warm-up
+        self._warmup_lock = asyncio.Lock()  # one warm-up at a time
+        self._warmup_tasks: Set[asyncio.Task] = set()  # warm-ups running in the background
+        self._queue_workers: List[asyncio.Task] = []  # one per device, taking tasks off the queue
         self.storage_service = StorageService()
         self._start_worker()
 
     def _start_worker(self):
-        """Start the Task Processing Worker."""
-        asyncio.create_task(self._process_tasks())
+        """Start a Task Processing Worker for Each Device."""
+        for _ in range(len(self.devices)):
+            self._queue_workers.append(asyncio.create_task(self._process_tasks()))
+
+    async def stop(self) -> None:
+        """
+        Stop Taking Tasks And Cancel Those Running.
+
+        Cancelled and queued tasks stay in the journal, so they are resumed
+        when the service starts again.
+        """
+        for task in [*self._queue_workers, *self._warmup_tasks]:
+            task.cancel()
+        await asyncio.gather(
+            *self._queue_workers, *self._warmup_tasks, return_exceptions=True
+        )
+        self._queue_workers.clear()
 
     async def _process_tasks(self):
         """Process Tasks From The Queue."""
@@ -42,6 +130,9 @@ class ExecutionService:
                     f"Processing Task Execution {task_request.execution_id} of Type {task_request.task_id}"
                 )
 
+                # Journal the start first, so a task crashing the service is counted
+                await self.journal.record_started(task_request.execution_id)
+
                 # Create task execution
                 task = asyncio.create_task(
                     self._execute_task(task_request),
@@ -50,36 +141,68 @@ class ExecutionService:
 
                 # Track active task by execution_id
                 self.active_tasks[task_request.execution_id] = task
+                self._publish_event(task_request, "started")
+                self._report_state_change()
 
                 # Wait for task completion
+                stopping = False  # the worker itself is being cancelled
                 try:
-                    result = await task
-                    self.task_results[task_request.execution_id] = result
-
-                    # Notify listener of completion
-                    await notify_completed_execution(
-                        execution_id=task_request.execution_id,
-                        task_id=task_request.task_id,
-                        result=result,
-                        listener_url=self.listener_url,
-                        logger=self.logger,
-                    )
+                    task_result = await task
+                    if task_result.status == "failure":
+                        raise Exception(task_result.error)
+                    self._finish(task_request, task_result.data)
                 except Exception as e:
                     self.logger.error(
                         f"Task Execution {task_request.execution_id} Failed: {str(e)}"
                     )
-                    self.task_results[task_request.execution_id] = ComputeResult(
-                        result=str(e), status="failure"
-                    )
+                    self._finish(task_request, self._failure(task_request, str(e)))
+                except asyncio.CancelledError:
+                    # A stopping service leaves the task journaled, to resume it
+                    if asyncio.current_task().cancelling():
+                        stopping = True
+                        task.cancel()
+                        await asyncio.gather(task, return_exceptions=True)
+                        raise
+                    self.logger.info(f"Task Execution {task_request.execution_id} Cancelled")
+                    self._finish(task_request, self._failure(task_request, "Cancelled"))
                 finally:
                     # Clean up
                     del self.active_tasks[task_request.execution_id]
+                    self.resumed_executions.discard(task_request.execution_id)
+                    if not stopping:
+                        self.journal.record_completed(task_request.execution_id)
+                    self.completion_times.append(time.monotonic())
                     self.task_queue.task_done()
+                    self._report_state_change()
 
             except Exception as e:
                 self.logger.error(f"Error Processing Task Queue: {str(e)}")
                 await asyncio.sleep(1)
 
+    @staticmethod
+    def _failure(request: TaskExecutionRequest, error: str) -> ComputeResult:
+        """Build The Result Of A Failed Task Execution."""
+        return ComputeResult(
+            execution_id=request.execution_id,
+            task_id=request.task_id,
+            tensor_urls=[],
+            status="failure",
+            error=error,
+        )
+
+    def _finish(self, request: TaskExecutionRequest, result: ComputeResult) -> None:
+        """Record The Result Of A Task Execution And Notify The Listener Of It."""
+        self.task_results.put(result)
+        event = "completed" if result.status == "success" else "failed"
+        self._publish_event(request, event, result=result)
+
+        # Failures are reported too, so upstream need not wait for a timeout
+        self.outbox.enqueue(
+            execution_id=request.execution_id,
+            task_id=request.task_id,
+            result=result,
+        )
+
     async def _execute_task(
         self, request: TaskExecutionRequest
     ) -> Result[ComputeResult, str]:
@@ -92,73 +215,389 @@ class ExecutionService:
         3. Upload results
         4. Return the compute result
         """
-        try:
-            # Get Task Data
-            task_data = await self.storage_service.get_object(request.task_storage_key)
-            if task_data.status == "failure":
-                return create_failure(task_data.error)
+        # Resumed tasks reuse whatever was downloaded before the restart
+        use_cache = request.execution_id in self.resumed_executions
+        slot: Optional[DeviceSlot] = None  # device the task runs on
+        reserved = 0  # device memory reserved for this task
 
-            # Get Input Tensors
-            input_tensor_paths: List[pathlib.Path] = []
+        # A chained request runs several programs, each fed the previous output
+        stages: List[TaskExecutionRequest | ChainedStage] = [request, *request.next_stages]
 
-            for input_key in request.input_storage_keys:
-                input_data = await self.storage_service.get_object(input_key)
-                if input_data.status == "failure":
-                    return create_failure(input_data.error)
-                else:
-                    input_tensor_paths.append(input_data.data)
-
-            with open(task_data.data, "rb") as f:
-                imported_task = f.read()
-
-            exported_task = GraphProgram.from_bytes(imported_task)
-            if isinstance(exported_task, ValueError):
-                return create_failure(f"Error Importing Task: {exported_task}")
-
-            # Import Input Tensors
-            input_tensors: ActualTensors = {}
-            for path in input_tensor_paths:
-                with open(path, "rb") as f:
-                    tensor_data = f.read()
-                    tensor = TensorSerializer.tensor_from_bytes(tensor_data)
-                    input_tensors[path.stem] = tensor
-
-            result_tensor = execute_graph_on_gpu(exported_task, input_tensors)
-
-            if isinstance(result_tensor, ValueError):
-                return create_failure(f"Error Executing Task: {result_tensor}")
+        try:
+            # Get Task Data
+            self._publish_event(request, "stage", stage="fetching_task")
+            programs: List[GraphProgram] = []
+            program_files: List[Tuple[pathlib.Path, str]] = []  # local copy, digest
+            estimates: List[MemoryEstimate] = []
+
+            for stage in stages:
+                program_data = await self._fetch_program(stage.task_storage_key, use_cache)
+                if program_data.status == "failure":
+                    return create_failure(program_data.error)
+                program_path, imported_task, exported_task = program_data.data
+                programs.append(exported_task)
+                program_files.append(
+                    (program_path, hashlib.sha256(imported_task).hexdigest())
+                )
 
-            # Upload Result Tensor
-            key = f"results/task_{request.task_id}/{request.execution_id}/{uuid.uuid4()}.pt"
+                if self.device_memory > 0:
+                    estimate = self._get_memory_estimate(
+                        program_path, imported_task, exported_task
+                    )
+                    if isinstance(estimate, ValueError):
+                        return create_failure(f"Error Analysing Task: {estimate}")
+                    estimates.append(estimate)
 
-            # Create a temporary file to store the serialized tensor
-            temp_dir = pathlib.Path(tempfile.gettempdir())
-            tensor_file = temp_dir / f"result_{request.execution_id}.tensor"
+            # Place The Task On A Device It Fits Before Downloading Its Inputs
+            # Programs of a chain run one after another
+            needed = max((estimate.peak_bytes for estimate in estimates), default=0)
 
-            # Serialize the tensor to bytes and save to the temp file
-            serialized_tensor = TensorSerializer.tensor_to_bytes(result_tensor)
-            with open(tensor_file, "wb") as f:
-                f.write(serialized_tensor)
+            def on_wait():
+                self.logger.info(
+                    f"Deferring Task Execution {request.execution_id}: Needs {needed} Bytes, No Device Has Room"
+                )
+                self._publish_event(request, "stage", stage="deferred")
 
-            tensor_url = await self.storage_service.put_object(
-                key=key,
-                file_path=tensor_file,
+            placed = await self.devices.acquire(
+                request.execution_id, needed, self._weight_shards(programs), on_wait
             )
-
-            if tensor_url.status == "failure":
-                return create_failure(tensor_url.error)
+            if placed.status == "failure":
+                return create_failure(placed.error)
+            slot, reserved = placed.data
+            self.logger.info(f"Running Task Execution {request.execution_id} On {slot.device}")
+
+            tensor_urls: List[str] = []
+            peer_urls: List[Optional[str]] = []
+            merkle_roots: List[str] = []
+            previous: Optional[Tensor] = None
+
+            for index, (stage, exported_task) in enumerate(zip(stages, programs)):
+                # Get Input Tensors
+                self._publish_event(request, "stage", stage="fetching_inputs")
+                inputs_result = await self._fetch_inputs(
+                    stage.input_storage_keys, use_cache, stage.input_peers
+                )
+                if inputs_result.status == "failure":
+                    return create_failure(inputs_result.error)
+                input_tensors = inputs_result.data
+
+                # Bind The Previous Program's Output, Still On The Device
+                if previous is not None:
+                    checked = self._check_chained_input(exported_task, stage, previous)
+                    if checked.status == "failure":
+                        return create_failure(checked.error)
+                    input_tensors[stage.input_placeholder] = previous
+
+                # Run The Program Here Or In The Device's Worker Process
+                if self.workers is not None:
+                    executed = await self._execute_in_worker(
+                        request, slot, program_files[index], exported_task, input_tensors
+                    )
+                else:
+                    executed = await self._execute_inline(
+                        request, slot, exported_task, input_tensors
+                    )
+                if executed.status == "failure":
+                    return create_failure(executed.error)
+                previous = executed.data
+
+                # Upload The Final Output And Any Requested Intermediate Outputs
+                if stage.upload_output or index == len(stages) - 1:
+                    self._publish_event(request, "stage", stage="uploading")
+                    uploaded = await self._upload_result(request, previous, index)
+                    if uploaded.status == "failure":
+                        return create_failure(uploaded.error)
+                    tensor_url, peer_url, tree = uploaded.data
+                    tensor_urls.append(tensor_url)
+                    peer_urls.append(peer_url)
+                    merkle_roots.append(tree.root_hex)
 
             # For now, just return a success result
             return create_success(
                 ComputeResult(
                     execution_id=request.execution_id,
                     task_id=request.task_id,
-                    tensor_urls=[tensor_url.data],
+                    tensor_urls=tensor_urls,
                     status="success",
+                    merkle_roots=merkle_roots,
+                    merkle_chunk_size=request.merkle_chunk_size,
+                    peer_urls=peer_urls,
                 )
             )
         except Exception as e:
             return create_failure(f"Failed To Execute Task: {str(e)}")
+        finally:
+            if slot is not None:
+                self.devices.release(slot, reserved)
+
+    async def _execute_inline(
+        self,
+        request: TaskExecutionRequest,
+        slot: DeviceSlot,
+        program: GraphProgram,
+        input_tensors: ActualTensors,
+    ) -> Result[Tensor, str]:
+        """Run A Program In The Service Process."""
+        # Get Only The Weight Shards This Program References
+        weights_result = await self._fetch_weights(request, program, input_tensors, slot)
+        if weights_result.status == "failure":
+            return create_failure(weights_result.error)
+
+        self._publish_event(request, "stage", stage="executing")
+        result_tensor = execute_graph_on_gpu(
+            program, input_tensors, weights_result.data, slot.device
+        )
+        if isinstance(result_tensor, ValueError):
+            return create_failure(f"Error Executing Task: {result_tensor}")
+        return create_success(result_tensor.realize())
+
+    async def _execute_in_worker(
+        self,
+        request: TaskExecutionRequest,
+        slot: DeviceSlot,
+        program_file: Tuple[pathlib.Path, str],
+        program: GraphProgram,
+        input_tensors: ActualTensors,
+    ) -> Result[Tensor, str]:
+        """Run A Program In The Worker Process Of Its Device, Which Loads The Weights Itself."""
+        weights: List[Tuple[WeightShard, pathlib.Path, List[str]]] = []
+        manifest = self.weight_manifest()
+        if manifest is not None:
+            self._publish_event(request, "stage", stage="fetching_weights")
+            referenced = manifest.referenced_by([program]) - set(input_tensors)
+            for shard in manifest.shards_for([program], exclude=input_tensors):
+                # Shard keys are content addressed, so a local copy is never stale
+                local = await self.storage_service.get_object(shard.key, use_cache=True)
+                if local.status == "failure":
+                    return create_failure(local.error)
+                names = sorted(referenced.intersection(shard.placeholder_names()))
+                weights.append((shard, local.data, names))
+
+        self._publish_event(request, "stage", stage="executing")
+        program_path, program_digest = program_file
+        executed = await self.workers.execute(
+            slot, program_path, program_digest, program, input_tensors, weights
+        )
+        if executed.status == "failure":
+            return create_failure(f"Error Executing Task: {executed.error}")
+        return executed
+
+    async def _fetch_program(
+        self, task_storage_key: str, use_cache: bool
+    ) -> Result[Tuple[pathlib.Path, bytes, GraphProgram], str]:
+        """Download And Import A Program."""
+        task_data = await self.storage_service.get_object(
+            task_storage_key, use_cache=use_cache
+        )
+        if task_data.status == "failure":
+            return create_failure(task_data.error)
+        self.cached_programs.add(task_storage_key)
+
+        with open(task_data.data, "rb") as f:
+            imported_task = f.read()
+
+        exported_task = GraphProgram.from_bytes(imported_task)
+        if isinstance(exported_task, ValueError):
+            return create_failure(f"Error Importing Task: {exported_task}")
+        return create_success((task_data.data, imported_task, exported_task))
+
+    async def _fetch_inputs(
+        self,
+        input_storage_keys: List[InputReference],
+        use_cache: bool,
+        input_peers: Optional[Dict[str, str]] = None,
+    ) -> Result[ActualTensors, str]:
+        """
+        Download And Import Input Tensors, Named After Their Keys.
+
+        Inputs a peer node serves are fetched from it, falling back to storage.
+        """
+        input_peers = input_peers or {}
+        input_tensors: ActualTensors = {}
+
+        for input_key in input_storage_keys:
+            # Slices are read in parts rather than downloaded whole
+            if isinstance(input_key, InputSlice):
+                sliced = await fetch_tensor_slice(
+                    input_key,
+                    self.storage_service,
+                    self.logger,
+                    use_cache,
+                    input_peers.get(input_key.key),
+                )
+                if sliced.status == "failure":
+                    return create_failure(sliced.error)
+                input_tensors[input_key.placeholder_name] = sliced.data
+                continue
+
+            input_data = await self.storage_service.read_object(
+                input_key, use_cache=use_cache, peer_url=input_peers.get(input_key)
+            )
+            if input_data.status == "failure":
+                return create_failure(input_data.error)
+
+            # Import The Tensor, Bound By The Name Of Its Key
+            tensor = TensorSerializer.tensor_from_bytes(input_data.data)
+            input_tensors[pathlib.PurePosixPath(input_key).stem] = tensor
+        return create_success(input_tensors)
+
+    async def _fetch_weights(
+        self,
+        request: TaskExecutionRequest,
+        program: GraphProgram,
+        input_tensors: ActualTensors,
+        slot: DeviceSlot,
+    ) -> Result[Optional[ActualTensors], str]:
+        """
+        Get The Weight Shards A Program References, None For Monolithic Weights.
+
+        Shards already resident on the task's device are reused; others are
+        loaded and kept there for later tasks.
+        """
+        manifest = self.weight_manifest()
+        if manifest is None:
+            return create_success(None)
+
+        self._publish_event(request, "stage", stage="fetching_weights")
+        referenced = manifest.referenced_by([program]) - set(input_tensors)
+        weights: ActualTensors = {}
+        missing: List[WeightShard] = []
+        for shard in manifest.shards_for([program], exclude=input_tensors):
+            resident = slot.get_weights(shard, referenced)
+            if resident is None:
+                missing.append(shard)
+            else:
+                weights.update(resident)
+
+        loaded = await load_weight_shards(missing, referenced, self.storage_service)
+        if loaded.status == "failure":
+            return create_failure(loaded.error)
+        for shard in missing:
+            bound = {
+                name: tensor
+                for name, tensor in loaded.data.items()
+                if name in shard.placeholder_names()
+            }
+            weights.update(slot.keep_weights(shard, bound))
+        return create_success(weights)
+
+    def _weight_shards(self, programs: List[GraphProgram]) -> List[WeightShard]:
+        """Get The Weight Shards Some Programs Reference, To Place Them Near Their Weights."""
+        manifest = self.weight_manifest()
+        # Weights of a previous model are no longer worth keeping on the devices
+        if manifest is not self.resident_manifest:
+            self.devices.evict_weights()
+            self.resident_manifest = manifest
+        if manifest is None:
+            return []
+        return manifest.shards_for(programs)
+
+    @staticmethod
+    def _check_chained_input(
+        program: GraphProgram, stage: ChainedStage, previous: Tensor
+    ) -> Result[bool, str]:
+        """Check That A Chained Program Can Take The Previous Program's Output."""
+        placeholder = next(
+            (ph for ph in program.placeholders if ph.name == stage.input_placeholder),
+            None,
+        )
+        if placeholder is None:
+            return create_failure(
+                f"Program {stage.task_storage_key} Has No Placeholder {stage.input_placeholder}"
+            )
+        if tuple(previous.shape) != placeholder.shape or previous.dtype != placeholder.dtype:
+            return create_failure(
+                f"Previous Output {tuple(previous.shape)} {previous.dtype.name} Does Not Match "
+                f"Placeholder {placeholder.name} {placeholder.shape} {placeholder.dtype.name}"
+            )
+        return create_success(True)
+
+    async def _upload_result(
+        self, request: TaskExecutionRequest, result_tensor: Tensor, index: int
+    ) -> Result[Tuple[str, Optional[str], MerkleTree], str]:
+        """
+        Serialize And Upload An Output Tensor, Hashing Its Data As It Goes.
+
+        The tree's leaf hashes are uploaded next to the tensor, under
+        `merkle_key`, so a verifier can narrow a mismatch down to chunks
+        without downloading the tensor. Both are then kept to serve peers,
+        when enabled.
+
+        Returns:
+            Result[Tuple[str, Optional[str], MerkleTree], str]: The uploaded
+            object's URI, the URL peers can fetch it from, and its hashes
+        """
+        key = f"results/task_{request.task_id}/{request.execution_id}/{uuid.uuid4()}.pt"
+
+        # Create a temporary file to store the serialized tensor
+        temp_dir = pathlib.Path(tempfile.gettempdir())
+        tensor_file = temp_dir / f"result_{request.execution_id}_{index}.tensor"
+
+        # Serialize the tensor to bytes and save to the temp file
+        serialized_tensor, tree = TensorSerializer.tensor_to_bytes_with_merkle(
+            result_tensor,
+            TensorEncoding.parse(request.output_encoding),
+            request.merkle_chunk_size,
+        )
+        with open(tensor_file, "wb") as f:
+            f.write(serialized_tensor)
+        hashes_file = tensor_file.with_suffix(".merkle")
+        with open(hashes_file, "wb") as f:
+            f.write(tree.to_bytes())
+
+        uploaded, hashes_uploaded = await asyncio.gather(
+            self.storage_service.put_object(key=key, file_path=tensor_file),
+            self.storage_service.put_object(key=merkle_key(key), file_path=hashes_file),
+        )
+        if uploaded.status == "failure":
+            return create_failure(uploaded.error)
+        if hashes_uploaded.status == "failure":
+            return create_failure(hashes_uploaded.error)
+
+        peer_url = None
+        if self.peer_cache is not None:
+            peer_url = self.peer_cache.put(key, tensor_file)
+            self.peer_cache.put(merkle_key(key), hashes_file)
+        return create_success((uploaded.data, peer_url, tree))
+
+    def _get_memory_estimate(
+        self, program_path: pathlib.Path, program_bytes: bytes, program: GraphProgram
+    ) -> Union[MemoryEstimate, ValueError]:
+        """
+        Get The Peak Memory Estimate Of A Program, Analysing It Only Once.
+
+        Estimates are cached in memory and in a sidecar file next to the
+        downloaded program, keyed by the program's digest and the estimation
+        method's version, so a changed program or method is analysed again.
+        """
+        digest = hashlib.sha256(program_bytes).hexdigest()
+        if digest in self.memory_estimates:
+            return self.memory_estimates[digest]
+
+        sidecar = program_path.with_name(f"{program_path.name}.memory.json")
+        estimate = None
+        try:
+            with open(sidecar, "r") as f:
+                cached = json.load(f)
+            if cached.get("digest") == digest and cached.get("version") == ESTIMATE_VERSION:
+                estimate = MemoryEstimate.from_dict(cached)
+        except (OSError, ValueError):
+            pass
+
+        if estimate is None:
+            estimate = estimate_peak_memory(program)
+            if isinstance(estimate, ValueError):
+                return estimate
+            try:
+                with open(sidecar, "w") as f:
+                    json.dump(
+                        {"digest": digest, "version": ESTIMATE_VERSION, **estimate.to_dict()}, f
+                    )
+            except OSError as e:
+                self.logger.warning(f"Failed To Cache Memory Estimate: {str(e)}")
+
+        self.memory_estimates[digest] = estimate
+        return estimate
 
     async def enqueue_task(
         self, request: TaskExecutionRequest
@@ -168,12 +607,17 @@ class ExecutionService:
             # Record scheduling time
             scheduled_at = int(time.time())
 
+            # Make the task durable before accepting it
+            await self.journal.record_enqueued(request)
+
             # Add to queue
             await self.task_queue.put(request)
 
             self.logger.info(
                 f"Task Execution {request.execution_id} of Type {request.task_id} Queued"
             )
+            self._publish_event(request, "queued")
+            self._report_state_change()
 
             return create_success(
                 TaskScheduledData(
@@ -185,10 +629,280 @@ class ExecutionService:
         except Exception as e:
             return create_failure(f"Failed To Queue Task: {str(e)}")
 
+    async def resume_pending(self) -> int:
+        """
+        Requeue Tasks Left Unfinished By A Previous Run Of The Service.
+
+        A task already started `max_task_starts` times without completing
+        has likely crashed the service each time, so it is failed instead.
+        """
+        pending = []
+        for request, starts in self.journal.replay():
+            if starts >= self.max_task_starts:
+                self.logger.error(
+                    f"Failing Task Execution {request.execution_id}: Started {starts} Times Without Completing"
+                )
+                error = f"Service Stopped During Each Of {starts} Attempts To Run The Task"
+                self._finish(request, self._failure(request, error))
+                self.journal.record_completed(request.execution_id)
+                continue
+            pending.append(request)
+
+        for request in pending:
+            self.logger.info(
+                f"Resuming Task Execution {request.execution_id} of Type {request.task_id}"
+            )
+            self.resumed_executions.add(request.execution_id)
+            await self.task_queue.put(request)
+            self._publish_event(request, "queued")
+
+        if pending:
+            self._report_state_change()
+        return len(pending)
+
+    async def warm_up(self, task_storage_keys: List[str]) -> Result[WarmupStatus, str]:
+        """
+        Compile Programs Before Tasks Need Them.
+
+        Each program runs once on every device, on zeros shaped like its
+        placeholders, so its kernels are compiled and cached there and the
+        first task running it does not pay for compilation. A program that
+        cannot be warmed up is recorded in the status and skipped.
+
+        With the inline executor each program compiles in the service
+        process, blocking it as a task would, so the loop is yielded between
+        programs to let requests and probes through.
+        """
+        task_storage_keys = list(dict.fromkeys(task_storage_keys))  # each program once
+        if not task_storage_keys:
+            return create_success(self.warmup)
+
+        async with self._warmup_lock:
+            began = time.monotonic()
+            devices = [slot.device for slot in self.devices.slots]
+            status = WarmupStatus(
+                state="running",
+                programs=list(task_storage_keys),
+                total=len(task_storage_keys) * len(devices),
+            )
+            self.warmup = status
+            self.logger.info(
+                f"Warming Up {len(task_storage_keys)} Programs On {len(devices)} Devices"
+            )
+
+            programs: List[Tuple[str, pathlib.Path, bytes]] = []
+            fetched = await asyncio.gather(
+                *(self._fetch_program(key, use_cache=False) for key in task_storage_keys)
+            )
+            for key, program_data in zip(task_storage_keys, fetched):
+                if program_data.status == "failure":
+                    status.errors[key] = program_data.error
+                    status.completed += len(devices)
+                    continue
+                program_path, program_bytes, _ = program_data.data
+                programs.append((key, program_path, program_bytes))
+
+            async def warm_device(device: str) -> None:
+                for key, program_path, program_bytes in programs:
+                    warmed = await self._warm_up_program(key, program_path, program_bytes, device)
+                    if warmed.status == "failure":
+                        self.logger.warning(f"Failed To Warm Up {key} On {device}: {warmed.error}")
+                        status.errors[key] = warmed.error
+                    status.completed += 1
+                    await asyncio.sleep(0)  # answer requests waiting on an inline run
+
+            await asyncio.gather(*(warm_device(device) for device in devices))
+            status.state = "done"
+            status.duration = time.monotonic() - began
+            self.logger.info(
+                f"Warmed Up {len(task_storage_keys) - len(status.errors)} Of {len(task_storage_keys)} Programs In {status.duration:.2f}s"
+            )
+            return create_success(status)
+
+    def start_warm_up(self, task_storage_keys: List[str]) -> int:
+        """
+        Warm Up Programs In The Background, After Any Warm-Up Already Running.
+
+        Returns:
+            int: The number of distinct programs that will be warmed up
+        """
+        programs = len(set(task_storage_keys))
+        if programs:
+            task = asyncio.create_task(self.warm_up(task_storage_keys))
+            self._warmup_tasks.add(task)
+            task.add_done_callback(self._warmup_tasks.discard)
+        return programs
+
+    async def _warm_up_program(
+        self, key: str, program_path: pathlib.Path, program_bytes: bytes, device: str
+    ) -> Result[bool, str]:
+        """Run A Program Once On A Device, On Zeros, Waiting For The Device To Be Idle."""
+        # Each device gets its own copy, as running a program moves it to the device
+        program = GraphProgram.from_bytes(program_bytes)
+        if isinstance(program, ValueError):
+            return create_failure(f"Error Importing Task: {program}")
+
+        needed = 0
+        if self.device_memory > 0:
+            estimate = self._get_memory_estimate(program_path, program_bytes, program)
+            if isinstance(estimate, ValueError):
+                return create_failure(f"Error Analysing Task: {estimate}")
+            needed = estimate.peak_bytes
+
+        placed = await self.devices.acquire(f"warmup:{key}", needed, device=device)
+        if placed.status == "failure":
+            return create_failure(placed.error)
+        slot, reserved = placed.data
+
+        try:
+            # Inputs are made where real inputs would be: here, or on the device itself
+            input_device = None if self.workers is not None else slot.device
+            inputs: ActualTensors = {
+                placeholder.name: Tensor.zeros(
+                    placeholder.shape, dtype=placeholder.dtype, device=input_device
+                )
+                .contiguous()
+                .realize()
+                for placeholder in program.placeholders
+            }
+
+            if self.workers is not None:
+                digest = hashlib.sha256(program_bytes).hexdigest()
+                executed = await self.workers.execute(
+                    slot, program_path, digest, program, inputs, []
+                )
+                if executed.status == "failure":
+                    return create_failure(executed.error)
+            else:
+                result_tensor = execute_graph_on_gpu(program, inputs, device=slot.device)
+                if isinstance(result_tensor, ValueError):
+                    return create_failure(str(result_tensor))
+                result_tensor.realize()
+            return create_success(True)
+        except Exception as e:
+            return create_failure(f"{type(e).__name__}: {str(e)}")
+        finally:
+            self.devices.release(slot, reserved, completed=False)
+
+    def is_known(self, execution_id: str) -> bool:
+        """Check Whether An Execution Is Queued, Running Or Has A Result."""
+        return (
+            execution_id in self.active_tasks
+            or self.events.latest(execution_id) is not None
+            or self.task_results.get(execution_id) is not None
+        )
+
     async def get_execution_status(self, execution_id: str) -> Optional[ComputeResult]:
         """Get the Current Status of a Task Execution."""
         return self.task_results.get(execution_id)
 
+    async def watch_executions(
+        self,
+        execution_ids: Optional[List[str]] = None,
+        keepalive: Optional[float] = None,
+    ) -> AsyncIterator[Optional[ExecutionEvent]]:
+        """
+        Yield The Current State And Then Live Events For Task Executions.
+
+        Args:
+            execution_ids: Executions to follow, None follows every execution
+            keepalive: Seconds without events after which None is yielded
+
+        Yields:
+            Execution events, or None when the keepalive interval passes;
+            stops once every followed execution has completed or failed.
+            Executions unknown when watching starts are not waited for.
+        """
+        subscription = self.events.subscribe(execution_ids)
+        remaining = set(execution_ids) if execution_ids is not None else None
+        replayed: Dict[str, ExecutionEvent] = {}
+
+        try:
+            # Replay the current state of each followed execution
+            for execution_id in execution_ids or []:
+                current = self.events.latest(execution_id)
+                if current is None:
+                    result = self.task_results.get(execution_id)
+                    if result is not None:
+                        current = ExecutionEvent(
+                            execution_id=result.execution_id,
+                            task_id=result.task_id,
+                            event="completed" if result.status == "success" else "failed",
+                            timestamp=time.time(),
+                            result=result,
+                        )
+                if current is None:
+                    remaining.discard(execution_id)
+                    continue
+
+                replayed[execution_id] = current
+                yield current
+                if current.event in TERMINAL_EVENTS:
+                    remaining.discard(execution_id)
+
+            # Follow live events
+            while remaining is None or remaining:
+                event = await subscription.get(timeout=keepalive)
+                if event is None:
+                    yield None
+                    continue
+                # Skip events already covered by the replayed state
+                previous = replayed.get(event.execution_id)
+                if previous is not None and (
+                    event is previous or event.timestamp < previous.timestamp
+                ):
+                    continue
+
+                yield event
+                if remaining is not None and event.event in TERMINAL_EVENTS:
+                    remaining.discard(event.execution_id)
+        finally:
+            subscription.close()
+
+    def _publish_event(
+        self,
+        request: TaskExecutionRequest,
+        event: str,
+        stage: Optional[str] = None,
+        result: Optional[ComputeResult] = None,
+    ) -> None:
+        """Publish A Progress Event For A Task Execution."""
+        self.events.publish(
+            ExecutionEvent(
+                execution_id=request.execution_id,
+                task_id=request.task_id,
+                event=event,
+                stage=stage,
+                timestamp=time.time(),
+                result=result,
+            )
+        )
+
+    def capacity(self, resident_models: Optional[List[str]] = None) -> NodeCapacity:
+        """Get A Snapshot Of The Current Execution Capacity."""
+        now = time.monotonic()
+        recent = sum(1 for t in self.completion_times if now - t <= THROUGHPUT_WINDOW)
+
+        return NodeCapacity(
+            queue_depth=self.task_queue.qsize(),
+            active_executions=len(self.active_tasks),
+            free_device_memory=self.devices.free_memory(),
+            free_host_memory=get_free_host_memory(),
+            resident_models=resident_models or [],
+            cached_programs=len(self.cached_programs),
+            throughput=recent / THROUGHPUT_WINDOW,
+            devices=self.devices.usage(),
+        )
+
+    def _report_state_change(self) -> None:
+        """Let The Status Reporter Know The Execution State Changed."""
+        if self.status_reporter is not None:
+            self.status_reporter.request_update()
+
+    def close(self) -> None:
+        """Release Resources Held By The Execution Service."""
+        self.task_results.close()
+
     async def cancel_execution(self, execution_id: str) -> Result[bool, str]:
         """Cancel a Running Task Execution."""
         if execution_id in self.active_tasks:
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+from tinygrad import Tensor
+from .chunking import is_chunked
+from .models import InputSlice
+from .result import create_failure, create_success, Result
+from .storage import StorageService
+from .tinygrad_backend.serialize_tensors import TensorLayout, TensorSerializer
+
+# Bytes read first to find a tensor's header
+HEADER_READ_SIZE = 4096
+
+# Byte ranges closer than this are read with one request
+MAX_RANGE_GAP = 64 << 10
+
+# Range requests made at once for one slice
+RANGE_CONCURRENCY = 8
+
+
+def group_byte_ranges(
+    byte_ranges: List[Tuple[int, int]], max_gap: int = MAX_RANGE_GAP
+) -> List[Tuple[int, int]]:
+    """Merge Sorted Byte Ranges Into Requests, Reading Small Gaps Rather Than Splitting."""
+    groups: List[Tuple[int, int]] = []
+    for start, end in byte_ranges:
+        if groups and start - groups[-1][1] <= max_gap:
+            groups[-1] = (groups[-1][0], end)
+        else:
+            groups.append((start, end))
+    return groups
+
+
+def _slice_locally(tensor: Tensor, input_slice: InputSlice) -> Result[Tensor, str]:
+    """Slice A Tensor Already In Memory."""
+    bounds = list(input_slice.ranges) + [
+        (0, size) for size in tensor.shape[len(input_slice.ranges) :]
+    ]
+    if len(input_slice.ranges) > len(tensor.shape) or any(
+        stop > size for (_, stop), size in zip(bounds, tensor.shape)
+    ):
+        return create_failure(
+            f"Slice {input_slice.ranges} Does Not Fit {input_slice.key} Of Shape {tensor.shape}"
+        )
+    return create_success(tensor.shrink(tuple(bounds)).contiguous())
+
+
+async def fetch_tensor_slice(
+    input_slice: InputSlice,
+    storage_service: StorageService,
+    logger: logging.Logger,
+    use_cache: bool = False,
+    peer_url: Optional[str] = None,
+) -> Result[Tensor, str]:
+    """
+    Read A Slice Of A Stored Tensor, Downloading Only The Bytes It Covers.
+
+    The tensor's header gives the layout of its elements, so the slice is
+    read with HTTP Range requests, from the peer serving the tensor if one
+    is given. Objects that cannot be read in parts, compressed tensors and
+    chunked objects, are downloaded whole and sliced locally, as are
+    tensors already downloaded.
+    """
+    key = input_slice.key
+
+    if use_cache and storage_service.is_downloaded(key):
+        with open(storage_service.download_manager.local_path(key), "rb") as f:
+            tensor = TensorSerializer.tensor_from_bytes(f.read())
+        return _slice_locally(tensor, input_slice)
+
+    header = await storage_service.get_object_range(key, 0, HEADER_READ_SIZE, peer_url)
+    if header.status == "failure":
+        return create_failure(header.error)
+
+    layout = None if is_chunked(header.data) else TensorLayout.parse(header.data)
+    if layout is None or isinstance(layout, ValueError):
+        logger.info(f"Reading {key} Whole To Slice It: {layout or 'Chunked Object'}")
+        whole = await storage_service.get_object(key, use_cache=use_cache, peer_url=peer_url)
+        if whole.status == "failure":
+            return create_failure(whole.error)
+        with open(whole.data, "rb") as f:
+            tensor = TensorSerializer.tensor_from_bytes(f.read())
+        return _slice_locally(tensor, input_slice)
+
+    sliced = layout.slice_byte_ranges(input_slice.ranges)
+    if isinstance(sliced, ValueError):
+        return create_failure(f"Invalid Slice Of {key}: {sliced}")
+    byte_ranges, slice_shape = sliced
+
+    groups = group_byte_ranges(byte_ranges)
+    semaphore = asyncio.Semaphore(RANGE_CONCURRENCY)
+
+    async def read(start: int, end: int) -> Result[bytes, str]:
+        async with semaphore:
+            return await storage_service.get_object_range(key, start, end, peer_url)
+
+    results = await asyncio.gather(*(read(start, end) for start, end in groups))
+    for result, (start, end) in zip(results, groups):
+        if result.status == "failure":
+            return create_failure(result.error)
+        if len(result.data) != end - start:
+            return create_failure(f"{key} Ended Before Byte {end}")
+
+    # Cut each range out of the request that covered it, in order
+    parts: List[bytes] = []
+    group_index = 0
+    for start, end in byte_ranges:
+        while groups[group_index][1] < end:
+            group_index += 1
+        group_start = groups[group_index][0]
+        data = results[group_index].data
+        parts.append(data[start - group_start : end - group_start])
+
+    fetched = sum(end - start for start, end in groups)
+    logger.info(f"Read {fetched} Bytes Of {key} In {len(groups)} Range Requests For Slice {input_slice.ranges}")
+    return create_success(layout.tensor_from_slice(b"".join(parts), slice_shape))
@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+from .models import TaskExecutionRequest
+
+
+# Task journal
+class TaskJournal:
+    """
+    Durable, Append-Only Journal Of Task Executions.
+
+    Every execution is recorded when it is enqueued, started and completed,
+    so queued work can be resumed after a restart. Records are written by a
+    single flusher that commits everything pending in one fsync'd
+    transaction, so many concurrent enqueues share the cost of one sync.
+    The flusher also drops the records of completed executions every
+    `compact_interval` seconds, so the journal only holds unfinished work.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        db_path: Path,
+        flush_interval: float = 0.005,
+        compact_interval: float = 60.0,
+    ):
+        self.logger = logger
+        self.db_path = Path(db_path)
+        self.flush_interval = flush_interval
+        self.compact_interval = compact_interval
+
+        # (execution_id, event, request json, future resolved once durable)
+        self._pending: List[
+            Tuple[str, str, Optional[str], Optional[asyncio.Future]]
+        ] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS journal (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                execution_id TEXT NOT NULL,
+                event TEXT NOT NULL,
+                request TEXT,
+                recorded_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS journal_execution_id ON journal (execution_id)"
+        )
+
+    def replay(self) -> List[Tuple[TaskExecutionRequest, int]]:
+        """
+        Get Every Journaled Task That Has Not Completed, In Enqueue Order.
+
+        Each task comes with the number of times it was started. A task
+        started before but never completed was running when the service
+        stopped, which may be because it crashed the service. Entries of
+        completed executions are compacted away as a side effect.
+
+        Returns:
+            List[Tuple[TaskExecutionRequest, int]]: Unfinished tasks and how
+            often each has been started
+        """
+        rows = self._conn.execute(
+            """
+            SELECT request, (
+                SELECT COUNT(*) FROM journal AS started
+                WHERE started.execution_id = journal.execution_id AND started.event = 'started'
+            )
+            FROM journal
+            WHERE event = 'enqueued' AND execution_id NOT IN (
+                SELECT execution_id FROM journal WHERE event = 'completed'
+            )
+            ORDER BY seq
+            """
+        ).fetchall()
+
+        self._compact()
+
+        pending = []
+        for request, starts in rows:
+            try:
+                pending.append((TaskExecutionRequest.model_validate_json(request), starts))
+            except Exception as e:
+                self.logger.error(f"Skipping Unreadable Journal Entry: {str(e)}")
+        return pending
+
+    async def record_enqueued(self, request: TaskExecutionRequest) -> None:
+        """Record That A Task Was Enqueued, Returning Once It Is Durable."""
+        future = asyncio.get_running_loop().create_future()
+        self._append(request.execution_id, "enqueued", request.model_dump_json(), future)
+        await future
+
+    async def record_started(self, execution_id: str) -> None:
+        """
+        Record That A Task Started Executing, Returning Once It Is Durable.
+
+        The record must be written before the task runs, so a task that
+        crashes the service is counted when it is replayed.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._append(execution_id, "started", None, future)
+        await future
+
+    def record_completed(self, execution_id: str) -> None:
+        """Record That A Task Finished, Successfully Or Not."""
+        self._append(execution_id, "completed", None, None)
+
+    def start(self) -> None:
+        """Start The Background Flusher."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush Outstanding Records And Close The Journal."""
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+        await self._flush()
+        self._conn.close()
+
+    def _append(
+        self,
+        execution_id: str,
+        event: str,
+        request: Optional[str],
+        future: Optional[asyncio.Future],
+    ) -> None:
+        """Queue A Record For The Next Flush."""
+        self._pending.append((execution_id, event, request, future))
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        """Flush Pending Records, Compacting Now And Then, Until The Journal Is Stopped."""
+        compacted_at = time.monotonic()
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.compact_interval)
+                # Give concurrent writers a moment to join this batch
+                if not self._closing:
+                    await asyncio.sleep(self.flush_interval)
+                self._wakeup.clear()
+                await self._flush()
+            except asyncio.TimeoutError:
+                pass
+
+            if time.monotonic() - compacted_at >= self.compact_interval:
+                compacted_at = time.monotonic()
+                try:
+                    await asyncio.to_thread(self._compact)
+                except Exception as e:
+                    self.logger.error(f"Failed To Compact Task Journal: {str(e)}")
+
+    async def _flush(self) -> None:
+        """Commit All Pending Records In One Transaction."""
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        try:
+            await asyncio.to_thread(self._write, batch)
+            error = None
+        except Exception as e:
+            self.logger.error(f"Failed To Write Task Journal: {str(e)}")
+            error = e
+
+        for _, _, _, future in batch:
+            if future is None or future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+    def _compact(self) -> None:
+        """Delete The Records Of Completed Executions."""
+        deleted = self._conn.execute(
+            """
+            DELETE FROM journal WHERE execution_id IN (
+                SELECT execution_id FROM journal WHERE event = 'completed'
+            )
+            """
+        ).rowcount
+        if deleted:
+            self.logger.debug(f"Compacted {deleted} Task Journal Records")
+
+    def _write(self, batch) -> None:
+        """Write A Batch Of Records."""
+        now = time.time()
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(
+                "INSERT INTO journal (execution_id, event, request, recorded_at) VALUES (?, ?, ?, ?)",
+                [(execution_id, event, request, now) for execution_id, event, request, _ in batch],
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
@@ -0,0 +1,230 @@
+import hashlib
+import logging
+import mmap
+import os
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Union
+from .result import create_success, create_failure, Result
+
+# Seconds a reader holds a reference to an entry unless it releases it sooner
+LEASE_DURATION = 60.0
+
+# Seconds to wait for another process holding the index lock
+INDEX_TIMEOUT = 10.0
+
+
+# Node-local tensor store
+class LocalTensorStore:
+    """
+    Store Of Objects Shared By Processes On One Host.
+
+    Objects live in files under a directory that should be memory-backed,
+    such as /dev/shm, indexed by a SQLite database in the same directory
+    that every process opens. A producer publishes what it uploads, and a
+    consumer on the same host reads it from here instead of downloading it.
+
+    Entries are reference counted: a reader holds a lease on an entry until
+    it releases it or the lease expires, which also covers readers that
+    crash. Entries without live leases are evicted once older than the TTL,
+    least recently used first when the store is over capacity.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        root: Union[str, Path],
+        capacity: int = 1 << 30,
+        ttl: float = 3600.0,
+        lease: float = LEASE_DURATION,
+    ):
+        self.logger = logger
+        self.root = Path(root)
+        self.capacity = capacity
+        self.ttl = ttl
+        self.lease = lease
+        self.holder = str(os.getpid())  # leases are held per process
+
+        self.objects_dir = self.root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.root / "index.db"),
+            timeout=INDEX_TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                file TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS leases (
+                key TEXT NOT NULL,
+                holder TEXT NOT NULL,
+                refs INTEGER NOT NULL,
+                expires REAL NOT NULL,
+                PRIMARY KEY (key, holder)
+            )
+            """
+        )
+
+    def _file_for(self, key: str) -> Path:
+        """Get The File Holding An Object."""
+        return self.objects_dir / hashlib.sha256(key.encode()).hexdigest()
+
+    def publish(self, key: str, file_path: Union[str, Path]) -> Result[Path, str]:
+        """
+        Copy A File Into The Store Under A Key, Replacing Any Previous Entry.
+
+        Readers of a replaced entry keep reading the data they opened.
+        """
+        target = self._file_for(key)
+        partial = target.with_name(f".{target.name}.{self.holder}.partial")
+        try:
+            shutil.copyfile(file_path, partial)
+            partial.replace(target)
+        except OSError as e:
+            partial.unlink(missing_ok=True)
+            return create_failure(f"Failed To Publish {key} Locally: {str(e)}")
+
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+            (key, target.name, target.stat().st_size, now, now),
+        )
+        self.evict()
+        return create_success(target)
+
+    def acquire(self, key: str) -> Optional[Path]:
+        """
+        Take A Reference To An Entry, None If The Store Does Not Hold The Key.
+
+        The reference lasts until `release`, or the lease duration at most.
+        """
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._conn.execute(
+                "SELECT file FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or not (self.objects_dir / row[0]).exists():
+                self._conn.execute("COMMIT")
+                return None
+
+            self._conn.execute(
+                """
+                INSERT INTO leases VALUES (?, ?, 1, ?)
+                ON CONFLICT (key, holder) DO UPDATE SET refs = refs + 1, expires = excluded.expires
+                """,
+                (key, self.holder, now + self.lease),
+            )
+            self._conn.execute(
+                "UPDATE entries SET last_used = ? WHERE key = ?", (now, key)
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return self.objects_dir / row[0]
+
+    def release(self, key: str) -> None:
+        """Drop A Reference Taken By `acquire`."""
+        self._conn.execute(
+            "UPDATE leases SET refs = refs - 1 WHERE key = ? AND holder = ?",
+            (key, self.holder),
+        )
+        self._conn.execute("DELETE FROM leases WHERE refs <= 0")
+
+    def read(self, key: str) -> Optional[bytes]:
+        """Read An Entry, None If The Store Does Not Hold The Key."""
+        path = self.acquire(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            self.release(key)
+
+    def copy_to(self, key: str, target: Path) -> bool:
+        """Copy An Entry To A File Of The Caller's, Returning Whether The Store Held It."""
+        path = self.acquire(key)
+        if path is None:
+            return False
+        partial = target.with_name(f".{target.name}.partial")
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(path, partial)
+            partial.replace(target)
+        except OSError as e:
+            partial.unlink(missing_ok=True)
+            self.logger.warning(f"Failed To Copy {key} From The Local Store: {str(e)}")
+            return False
+        finally:
+            self.release(key)
+        return True
+
+    def read_range(self, key: str, start: int, end: int) -> Optional[bytes]:
+        """Read Bytes [start, end) Of An Entry Through A Memory Map, None If Absent."""
+        path = self.acquire(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return b""
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return mapped[start:end]
+        finally:
+            self.release(key)
+
+    def evict(self) -> None:
+        """Remove Unreferenced Entries Past Their TTL Or Beyond The Store's Capacity."""
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute("DELETE FROM leases WHERE expires <= ?", (now,))
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+            unreferenced = self._conn.execute(
+                """
+                SELECT key, file, size, created FROM entries
+                WHERE key NOT IN (SELECT key FROM leases)
+                ORDER BY last_used
+                """
+            ).fetchall()
+
+            evicted = []
+            for key, file, size, created in unreferenced:
+                if total <= self.capacity and now - created <= self.ttl:
+                    continue
+                evicted.append((key, file))
+                total -= size
+            for key, _ in evicted:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+        # Files are removed after the commit, so no entry points at a missing file
+        for _, file in evicted:
+            (self.objects_dir / file).unlink(missing_ok=True)
+        if evicted:
+            self.logger.debug(f"Evicted {len(evicted)} Objects From The Local Store")
+
+    def close(self) -> None:
+        """Close The Store's Index."""
+        self._conn.close()
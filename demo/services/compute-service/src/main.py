@@ -1,16 +1,21 @@
-import httpx
+import asyncio
+import hashlib
+import importlib
 import uvicorn
 import logging
+import os
 import sys
 import time
 import platform
+from pathlib import Path
 from datetime import datetime
 from contextlib import asynccontextmanager
 from urllib.parse import urlparse
-from fastapi import Depends, FastAPI, HTTPException, Body
+from fastapi import Depends, FastAPI, HTTPException, Body, Query, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel, model_validator
 from functools import lru_cache
-from typing import Optional, TypeVar, Dict
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Tuple, TypeVar, Dict
 from .models import (
     ComputeStatus,
     StatusUpdateResponse,
@@ -25,15 +30,23 @@ from .models import (
     ComputeResult,
     BaseResponse,
     ActiveExecutionsResponse,
+    NodeProfile,
+    ProbeResponse,
+    LoadConfigRequest,
 )
 from .result import create_success, create_failure, Result
 from .logger import setup_logger
 from .environment import load_env_config, EnvSettings
 from .util import with_exponential_backoff
-from .execution import ExecutionService
-from .notification import notify_status_update
-from .storage import StorageService
-from .cache_models import ensure_weights_cached
+from .peer_cache import PEER_RESULTS_PATH
+from .startup import StartupProgress
+
+# Heavy modules are imported during startup, after the server is listening
+if TYPE_CHECKING:
+    from .execution import ExecutionService
+    from .process_pool import WorkerPool
+    from .storage import StorageService
+    from .tinygrad_backend.weight_shards import WeightManifest
 
 # Type variables for generic backoff function
 T = TypeVar("T")
@@ -43,6 +56,15 @@ E = TypeVar("E")
 VERSION = "1.0.0"
 START_TIME = time.time()
 
+# Seconds between keepalive comments on idle event streams
+EVENT_STREAM_KEEPALIVE = 15.0
+
+# Steps of startup, reported by the readiness probe
+STARTUP_STEPS = ["heartbeat", "storage", "config", "devices", "execution", "warmup"]
+
+# Steps the service takes tasks without waiting for
+OPTIONAL_STARTUP_STEPS = ["heartbeat"]
+
 
 # Dependency for logger
 @lru_cache()
@@ -53,6 +75,19 @@ def get_logger() -> logging.Logger:
 
 # In-memory config store
 global_config: Optional[SystemConfig] = None
+global_config_version: Optional[str] = None  # ETag of the config whose weights are cached
+global_weight_manifest: Optional["WeightManifest"] = None  # set for sharded weights
+global_node_profile: Optional[NodeProfile] = None  # set when the node was benchmarked
+
+
+def load_node_profile(path: Path) -> Result[Optional[NodeProfile], str]:
+    """Load The Node Profile Written By The Benchmark, If There Is One."""
+    if not path.exists():
+        return create_success(None)
+    try:
+        return create_success(NodeProfile.model_validate_json(path.read_bytes()))
+    except Exception as e:
+        return create_failure(f"Failed To Load Node Profile From {path}: {str(e)}")
 
 
 # Configuration service
@@ -65,54 +100,91 @@ class ConfigService:
         self.heartbeat_url = heartbeat_url
 
     async def load_config(
-        self, storage_service: StorageService
+        self, storage_service: "StorageService", force: bool = False
     ) -> Result[SystemConfig, str]:
-        """Get The Current Configuration From API With Retry Logic."""
+        """
+        Get The Current Configuration From API With Retry Logic.
+
+        The request is conditional on the version already loaded, and the
+        weights are only checked again when the configuration changed, so
+        reloading an unchanged configuration costs one small request.
+        """
+
+        async def _fetch_config_operation() -> Result[Optional[Tuple[SystemConfig, str]], str]:
+            import httpx
 
-        async def _fetch_config_operation() -> Result[SystemConfig, str]:
             try:
                 self.logger.debug(f"Fetching Configuration From {self.config_url}")
+                headers = {}
+                if global_config_version is not None and not force:
+                    headers["If-None-Match"] = global_config_version
                 async with httpx.AsyncClient() as client:
-                    response = await client.get(self.config_url)
+                    response = await client.get(self.config_url, headers=headers)
+                    if response.status_code == 304:
+                        return create_success(None)
                     response.raise_for_status()
 
                     config = SystemConfig.model_validate(response.json())
 
                     global global_config
                     global_config = config
-                    return create_success(config)
+
+                    # Servers without entity tags are versioned by content
+                    version = response.headers.get("ETag") or (
+                        f'"{hashlib.sha256(response.content).hexdigest()}"'
+                    )
+                    return create_success((config, version))
             except Exception as e:
                 return create_failure(f"Failed to Fetch Configuration: {str(e)}")
 
         self.logger.info(f"Loading Configuration From {self.config_url}")
-        config = await with_exponential_backoff(
+        fetched = await with_exponential_backoff(
             operation=_fetch_config_operation,
             logger=self.logger,
             operation_name="Fetch Configuration",
         )
 
-        if config.status == "failure":
-            return create_failure(config.error)
+        if fetched.status == "failure":
+            return create_failure(fetched.error)
+
+        global global_config_version
+        if fetched.data is None or (
+            fetched.data[1] == global_config_version and not force
+        ):
+            self.logger.info("Configuration Unchanged, Keeping Cached Weights")
+            return create_success(global_config)
+        config, version = fetched.data
+
+        from .cache_models import ensure_weights_cached
 
         weights_result = await ensure_weights_cached(
-            weights_data_key=config.data.weights_data_key,
+            config=config,
             storage_service=storage_service,
         )
 
         if weights_result.status == "failure":
             return create_failure(weights_result.error)
 
-        return create_success(config.data)
+        global global_weight_manifest
+        global_weight_manifest = weights_result.data
+        global_config_version = version
+
+        return create_success(config)
 
 
 # Task execution service
 class TaskService:
     """Service Class To Handle Task Execution."""
 
-    def __init__(self, logger: logging.Logger, listener_url: str):
+    def __init__(
+        self,
+        logger: logging.Logger,
+        listener_url: str,
+        execution_service: "ExecutionService",
+    ):
         self.logger = logger
         self.listener_url = listener_url
-        self.execution_service = ExecutionService(logger, listener_url)
+        self.execution_service = execution_service
 
     async def schedule_task(
         self, request: TaskExecutionRequest
@@ -141,54 +213,287 @@ class TaskService:
             return create_failure(f"Failed To Schedule Task: {str(e)}")
 
 
-# Application setup
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Application Lifespan Manager for Startup and Shutdown Events."""
-    logger = setup_logger(
-        "compute-service", app.state.env_config.SPLITUP_COMPUTE_SERVICE_LOG_LEVEL
+def build_compute_status(
+    execution_service: "ExecutionService", max_queue_depth: int
+) -> ComputeStatus:
+    """Build A Status Update Describing The Current Capacity Of The Node."""
+    resident_models = [global_config.weights_key] if global_config else []
+    capacity = execution_service.capacity(resident_models=resident_models)
+
+    busy = capacity.active_executions > 0 or capacity.queue_depth > 0
+    return ComputeStatus(
+        status="busy" if busy else "idle",
+        hasCapacity=capacity.queue_depth < max_queue_depth,
+        lastUpdated=int(time.time()),
+        capacity=capacity,
     )
-    logger.info("Starting Compute Service")
 
-    # Notify that the service is online
-    status = ComputeStatus(status="idle", lastUpdated=int(time.time()))
 
-    # Notify service is starting up (with exponential backoff built into the function)
-    result = await notify_status_update(
+# Modules that pull in tinygrad, numpy, boto3 and aiohttp, imported once the server is up
+HEAVY_MODULES = [".storage", ".cache_models", ".execution", ".devices", ".process_pool"]
+
+
+async def import_module(name: str):
+    """Import A Module In A Thread, So The Event Loop Keeps Answering Probes."""
+    return await asyncio.to_thread(importlib.import_module, name, __package__)
+
+
+async def notify_startup(env_config: EnvSettings, logger: logging.Logger) -> Result[bool, str]:
+    """Tell The Heartbeat Service The Node Is Online, Which Startup Does Not Depend On."""
+    notification = await import_module(".notification")
+
+    status = ComputeStatus(status="idle", lastUpdated=int(time.time()))
+    result = await notification.notify_status_update(
         status=status,
-        heartbeat_url=app.state.env_config.SPLITUP_COMPUTE_SERVICE_HEARTBEAT_URL,
+        heartbeat_url=env_config.SPLITUP_COMPUTE_SERVICE_HEARTBEAT_URL,
         logger=logger,
     )
-
     if result.status == "failure":
         logger.error(f"All Attempts To Notify Service Startup Failed: {result.error}")
-    else:
-        logger.info("Successfully Notified Service Startup")
+        return create_success(False)
+    logger.info("Successfully Notified Service Startup")
+    return create_success(True)
+
+
+async def open_storage() -> Result["StorageService", str]:
+    """Create The Storage Client, Off The Event Loop."""
+    storage = await import_module(".storage")
+
+    storage_service = await asyncio.to_thread(storage.StorageService)
+    app.state.storage_service = storage_service
+    return create_success(storage_service)
+
+
+async def prepare_devices(
+    env_config: EnvSettings, logger: logging.Logger
+) -> Result[Tuple[List[str], Optional["WorkerPool"]], str]:
+    """Open The Devices Tasks Run On, Starting Worker Processes If Configured."""
+    for name in HEAVY_MODULES:
+        await import_module(name)
+    from .devices import discover_devices, worker_devices
+    from .process_pool import WorkerPool
+
+    devices = discover_devices(env_config.SPLITUP_COMPUTE_SERVICE_DEVICES)
+    if isinstance(devices, ValueError):
+        return create_failure(f"Failed To Discover Devices: {devices}")
+
+    # Worker processes run programs outside the service, one per device
+    workers = None
+    if env_config.SPLITUP_COMPUTE_SERVICE_EXECUTOR == "process":
+        if not env_config.SPLITUP_COMPUTE_SERVICE_DEVICES.strip():
+            devices = worker_devices(
+                env_config.SPLITUP_COMPUTE_SERVICE_WORKERS or os.cpu_count() or 1
+            )
+        workers = WorkerPool(
+            logger=logger,
+            devices=devices,
+            memory_limit=env_config.SPLITUP_COMPUTE_SERVICE_WORKER_MEMORY,
+            max_tasks=env_config.SPLITUP_COMPUTE_SERVICE_WORKER_MAX_TASKS,
+        )
+        workers.start()
+    elif len(devices) > 1:
+        # Inline programs run on the event loop, so only one device could ever be busy
+        logger.warning(
+            f"Running Tasks On {devices[0]} Only: Several Devices Need SPLITUP_COMPUTE_SERVICE_EXECUTOR=process"
+        )
+        devices = devices[:1]
+    logger.info(f"Running Tasks On {len(devices)} Devices: {', '.join(devices)}")
+    return create_success((devices, workers))
+
+
+def create_execution_service(
+    env_config: EnvSettings,
+    logger: logging.Logger,
+    devices: List[str],
+    workers: Optional["WorkerPool"],
+) -> "ExecutionService":
+    """Create The Execution Service And The Stores It Keeps Its State In."""
+    from .execution import ExecutionService
+    from .peer_cache import PeerResultCache
+    from .result_store import ResultStore
+    from .status_reporter import StatusReporter
+    from .outbox import NotificationOutbox
+    from .journal import TaskJournal
+
+    # Results are kept to serve peers only when the node advertises where to reach it
+    peer_cache = None
+    if env_config.SPLITUP_COMPUTE_SERVICE_PEER_URL is not None:
+        peer_cache = PeerResultCache(
+            logger=logger,
+            cache_dir=Path(env_config.SPLITUP_COMPUTE_SERVICE_STATE_DIR) / "peer-results",
+            base_url=env_config.SPLITUP_COMPUTE_SERVICE_PEER_URL,
+            capacity=env_config.SPLITUP_COMPUTE_SERVICE_PEER_CACHE_SIZE,
+            ttl=env_config.SPLITUP_COMPUTE_SERVICE_PEER_CACHE_TTL,
+        )
+        logger.info(f"Serving Results To Peers At {env_config.SPLITUP_COMPUTE_SERVICE_PEER_URL}")
+
+    result_store = ResultStore(
+        logger=logger,
+        db_path=Path(env_config.SPLITUP_COMPUTE_SERVICE_STATE_DIR) / "results.db",
+        max_memory_entries=env_config.SPLITUP_COMPUTE_SERVICE_RESULT_CACHE_SIZE,
+        memory_ttl=env_config.SPLITUP_COMPUTE_SERVICE_RESULT_TTL,
+        retention=env_config.SPLITUP_COMPUTE_SERVICE_RESULT_RETENTION,
+    )
+    outbox = NotificationOutbox(
+        logger=logger,
+        listener_url=env_config.SPLITUP_COMPUTE_SERVICE_LISTENER_URL,
+        db_path=Path(env_config.SPLITUP_COMPUTE_SERVICE_STATE_DIR) / "outbox.db",
+        batch_size=env_config.SPLITUP_COMPUTE_SERVICE_NOTIFICATION_BATCH_SIZE,
+        max_attempts=env_config.SPLITUP_COMPUTE_SERVICE_NOTIFICATION_MAX_ATTEMPTS,
+    )
+    journal = TaskJournal(
+        logger=logger,
+        db_path=Path(env_config.SPLITUP_COMPUTE_SERVICE_STATE_DIR) / "journal.db",
+    )
+    status_reporter = StatusReporter(
+        logger=logger,
+        heartbeat_url=env_config.SPLITUP_COMPUTE_SERVICE_HEARTBEAT_URL,
+        snapshot=lambda: build_compute_status(
+            app.state.execution_service,
+            env_config.SPLITUP_COMPUTE_SERVICE_MAX_QUEUE_DEPTH,
+        ),
+        min_interval=env_config.SPLITUP_COMPUTE_SERVICE_STATUS_MIN_INTERVAL,
+        interval=env_config.SPLITUP_COMPUTE_SERVICE_STATUS_INTERVAL,
+    )
+    return ExecutionService(
+        logger=logger,
+        listener_url=env_config.SPLITUP_COMPUTE_SERVICE_LISTENER_URL,
+        task_results=result_store,
+        outbox=outbox,
+        journal=journal,
+        status_reporter=status_reporter,
+        device_memory=env_config.SPLITUP_COMPUTE_SERVICE_DEVICE_MEMORY,
+        admission_max_wait=env_config.SPLITUP_COMPUTE_SERVICE_ADMISSION_MAX_WAIT,
+        weight_manifest=lambda: global_weight_manifest,
+        devices=devices,
+        workers=workers,
+        peer_cache=peer_cache,
+        max_task_starts=env_config.SPLITUP_COMPUTE_SERVICE_MAX_TASK_STARTS,
+    )
+
+
+def parse_task_keys(spec: str) -> List[str]:
+    """Parse A Comma Separated List Of Task Storage Keys."""
+    return [key.strip() for key in spec.split(",") if key.strip()]
+
+
+async def start_service(
+    env_config: EnvSettings, logger: logging.Logger, progress: StartupProgress
+) -> None:
+    """
+    Bring The Service Up While It Already Answers Probes.
 
-    # Load initial configuration
+    The heartbeat notification, the configuration and weights, and the
+    devices do not depend on each other, so they are prepared concurrently,
+    and tasks are taken without waiting for the heartbeat service.
+    """
     config_service = ConfigService(
         logger=logger,
-        config_url=app.state.env_config.SPLITUP_COMPUTE_SERVICE_CONFIG_URL,
-        heartbeat_url=app.state.env_config.SPLITUP_COMPUTE_SERVICE_HEARTBEAT_URL,
+        config_url=env_config.SPLITUP_COMPUTE_SERVICE_CONFIG_URL,
+        heartbeat_url=env_config.SPLITUP_COMPUTE_SERVICE_HEARTBEAT_URL,
     )
 
-    config_result = await config_service.load_config(app.state.storage_service)
-    if config_result.status == "failure":
-        logger.error(
-            f"All Attempts To Load Initial Configuration Failed: {config_result.error}"
+    async def load_initial_config() -> Result[SystemConfig, str]:
+        storage = await progress.run("storage", open_storage())
+        if storage.status == "failure":
+            return storage
+        return await progress.run("config", config_service.load_config(storage.data))
+
+    async def start_execution() -> Result[int, str]:
+        devices, workers = prepared.data
+        execution_service = create_execution_service(env_config, logger, devices, workers)
+        app.state.execution_service = execution_service
+        execution_service.journal.start()
+        execution_service.outbox.start()
+        execution_service.status_reporter.start()
+
+        # Pick up work queued before the last shutdown or crash
+        resumed = await execution_service.resume_pending()
+        if resumed:
+            logger.info(f"Resumed {resumed} Unfinished Task Executions")
+        return create_success(resumed)
+
+    heartbeat = asyncio.create_task(
+        progress.run("heartbeat", notify_startup(env_config, logger))
+    )
+    try:
+        config, prepared = await asyncio.gather(
+            load_initial_config(),
+            progress.run("devices", prepare_devices(env_config, logger)),
         )
-        raise Exception(f"Failed To Load Initial Configuration: {config_result.error}")
+        if config.status == "failure" or prepared.status == "failure":
+            # Nothing else can start; the liveness probe reports the failure
+            if prepared.status == "success" and prepared.data[1] is not None:
+                await prepared.data[1].stop()
+            return
+
+        started = await progress.run("execution", start_execution())
+        if started.status == "failure":
+            return
+
+        # Compile the programs tasks are expected to run before reporting ready
+        warmup_keys = parse_task_keys(env_config.SPLITUP_COMPUTE_SERVICE_WARMUP_TASKS)
+        await progress.run("warmup", app.state.execution_service.warm_up(warmup_keys))
+        if progress.ready:
+            logger.info(f"Compute Service Ready After {progress.status().elapsed:.2f}s")
+        await heartbeat
+    finally:
+        heartbeat.cancel()
+
+
+# Application setup
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application Lifespan Manager for Startup and Shutdown Events."""
+    logger = setup_logger(
+        "compute-service", app.state.env_config.SPLITUP_COMPUTE_SERVICE_LOG_LEVEL
+    )
+    logger.info("Starting Compute Service")
+    env_config = app.state.env_config
+
+    # Report the benchmarked performance of the node, if it has been measured
+    global global_node_profile
+    profile_path = Path(env_config.SPLITUP_COMPUTE_SERVICE_NODE_PROFILE)
+    profile_result = load_node_profile(profile_path)
+    if profile_result.status == "failure":
+        logger.warning(profile_result.error)
+    elif profile_result.data is None:
+        logger.info(f"No Node Profile At {profile_path}, Run The Node Benchmark To Create One")
     else:
-        logger.info("Successfully Loaded Initial Configuration")
+        global_node_profile = profile_result.data
+        logger.info(
+            f"Loaded Node Profile Measured {datetime.fromtimestamp(global_node_profile.created_at).isoformat()}"
+        )
+
+    # Start up in the background, so probes are answered from the first moment
+    app.state.startup = StartupProgress(logger, STARTUP_STEPS, OPTIONAL_STARTUP_STEPS)
+    startup_task = asyncio.create_task(start_service(env_config, logger, app.state.startup))
 
     yield
 
+    if not startup_task.done():
+        startup_task.cancel()
+        await asyncio.gather(startup_task, return_exceptions=True)
+
+    execution_service = app.state.execution_service
+    if execution_service is not None:
+        # Nothing may finish and record its result once the stores are closed
+        await execution_service.stop()
+        await execution_service.status_reporter.stop()
+        await execution_service.outbox.stop()
+        await execution_service.journal.stop()
+        if execution_service.workers is not None:
+            await execution_service.workers.stop()
+        execution_service.close()
+
     # Shutdown logic: notify that the service is going offline
+    from .notification import notify_status_update
+
     status = ComputeStatus(status="offline", lastUpdated=int(time.time()))
 
     result = await notify_status_update(
         status=status,
-        heartbeat_url=app.state.env_config.SPLITUP_COMPUTE_SERVICE_HEARTBEAT_URL,
+        heartbeat_url=env_config.SPLITUP_COMPUTE_SERVICE_HEARTBEAT_URL,
         logger=logger,
     )
 
@@ -205,6 +510,11 @@ app = FastAPI(title="Compute Service API", lifespan=lifespan)
 # Store environment config at app state level
 app.state.env_config = None
 
+# Created during startup, None until then
+app.state.startup = None
+app.state.storage_service = None
+app.state.execution_service = None
+
 
 # Dependency to get notification URL
 def get_heartbeat_url():
@@ -240,18 +550,29 @@ def get_config_service(
     return ConfigService(logger, config_url, heartbeat_url)
 
 
+# Dependency for execution service
+def get_execution_service() -> "ExecutionService":
+    """Get The Shared Execution Service Instance, Once Startup Has Created It."""
+    if app.state.execution_service is None:
+        raise HTTPException(status_code=503, detail="Service Is Starting")
+    return app.state.execution_service
+
+
 # Dependency for task service
 def get_task_service(
     logger: logging.Logger = Depends(get_logger),
     listener_url: str = Depends(get_listener_url),
+    execution_service: "ExecutionService" = Depends(get_execution_service),
 ) -> TaskService:
     """Get The Task Service Instance."""
-    return TaskService(logger, listener_url)
+    return TaskService(logger, listener_url, execution_service)
 
 
 # Dependency for storage service
 def get_storage_service():
-    """Get The Storage Service Instance."""
+    """Get The Storage Service Instance, Once Startup Has Created It."""
+    if app.state.storage_service is None:
+        raise HTTPException(status_code=503, detail="Service Is Starting")
     return app.state.storage_service
 
 
@@ -261,18 +582,33 @@ def get_storage_service():
     responses={200: {"model": ConfigResponse}, 500: {"model": ErrorResponse}},
 )
 async def load_config(
+    request: Optional[LoadConfigRequest] = Body(default=None),
+    force: bool = Query(default=False),
     config_service: ConfigService = Depends(get_config_service),
-    storage_service: StorageService = Depends(get_storage_service),
+    storage_service: "StorageService" = Depends(get_storage_service),
 ):
-    """Load Configuration From External Service."""
-    result = await config_service.load_config(storage_service)
+    """
+    Load Configuration From External Service, Checking Weights Again If Forced Or Changed.
+
+    Programs listed in the request are warmed up in the background
+    afterwards, with progress reported by `/health`.
+    """
+    warmup_keys = request.warmup_task_keys if request is not None else []
+    execution_service = app.state.execution_service
+    if warmup_keys and execution_service is None:
+        raise HTTPException(status_code=503, detail="Service Is Starting")
+
+    result = await config_service.load_config(storage_service, force=force)
 
     if result.status == "failure":
         raise HTTPException(status_code=500, detail=result.error)
 
-    return ConfigResponse(
-        success=True, message="Configuration Loaded Successfully", config=result.data
-    )
+    message = "Configuration Loaded Successfully"
+    if warmup_keys:
+        warming = execution_service.start_warm_up(warmup_keys)
+        message += f", Warming Up {warming} Programs"
+
+    return ConfigResponse(success=True, message=message, config=result.data)
 
 
 @app.post(
@@ -315,6 +651,48 @@ async def get_execution_status(
     return result
 
 
+async def _stream_events(
+    execution_service: "ExecutionService", execution_ids: Optional[List[str]]
+) -> AsyncIterator[str]:
+    """Format Execution Events As A Server-Sent Event Stream."""
+    async for event in execution_service.watch_executions(
+        execution_ids, keepalive=EVENT_STREAM_KEEPALIVE
+    ):
+        if event is None:
+            yield ": keepalive\n\n"
+        else:
+            yield f"event: {event.event}\ndata: {event.model_dump_json()}\n\n"
+
+
+@app.get("/execution/{execution_id}/events", responses={404: {"model": ErrorResponse}})
+async def stream_execution_status(
+    execution_id: str,
+    execution_service: "ExecutionService" = Depends(get_execution_service),
+):
+    """Stream Status Events For A Task Execution Until It Completes."""
+    if not execution_service.is_known(execution_id):
+        raise HTTPException(status_code=404, detail="Task execution not found")
+
+    return StreamingResponse(
+        _stream_events(execution_service, [execution_id]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@app.get("/executions/events")
+async def stream_executions_status(
+    execution_id: Optional[List[str]] = Query(default=None),
+    execution_service: "ExecutionService" = Depends(get_execution_service),
+):
+    """Stream Status Events For Several Task Executions, Or All If None Are Given."""
+    return StreamingResponse(
+        _stream_events(execution_service, execution_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @app.post(
     "/execution/{execution_id}/cancel",
     response_model=BaseResponse,
@@ -359,6 +737,26 @@ async def list_active_executions(
     )
 
 
+@app.get(
+    PEER_RESULTS_PATH + "/{key:path}",
+    response_class=FileResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_peer_result(
+    key: str,
+    execution_service: "ExecutionService" = Depends(get_execution_service),
+):
+    """Serve A Result This Node Produced Recently, Supporting Range Requests."""
+    if execution_service.peer_cache is None:
+        raise HTTPException(status_code=404, detail="Peer Result Serving Is Disabled")
+
+    path = execution_service.peer_cache.get(key)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Result {key} Is Not Cached")
+
+    return FileResponse(path, media_type="application/octet-stream")
+
+
 @app.get(
     "/health",
     response_model=HealthCheckResponse,
@@ -368,10 +766,14 @@ async def health_check():
     """Get Health Status Of The Service."""
     try:
         uptime = int(time.time() - START_TIME)
+        startup = app.state.startup.status()
+        execution_service = app.state.execution_service
 
         # Determine the system status
         status = "healthy"
-        if global_config is None:
+        if startup.failed:
+            status = "unhealthy"
+        elif global_config is None or not startup.ready:
             status = "degraded"
 
         health_status = HealthStatus(
@@ -383,6 +785,25 @@ async def health_check():
                 "python_version": platform.python_version(),
                 "config_loaded": global_config is not None,
                 "start_time": datetime.fromtimestamp(START_TIME).isoformat(),
+                "node_profile": (
+                    global_node_profile.model_dump() if global_node_profile else None
+                ),
+                "startup": startup.model_dump(),
+                "devices": (
+                    [usage.model_dump() for usage in execution_service.devices.usage()]
+                    if execution_service is not None
+                    else []
+                ),
+                "warmup": (
+                    execution_service.warmup.model_dump()
+                    if execution_service is not None
+                    else None
+                ),
+                "worker_restarts": (
+                    execution_service.workers.restarts()
+                    if execution_service is not None and execution_service.workers is not None
+                    else None
+                ),
             },
         )
 
@@ -397,6 +818,35 @@ async def health_check():
         raise HTTPException(status_code=500, detail=f"Health Check Failed: {str(e)}")
 
 
+@app.get(
+    "/health/live",
+    response_model=ProbeResponse,
+    responses={200: {"model": ProbeResponse}, 503: {"model": ProbeResponse}},
+)
+async def liveness_probe(response: Response):
+    """Report Whether The Service Is Alive, Which It Is Unless Startup Failed."""
+    startup = app.state.startup.status()
+    if startup.failed:
+        response.status_code = 503
+        return ProbeResponse(success=False, message="Startup Failed", startup=startup)
+    return ProbeResponse(success=True, message="Service Is Alive", startup=startup)
+
+
+@app.get(
+    "/health/ready",
+    response_model=ProbeResponse,
+    responses={200: {"model": ProbeResponse}, 503: {"model": ProbeResponse}},
+)
+async def readiness_probe(response: Response):
+    """Report Whether The Service Is Ready To Take Tasks, With Startup Progress."""
+    startup = app.state.startup.status()
+    if not startup.ready:
+        response.status_code = 503
+        message = "Startup Failed" if startup.failed else "Service Is Starting"
+        return ProbeResponse(success=False, message=message, startup=startup)
+    return ProbeResponse(success=True, message="Service Is Ready", startup=startup)
+
+
 def main():
     """Main Entry Point For The Application."""
     # Load Configuration From Environment
@@ -407,7 +857,6 @@ def main():
 
     # Store environment config in app state
     app.state.env_config = env_result.data
-    app.state.storage_service = StorageService()
 
     # Start the API server
     logger = get_logger()
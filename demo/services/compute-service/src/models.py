@@ -1,19 +1,63 @@
 from pydantic import BaseModel, model_validator
-from typing import Optional, Literal, Dict, Any, List
+from typing import Optional, Literal, Dict, Any, List, Tuple, Union
 from urllib.parse import urlparse
+from pathlib import PurePosixPath
+from .tinygrad_backend.merkle import DEFAULT_CHUNK_SIZE
 
 
 class SystemConfig(BaseModel):
     """System configuration model."""
 
-    weights_data_key: str
+    weights_data_key: Optional[str] = None  # one object holding every weight
+    weights_manifest_key: Optional[str] = None  # manifest of per-tensor shards
+
+    @model_validator(mode="after")
+    def validate_weights(self):
+        """Validate That Weights Are Given One Way Or Another."""
+        if self.weights_data_key is None and self.weights_manifest_key is None:
+            raise ValueError(
+                "Either weights_data_key Or weights_manifest_key Must Be Given"
+            )
+        return self
+
+    @property
+    def weights_key(self) -> str:
+        """Key Identifying The Model Whose Weights Are Configured."""
+        return self.weights_manifest_key or self.weights_data_key
+
+
+class DeviceUsage(BaseModel):
+    """Utilization of one device of the node."""
+
+    device: str
+    busy: bool = False
+    active_execution: Optional[str] = None
+    completed_executions: int = 0
+    utilization: float = 0.0  # fraction of the recent window spent executing
+    free_memory: Optional[int] = None
+    resident_weights: int = 0  # weight shards kept on the device
+
+
+class NodeCapacity(BaseModel):
+    """Capacity snapshot reported alongside the compute status."""
+
+    queue_depth: int
+    active_executions: int
+    free_device_memory: Optional[int] = None
+    free_host_memory: Optional[int] = None
+    resident_models: List[str] = []
+    cached_programs: int = 0
+    throughput: float = 0.0  # completed executions per second
+    devices: List[DeviceUsage] = []
 
 
 class ComputeStatus(BaseModel):
     """Status update from compute service to heartbeat service."""
 
     status: Literal["offline"] | Literal["idle"] | Literal["busy"] | Literal["error"]
+    hasCapacity: bool = True
     lastUpdated: int
+    capacity: Optional[NodeCapacity] = None
 
 
 class StatusUpdateResponse(BaseModel):
@@ -38,6 +82,12 @@ class BaseResponse(BaseModel):
 
 
 # Config endpoint models
+class LoadConfigRequest(BaseModel):
+    """Request model for loading the configuration."""
+
+    warmup_task_keys: List[str] = []  # programs to compile before tasks need them
+
+
 class ConfigResponse(BaseResponse):
     """Response model for config operations."""
 
@@ -45,19 +95,81 @@ class ConfigResponse(BaseResponse):
 
 
 # Task execution models
+class InputSlice(BaseModel):
+    """A slice of a stored tensor, read without downloading the rest of it."""
+
+    key: str
+    ranges: List[Tuple[int, int]]  # [start, stop) per leading axis; later axes are whole
+    name: Optional[str] = None  # placeholder bound to the slice, defaults to the key's stem
+
+    @model_validator(mode="after")
+    def validate_ranges(self):
+        """Validate That Every Range Is Non-Empty."""
+        for start, stop in self.ranges:
+            if not 0 <= start < stop:
+                raise ValueError(f"Invalid Slice Range [{start}, {stop})")
+        return self
+
+    @property
+    def placeholder_name(self) -> str:
+        """Name Of The Placeholder The Slice Is Bound To."""
+        return self.name or PurePosixPath(self.key).stem
+
+
+InputReference = Union[str, InputSlice]  # a whole object, or a slice of one
+
+
+class ChainedStage(BaseModel):
+    """A program run on the output of the previous program, in the same execution."""
+
+    task_storage_key: str
+    input_storage_keys: List[InputReference] = []
+    input_placeholder: str  # placeholder bound to the previous program's output
+    upload_output: bool = False  # the last program's output is always uploaded
+    input_peers: Dict[str, str] = {}  # input key -> URL of a peer node serving it
+
+
 class TaskExecutionRequest(BaseModel):
     """Request model for task execution."""
 
     execution_id: str
     task_id: str
     task_storage_key: str
-    input_storage_keys: List[str]
+    input_storage_keys: List[InputReference]
     parameters: List[str] = []
+    output_encoding: Optional[str] = None  # e.g. "zstd" or "zstd+float16"
+    next_stages: List[ChainedStage] = []  # programs chained after this one
+    upload_output: bool = False  # upload this program's output even when chained
+    merkle_chunk_size: int = DEFAULT_CHUNK_SIZE  # bytes under each leaf of result hashes
+    input_peers: Dict[str, str] = {}  # input key -> URL of a peer node serving it
+
+    @model_validator(mode="after")
+    def validate_output_encoding(self):
+        """Validate That The Output Encoding Is Supported."""
+        # Imported here, as the serializer pulls in tinygrad
+        from .tinygrad_backend.serialize_tensors import TensorEncoding
+
+        encoding = TensorEncoding.parse(self.output_encoding)
+        if isinstance(encoding, ValueError):
+            raise encoding
+        return self
+
+    @model_validator(mode="after")
+    def validate_merkle_chunk_size(self):
+        """Validate That Result Hashes Have A Usable Chunk Size."""
+        if self.merkle_chunk_size <= 0:
+            raise ValueError("merkle_chunk_size Must Be Positive")
+        return self
 
     @model_validator(mode="after")
     def validate_urls(self):
         """Validate That URLs Are Valid."""
-        for url in self.parameters:
+        peer_urls = [
+            url
+            for stage in [self, *self.next_stages]
+            for url in stage.input_peers.values()
+        ]
+        for url in [*self.parameters, *peer_urls]:
             try:
                 result = urlparse(url)
                 if not all([result.scheme, result.netloc]):
@@ -98,6 +210,85 @@ class HealthCheckResponse(BaseResponse):
     health: HealthStatus
 
 
+class StartupStep(BaseModel):
+    """Progress of one step of starting the service."""
+
+    name: str
+    state: Literal["pending", "running", "done", "failed"] = "pending"
+    duration: Optional[float] = None  # seconds, once finished
+    error: Optional[str] = None
+
+
+class StartupStatus(BaseModel):
+    """Progress of starting the service."""
+
+    ready: bool
+    failed: bool
+    elapsed: float  # seconds since startup began, until it finished
+    steps: List[StartupStep] = []
+
+
+class WarmupStatus(BaseModel):
+    """Progress of compiling programs before tasks need them."""
+
+    state: Literal["idle", "running", "done"] = "idle"
+    programs: List[str] = []  # task storage keys being warmed up
+    total: int = 0  # program runs, one per program and device
+    completed: int = 0
+    errors: Dict[str, str] = {}  # task storage key -> why it could not be warmed up
+    duration: Optional[float] = None  # seconds, once done
+
+
+class ProbeResponse(BaseResponse):
+    """Response model for the liveness and readiness probes."""
+
+    startup: StartupStatus
+
+
+# Node Profile Models
+class DeviceBenchmark(BaseModel):
+    """Measured performance of one tinygrad backend."""
+
+    device: str
+    flops: Dict[str, float] = {}  # achieved FLOP/s of a matmul, per dtype
+    memory_bandwidth: Optional[float] = None  # bytes/s within device memory
+    host_to_device: Optional[float] = None  # bytes/s
+    device_to_host: Optional[float] = None  # bytes/s
+    launch_overhead: Optional[float] = None  # seconds per kernel
+    errors: Dict[str, str] = {}  # measurement that failed -> why
+
+
+class ThroughputBenchmark(BaseModel):
+    """Measured read and write throughput of a location, in bytes/s."""
+
+    location: str
+    read: Optional[float] = None
+    write: Optional[float] = None
+    error: Optional[str] = None
+
+
+class EncodingBenchmark(BaseModel):
+    """Measured TensorSerializer rates of one encoding, in tensor bytes/s."""
+
+    encode: float
+    decode: float
+    ratio: float  # tensor bytes per serialized byte
+
+
+class NodeProfile(BaseModel):
+    """Characterization of a compute node, written by the node CLI's benchmark."""
+
+    version: int = 1
+    created_at: int
+    hostname: str
+    default_device: str
+    devices: List[DeviceBenchmark] = []
+    disk: Optional[ThroughputBenchmark] = None
+    storage: Optional[ThroughputBenchmark] = None
+    serializer: Dict[str, EncodingBenchmark] = {}
+    calibration: Dict[str, float] = {}  # NodeCalibration of the default device
+
+
 # API models
 class SystemConfigUpdateRequest(BaseModel):
     """Request Model For Updating Configuration."""
@@ -116,6 +307,21 @@ class ComputeResult(BaseModel):
     task_id: str
     tensor_urls: List[str]
     status: Literal["success", "failure"]
+    error: Optional[str] = None
+    merkle_roots: List[str] = []  # hex root over each tensor's data, matching tensor_urls
+    merkle_chunk_size: Optional[int] = None
+    peer_urls: List[Optional[str]] = []  # where this node serves each tensor, matching tensor_urls
+
+
+class ExecutionEvent(BaseModel):
+    """Progress event for a task execution."""
+
+    execution_id: str
+    task_id: str
+    event: Literal["queued", "started", "stage", "completed", "failed"]
+    stage: Optional[str] = None
+    timestamp: float
+    result: Optional[ComputeResult] = None
 
 
 class ActiveExecutionsResponse(BaseResponse):
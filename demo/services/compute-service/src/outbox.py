@@ -0,0 +1,259 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+from .models import ComputeResult, StatusUpdateResponse
+from .result import create_success, create_failure, Result
+
+
+# Completion notification outbox
+class NotificationOutbox:
+    """
+    Durable Outbox For Completed Execution Notifications.
+
+    Notifications are written to a local SQLite database (WAL mode) and
+    delivered to the listener by a background sender, so the execution
+    worker never waits on the listener and undelivered notifications
+    survive restarts. Pending notifications are sent together to
+    `/report_completed_batch`; if the listener does not offer that
+    endpoint they are sent one at a time to `/report_completed`. A
+    notification still undelivered after `max_attempts` is moved to a
+    dead letter table, kept for inspection but no longer retried.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        listener_url: str,
+        db_path: Path,
+        batch_size: int = 32,
+        initial_backoff: float = 3.0,
+        max_backoff: float = 300.0,
+        max_attempts: int = 20,
+    ):
+        self.logger = logger
+        self.listener_url = listener_url
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+
+        # None until the listener has been probed for batch support
+        self.batch_supported: Optional[bool] = None
+
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS notifications (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                payload TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS dead_notifications (
+                id INTEGER PRIMARY KEY,
+                payload TEXT NOT NULL,
+                attempts INTEGER NOT NULL,
+                error TEXT NOT NULL,
+                failed_at REAL NOT NULL
+            )
+            """
+        )
+
+    def enqueue(self, execution_id: str, task_id: str, result: ComputeResult) -> None:
+        """Persist A Completion Notification For Background Delivery."""
+        payload = {
+            "execution_id": execution_id,
+            "task_id": task_id,
+            "result": result.model_dump(),
+        }
+        self._conn.execute(
+            "INSERT INTO notifications (payload, next_attempt_at) VALUES (?, ?)",
+            (json.dumps(payload), time.time()),
+        )
+        self._wakeup.set()
+
+    def pending(self) -> int:
+        """Number Of Notifications Awaiting Delivery."""
+        return self._conn.execute("SELECT COUNT(*) FROM notifications").fetchone()[0]
+
+    def dead(self) -> int:
+        """Number Of Notifications Given Up On."""
+        return self._conn.execute("SELECT COUNT(*) FROM dead_notifications").fetchone()[0]
+
+    def start(self) -> None:
+        """Start The Background Sender."""
+        if self._task is None:
+            self._client = httpx.AsyncClient(timeout=10.0)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop The Background Sender, Leaving Undelivered Notifications On Disk."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+        self._conn.close()
+
+    async def _run(self) -> None:
+        """Deliver Due Notifications Until Cancelled."""
+        while True:
+            try:
+                self._wakeup.clear()
+                due = self._due_notifications()
+
+                if due:
+                    await self._deliver(due)
+                    continue
+
+                # Sleep until the next retry is due or a new notification arrives
+                row = self._conn.execute(
+                    "SELECT MIN(next_attempt_at) FROM notifications"
+                ).fetchone()
+                timeout = None if row[0] is None else max(0.0, row[0] - time.time())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Error Delivering Completion Notifications: {str(e)}")
+                await asyncio.sleep(self.initial_backoff)
+
+    def _due_notifications(self) -> List[Tuple[int, int, Dict[str, Any]]]:
+        """Get The Oldest Notifications Whose Next Attempt Is Due."""
+        rows = self._conn.execute(
+            """
+            SELECT id, attempts, payload FROM notifications
+            WHERE next_attempt_at <= ? ORDER BY id LIMIT ?
+            """,
+            (time.time(), self.batch_size),
+        ).fetchall()
+        return [(row[0], row[1], json.loads(row[2])) for row in rows]
+
+    async def _deliver(self, due: List[Tuple[int, int, Dict[str, Any]]]) -> None:
+        """Deliver Notifications, Batched When The Listener Supports It."""
+        if self.batch_supported is not False and len(due) > 1:
+            result = await self._send_batch([payload for _, _, payload in due])
+            if result.status == "success":
+                self._delivered([row_id for row_id, _, _ in due])
+                return
+            if self.batch_supported is not False:
+                self._failed(due, result.error)
+                return
+
+        for row_id, attempts, payload in due:
+            result = await self._send_one(payload)
+            if result.status == "success":
+                self._delivered([row_id])
+            else:
+                self._failed([(row_id, attempts, payload)], result.error)
+
+    async def _send_batch(self, payloads: List[Dict[str, Any]]) -> Result[bool, str]:
+        """Send Several Notifications In One Request."""
+        try:
+            response = await self._client.post(
+                f"{self.listener_url}/report_completed_batch",
+                json={"notifications": payloads},
+            )
+            if response.status_code in (404, 405):
+                self.logger.info(
+                    "Listener Does Not Support Batched Notifications, Sending Individually"
+                )
+                self.batch_supported = False
+                return create_failure("Batched Notifications Not Supported")
+
+            response.raise_for_status()
+            self.batch_supported = True
+            return self._parse_response(response)
+        except Exception as e:
+            return create_failure(
+                f"Failed to Send Batched Completed Task Notifications: {str(e)}"
+            )
+
+    async def _send_one(self, payload: Dict[str, Any]) -> Result[bool, str]:
+        """Send A Single Notification."""
+        try:
+            response = await self._client.post(
+                f"{self.listener_url}/report_completed", json=payload
+            )
+            response.raise_for_status()
+            return self._parse_response(response)
+        except Exception as e:
+            return create_failure(
+                f"Failed to Send Completed Task Notification: {str(e)}"
+            )
+
+    @staticmethod
+    def _parse_response(response: httpx.Response) -> Result[bool, str]:
+        """Interpret The Listener's Response."""
+        status_response = StatusUpdateResponse.model_validate(response.json())
+        if status_response.success:
+            return create_success(True)
+        return create_failure(status_response.message)
+
+    def _delivered(self, row_ids: List[int]) -> None:
+        """Remove Delivered Notifications."""
+        self._conn.executemany(
+            "DELETE FROM notifications WHERE id = ?", [(row_id,) for row_id in row_ids]
+        )
+
+    def _failed(self, rows: List[Tuple[int, int, Dict[str, Any]]], error: str) -> None:
+        """Schedule Failed Notifications For Retry With Exponential Backoff."""
+        now = time.time()
+        updates = []
+        for row_id, attempts, payload in rows:
+            if attempts + 1 >= self.max_attempts:
+                self._give_up(row_id, attempts + 1, payload, error)
+                continue
+            backoff = min(self.initial_backoff * (2**attempts), self.max_backoff)
+            updates.append((attempts + 1, now + backoff, row_id))
+            self.logger.warning(
+                f"Notify Completed Task '{payload['task_id']}' Attempt {attempts + 1} Failed: {error}. Retrying in {backoff}s..."
+            )
+        self._conn.executemany(
+            "UPDATE notifications SET attempts = ?, next_attempt_at = ? WHERE id = ?",
+            updates,
+        )
+
+    def _give_up(self, row_id: int, attempts: int, payload: Dict[str, Any], error: str) -> None:
+        """Move A Notification To The Dead Letter Table."""
+        self.logger.error(
+            f"Giving Up Notifying Completed Task '{payload['task_id']}' After {attempts} Attempts: {error}"
+        )
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO dead_notifications VALUES (?, ?, ?, ?, ?)",
+                (row_id, json.dumps(payload), attempts, error, time.time()),
+            )
+            self._conn.execute("DELETE FROM notifications WHERE id = ?", (row_id,))
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
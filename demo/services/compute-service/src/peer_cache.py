@@ -0,0 +1,90 @@
+import hashlib
+import logging
+import shutil
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, OrderedDict as OrderedDictType, Tuple
+from urllib.parse import quote
+
+# Path under which the service serves cached results to peers
+PEER_RESULTS_PATH = "/results"
+
+
+# Cache of results served to peers
+class PeerResultCache:
+    """
+    Recently Produced Results, Kept To Serve Peers Directly.
+
+    A node running the next stage can fetch a result from the node that
+    produced it instead of from remote storage, saving a round trip
+    through the bucket. Results are kept until the cache is over capacity,
+    least recently used first, or their TTL passes.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        cache_dir: Path,
+        base_url: str,
+        capacity: int = 1 << 30,
+        ttl: float = 600.0,
+    ):
+        self.logger = logger
+        self.cache_dir = Path(cache_dir)
+        self.base_url = base_url.rstrip("/")
+        self.capacity = capacity
+        self.ttl = ttl
+        # storage key -> (file, size, stored at), least recently used first
+        self._entries: OrderedDictType[str, Tuple[Path, int, float]] = OrderedDict()
+        self._size = 0
+
+        # Results of a previous run are not indexed, so they are dropped
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def url_for(self, key: str) -> str:
+        """Get The URL Peers Fetch A Result From."""
+        return f"{self.base_url}{PEER_RESULTS_PATH}/{quote(key)}"
+
+    def put(self, key: str, file_path: Path) -> str:
+        """
+        Move A Serialized Result Into The Cache.
+
+        Returns:
+            str: The URL peers fetch the result from
+        """
+        self._discard(key)
+        target = self.cache_dir / hashlib.sha256(key.encode()).hexdigest()
+        shutil.move(file_path, target)
+
+        size = target.stat().st_size
+        self._entries[key] = (target, size, time.monotonic())
+        self._size += size
+        self._evict()
+        return self.url_for(key)
+
+    def get(self, key: str) -> Optional[Path]:
+        """Get The File Of A Cached Result, None If It Is Not Cached."""
+        self._evict()
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _discard(self, key: str) -> None:
+        """Forget A Result And Delete Its File."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        path, size, _ = entry
+        self._size -= size
+        path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Drop Expired Results, And The Least Recently Used Beyond Capacity."""
+        now = time.monotonic()
+        for key, (_, _, stored_at) in list(self._entries.items()):
+            if now - stored_at > self.ttl or self._size > self.capacity:
+                self._discard(key)
@@ -0,0 +1,359 @@
+import asyncio
+import json
+import logging
+import os
+import pathlib
+import signal
+import sys
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from tinygrad import Tensor
+from .devices import DeviceSlot
+from .result import create_success, create_failure, Result
+from .tinygrad_backend.core import GraphProgram
+from .tinygrad_backend.types import ActualTensors
+from .tinygrad_backend.weight_shards import WeightShard
+
+# Directory workers are started from, so they can import this package
+SERVICE_DIR = pathlib.Path(__file__).resolve().parent.parent
+
+# Seconds a worker has to start up and open its device
+STARTUP_TIMEOUT = 120.0
+
+# Seconds between checks of a running worker's memory
+MEMORY_POLL_INTERVAL = 0.25
+
+# Alignment of tensors within a shared memory segment
+SEGMENT_ALIGNMENT = 64
+
+# Largest message a worker may send
+MAX_MESSAGE_SIZE = 16 << 20
+
+
+def _align(offset: int) -> int:
+    """Round An Offset Up To The Segment Alignment."""
+    return (offset + SEGMENT_ALIGNMENT - 1) // SEGMENT_ALIGNMENT * SEGMENT_ALIGNMENT
+
+
+def get_process_memory(pid: int) -> Optional[int]:
+    """Get The Resident Memory Of A Process In Bytes, If It Can Be Determined."""
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# One warm worker process
+class WorkerProcess:
+    """
+    A Worker Process Running Programs On One Device.
+
+    The worker keeps programs and weight shards loaded between tasks. It is
+    restarted when it crashes, when it exceeds its memory limit while
+    running a task, and when it is left holding more than its limit or has
+    run its quota of tasks, which bounds what a leak can hold on to.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        device: str,
+        memory_limit: int = 0,
+        max_tasks: int = 0,
+    ):
+        self.logger = logger
+        self.device = device
+        self.memory_limit = memory_limit  # bytes of resident memory, 0 for no limit
+        self.max_tasks = max_tasks  # tasks before a restart, 0 for no limit
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.tasks_run = 0
+        self.restarts = 0
+        self._request_id = 0  # echoed by the worker, to match replies to requests
+        self._starting: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start The Worker In The Background."""
+        self._starting = asyncio.create_task(self._spawn())
+
+    async def _spawn(self) -> Result[bool, str]:
+        """Start A Worker Process And Wait Until It Has Opened Its Device."""
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            "src.process_worker",
+            self.device,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            cwd=SERVICE_DIR,
+            limit=MAX_MESSAGE_SIZE,
+        )
+        self.tasks_run = 0
+        try:
+            ready = await asyncio.wait_for(self._receive(), timeout=STARTUP_TIMEOUT)
+        except asyncio.TimeoutError:
+            ready = create_failure(f"Worker For {self.device} Did Not Start In Time")
+        if ready.status == "failure":
+            self.logger.error(ready.error)
+            if self.process.returncode is None:
+                self.process.kill()
+                await self.process.wait()
+            return ready
+
+        self.logger.info(f"Started Worker For {self.device} (PID {self.process.pid})")
+        return create_success(True)
+
+    async def _ensure_running(self) -> Result[bool, str]:
+        """Wait For The Worker To Be Started, Starting It Again If It Is Not Running."""
+        if self._starting is not None:
+            started = await self._starting
+            self._starting = None
+            if started.status == "failure":
+                return started
+        if self.process is None:
+            return await self._spawn()
+        if self.process.returncode is not None:
+            self.logger.warning(
+                f"Worker For {self.device} Exited With Code {self.process.returncode}, Restarting It"
+            )
+            self.restarts += 1
+            return await self._spawn()
+        return create_success(True)
+
+    async def _receive(self) -> Result[Dict[str, Any], str]:
+        """Read One Message From The Worker."""
+        line = await self.process.stdout.readline()
+        if not line:
+            code = await self.process.wait()
+            return create_failure(f"Worker For {self.device} Exited With Code {code}")
+        try:
+            return create_success(json.loads(line))
+        except ValueError as e:
+            return create_failure(f"Worker For {self.device} Sent An Invalid Reply: {str(e)}")
+
+    async def _watch_memory(self) -> None:
+        """Kill The Worker If It Goes Over Its Memory Limit."""
+        while True:
+            await asyncio.sleep(MEMORY_POLL_INTERVAL)
+            used = get_process_memory(self.process.pid)
+            if used is not None and used > self.memory_limit:
+                self.logger.warning(
+                    f"Worker For {self.device} Uses {used} Bytes, Over Its Limit Of {self.memory_limit}"
+                )
+                self.process.send_signal(signal.SIGKILL)
+                return
+
+    async def request(self, message: Dict[str, Any]) -> Result[Dict[str, Any], str]:
+        """
+        Send A Request To The Worker And Wait For Its Reply.
+
+        A request abandoned while the worker runs it would leave its reply
+        in the pipe for the next request to read, so the worker is replaced
+        instead, as it is when a reply does not match its request.
+        """
+        running = await self._ensure_running()
+        if running.status == "failure":
+            return running
+
+        self._request_id += 1
+        request_id = self._request_id
+        watchdog = None
+        if self.memory_limit > 0:
+            watchdog = asyncio.create_task(self._watch_memory())
+        try:
+            self.process.stdin.write(json.dumps({**message, "id": request_id}).encode() + b"\n")
+            await self.process.stdin.drain()
+            reply = await self._receive()
+        except (ConnectionError, BrokenPipeError) as e:
+            reply = create_failure(f"Worker For {self.device} Is Gone: {str(e)}")
+        except asyncio.CancelledError:
+            self.logger.warning(f"Request To Worker For {self.device} Cancelled, Restarting It")
+            self.restarts += 1
+            if self.process.returncode is None:
+                self.process.kill()
+            self.start()
+            raise
+        finally:
+            if watchdog is not None:
+                watchdog.cancel()
+
+        if reply.status == "success" and reply.data.get("id") != request_id:
+            reply = create_failure(
+                f"Worker For {self.device} Answered Request {reply.data.get('id')} Instead Of {request_id}"
+            )
+
+        # A crashed worker is replaced at once, so the next task finds it warm
+        if reply.status == "failure":
+            self.restarts += 1
+            if self.process.returncode is None:
+                self.process.kill()
+                await self.process.wait()
+            if self.memory_limit > 0 and self.process.returncode == -signal.SIGKILL:
+                reply = create_failure(
+                    f"Worker For {self.device} Exceeded Its Memory Limit Of {self.memory_limit} Bytes"
+                )
+            self.start()
+            return reply
+
+        self.tasks_run += 1
+        self._recycle_if_needed()
+        return reply
+
+    def _recycle_if_needed(self) -> None:
+        """Restart The Worker If It Has Run Its Quota Of Tasks Or Holds Too Much Memory."""
+        reason = None
+        used = get_process_memory(self.process.pid)
+        if self.max_tasks > 0 and self.tasks_run >= self.max_tasks:
+            reason = f"Ran {self.tasks_run} Tasks"
+        elif self.memory_limit > 0 and used is not None and used > self.memory_limit:
+            reason = f"Holds {used} Bytes"
+        if reason is None:
+            return
+
+        self.logger.info(f"Restarting Worker For {self.device}: {reason}")
+        self.restarts += 1
+        process = self.process
+        process.stdin.close()
+        self._starting = asyncio.create_task(self._replace(process))
+
+    async def _replace(self, process: asyncio.subprocess.Process) -> Result[bool, str]:
+        """Start A New Worker Once The Old One Has Exited."""
+        try:
+            await asyncio.wait_for(process.wait(), timeout=5.0)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+        return await self._spawn()
+
+    async def stop(self) -> None:
+        """Stop The Worker."""
+        if self._starting is not None:
+            self._starting.cancel()
+            self._starting = None
+        if self.process is None or self.process.returncode is not None:
+            return
+        self.process.stdin.close()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=5.0)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+
+
+# Process-pool execution backend
+class WorkerPool:
+    """
+    Runs Programs In Warm Worker Processes, One Per Device.
+
+    Running programs outside the service process lets a node use every
+    core, keeps kernels from contending with the API for the GIL, and keeps
+    a crashing kernel from taking the service down. Tensors are handed over
+    through shared memory rather than pickled.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        devices: List[str],
+        memory_limit: int = 0,
+        max_tasks: int = 0,
+    ):
+        self.logger = logger
+        self.workers = {
+            device: WorkerProcess(logger, device, memory_limit, max_tasks)
+            for device in devices
+        }
+
+    def start(self) -> None:
+        """Start Every Worker In The Background."""
+        for worker in self.workers.values():
+            worker.start()
+
+    async def stop(self) -> None:
+        """Stop Every Worker."""
+        await asyncio.gather(*(worker.stop() for worker in self.workers.values()))
+
+    async def execute(
+        self,
+        slot: DeviceSlot,
+        program_path: pathlib.Path,
+        program_digest: str,
+        program: GraphProgram,
+        inputs: ActualTensors,
+        weights: List[Tuple[WeightShard, pathlib.Path, List[str]]],
+    ) -> Result[Tensor, str]:
+        """
+        Run A Program In The Worker Of A Device.
+
+        Args:
+            slot: The device the task was placed on
+            program_path: Local copy of the serialized program
+            program_digest: sha256 of the program, under which workers keep it
+            program: The imported program, for its placeholders and output
+            inputs: Tensors bound to the program's placeholders
+            weights: Weight shards the program references, with their local
+                copies and the placeholder names bound to them
+
+        Returns:
+            Result[Tensor, str]: The program's output, or an error
+        """
+        worker = self.workers[slot.device]
+        needed = {placeholder.name for placeholder in program.placeholders}
+        arrays = {name: tensor.numpy() for name, tensor in inputs.items() if name in needed}
+
+        # Lay inputs out in one segment, followed by room for the output
+        input_specs = []
+        offset = 0
+        for name, array in arrays.items():
+            input_specs.append(
+                {
+                    "name": name,
+                    "offset": offset,
+                    "nbytes": array.nbytes,
+                    "shape": list(array.shape),
+                    "dtype": inputs[name].dtype.name,
+                }
+            )
+            offset = _align(offset + array.nbytes)
+        output_shape = [int(x) for x in program.tensor.shape]
+        output_dtype = program.tensor.dtype
+        output_nbytes = int(np.prod(output_shape, dtype=np.int64)) * output_dtype.itemsize
+        output_spec = {"offset": offset, "nbytes": output_nbytes, "shape": output_shape}
+
+        segment = SharedMemory(create=True, size=max(1, offset + output_nbytes))
+        try:
+            buffer = np.frombuffer(segment.buf, dtype=np.uint8)
+            for spec, array in zip(input_specs, arrays.values()):
+                start = spec["offset"]
+                buffer[start : start + array.nbytes] = array.reshape(-1).view(np.uint8)
+            del buffer
+
+            reply = await worker.request(
+                {
+                    "segment": segment.name,
+                    "program": {"digest": program_digest, "path": str(program_path)},
+                    "inputs": input_specs,
+                    "weights": [
+                        {"shard": shard.to_dict(), "path": str(path), "names": names}
+                        for shard, path, names in weights
+                    ],
+                    "resident": list(slot.resident_weights),
+                    "output": output_spec,
+                }
+            )
+            if reply.status == "failure":
+                return create_failure(reply.error)
+            if reply.data["status"] == "failure":
+                return create_failure(reply.data["error"])
+
+            slot.record_worker_weights(reply.data["resident"], reply.data["resident_bytes"])
+            data = bytes(segment.buf[offset : offset + output_nbytes])
+            return create_success(Tensor(data, dtype=output_dtype).reshape(tuple(output_shape)))
+        finally:
+            segment.close()
+            segment.unlink()
+
+    def restarts(self) -> Dict[str, int]:
+        """Get How Often Each Device's Worker Has Been Restarted."""
+        return {device: worker.restarts for device, worker in self.workers.items()}
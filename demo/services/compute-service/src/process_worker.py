@@ -0,0 +1,142 @@
+import json
+import os
+import sys
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, BinaryIO, Dict, List, Set
+import numpy as np
+from tinygrad import Device, Tensor, dtypes
+from .tinygrad_backend.core import GraphProgram, execute_graph_on_gpu
+from .tinygrad_backend.types import ActualTensors
+from .tinygrad_backend.weight_shards import WeightShard, bind_shard
+
+
+#####
+# Logic For Reading And Writing Shared Memory
+#####
+
+
+def read_tensor(segment: SharedMemory, spec: Dict[str, Any]) -> Tensor:
+    """Create A Tensor From Bytes In A Shared Memory Segment."""
+    start = spec["offset"]
+    data = bytes(segment.buf[start : start + spec["nbytes"]])
+    return Tensor(data, dtype=getattr(dtypes, spec["dtype"])).reshape(tuple(spec["shape"]))
+
+
+def write_array(segment: SharedMemory, offset: int, data: np.ndarray) -> None:
+    """Copy An Array's Bytes Into A Shared Memory Segment."""
+    flat = data.reshape(-1).view(np.uint8)
+    target = np.frombuffer(segment.buf, dtype=np.uint8, count=flat.size, offset=offset)
+    target[:] = flat
+    del target  # the segment cannot be closed while a view of it exists
+
+
+#####
+# Logic For Running Programs
+#####
+
+
+class Worker:
+    """Runs Programs On One Device, Keeping Programs And Weights Loaded Between Tasks."""
+
+    def __init__(self, device: str):
+        self.device = device
+        self.programs: Dict[str, bytes] = {}  # digest -> serialized program
+        self.weights: Dict[str, ActualTensors] = {}  # shard key -> tensors on the device
+
+    def _load_program(self, spec: Dict[str, Any]) -> GraphProgram:
+        """Import A Program, Reading It From Disk Only The First Time."""
+        digest = spec["digest"]
+        if digest not in self.programs:
+            with open(spec["path"], "rb") as f:
+                self.programs[digest] = f.read()
+
+        # Running a program rewrites its graph, so each run gets a fresh copy
+        program = GraphProgram.from_bytes(self.programs[digest])
+        if isinstance(program, ValueError):
+            raise program
+        return program
+
+    def _load_weights(self, specs: List[Dict[str, Any]], resident: Set[str]) -> ActualTensors:
+        """Bind Weight Shards, Loading Only Tensors Not Already On The Device."""
+        for key in set(self.weights) - resident:
+            del self.weights[key]
+
+        weights: ActualTensors = {}
+        for spec in specs:
+            shard = WeightShard.from_dict(spec["shard"])
+            names = set(spec["names"])
+            kept = self.weights.setdefault(shard.key, {})
+            if not names.issubset(kept):
+                with open(spec["path"], "rb") as f:
+                    tensors = bind_shard(shard, f.read(), names - set(kept))
+                if isinstance(tensors, ValueError):
+                    raise tensors
+                placed = {name: tensor.to(self.device) for name, tensor in tensors.items()}
+                Tensor.realize(*placed.values())
+                kept.update(placed)
+            weights.update({name: kept[name] for name in names})
+        return weights
+
+    def run(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Run A Program On Inputs In Shared Memory, Writing Its Output There Too."""
+        segment = SharedMemory(name=message["segment"], track=False)
+        try:
+            program = self._load_program(message["program"])
+            inputs = {spec["name"]: read_tensor(segment, spec) for spec in message["inputs"]}
+            weights = self._load_weights(message["weights"], set(message["resident"]))
+
+            result = execute_graph_on_gpu(program, inputs, weights, self.device)
+            if isinstance(result, ValueError):
+                raise result
+
+            output = message["output"]
+            data = result.numpy()
+            if list(data.shape) != output["shape"] or data.nbytes != output["nbytes"]:
+                raise ValueError(
+                    f"Output {list(data.shape)} Does Not Match The Program's {output['shape']}"
+                )
+            write_array(segment, output["offset"], data)
+        finally:
+            segment.close()
+
+        return {
+            "status": "success",
+            "resident": list(self.weights),
+            "resident_bytes": sum(
+                tensor.nbytes() for tensors in self.weights.values() for tensor in tensors.values()
+            ),
+        }
+
+
+def send(channel: BinaryIO, message: Dict[str, Any]) -> None:
+    """Send One Message To The Service."""
+    channel.write(json.dumps(message).encode() + b"\n")
+    channel.flush()
+
+
+def main() -> int:
+    """Serve Run Requests From The Service On Stdin Until It Closes."""
+    device = Device.canonicalize(sys.argv[1] if len(sys.argv) > 1 else None)
+
+    # Messages go over the original stdout; anything printed goes to stderr
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    worker = Worker(device)
+    Device[device]  # open the device before reporting ready
+    send(channel, {"status": "ready", "pid": os.getpid()})
+
+    for line in sys.stdin.buffer:
+        request_id = None
+        try:
+            message = json.loads(line)
+            request_id = message.get("id")
+            reply = worker.run(message)
+        except Exception as e:
+            reply = {"status": "failure", "error": str(e)}
+        send(channel, {**reply, "id": request_id})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+from typing import List, Optional
+from .result import create_failure, create_success, Result
+from .storage import StorageService
+from .tinygrad_backend.merkle import MerkleTree, compare_trees, find_differing_chunks
+
+# Suffix of the object holding a result's Merkle leaf hashes, stored next to the result
+MERKLE_SUFFIX = ".merkle"
+
+
+def merkle_key(key: str) -> str:
+    """Get The Storage Key Of A Result's Merkle Leaf Hashes."""
+    return f"{key}{MERKLE_SUFFIX}"
+
+
+async def fetch_result_tree(
+    key: str, storage_service: StorageService, peer_url: Optional[str] = None
+) -> Result[MerkleTree, str]:
+    """
+    Fetch The Merkle Tree Of A Stored Result.
+
+    Only the leaf hashes are stored, 32 bytes per chunk of the result, and
+    the inner levels are rebuilt from them.
+
+    Args:
+        key: Storage key of the result itself
+        storage_service: Storage to read the hashes from
+        peer_url: URL of a peer node serving the result, tried before storage
+    """
+    hashes_peer_url = f"{peer_url}{MERKLE_SUFFIX}" if peer_url is not None else None
+    data = await storage_service.read_object(merkle_key(key), peer_url=hashes_peer_url)
+    if data.status == "failure":
+        return create_failure(data.error)
+
+    tree = MerkleTree.from_bytes(data.data)
+    if isinstance(tree, ValueError):
+        return create_failure(f"Invalid Merkle Hashes Of {key}: {tree}")
+    return create_success(tree)
+
+
+async def find_differing_result_chunks(
+    local: MerkleTree,
+    key: str,
+    storage_service: StorageService,
+    peer_url: Optional[str] = None,
+) -> Result[List[int], str]:
+    """
+    Find The Chunks Where A Locally Computed Result Differs From A Stored One.
+
+    The stored result's hashes are fetched instead of the result, so a
+    mismatch is narrowed down to chunks without downloading the tensor.
+
+    Returns:
+        Result[List[int], str]: Indices of the differing chunks, empty if
+        the results agree
+    """
+    remote = await fetch_result_tree(key, storage_service, peer_url)
+    if remote.status == "failure":
+        return create_failure(remote.error)
+
+    tree = remote.data
+    if tree.chunk_size != local.chunk_size:
+        return create_failure(
+            f"{key} Was Hashed In Chunks Of {tree.chunk_size} Bytes, Not {local.chunk_size}"
+        )
+    if tree.length != local.length:
+        return create_success(compare_trees(local, tree))
+    return create_success(find_differing_chunks(local, tree.node))
@@ -0,0 +1,152 @@
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+from .models import ComputeResult
+
+
+# Result store
+class ResultStore:
+    """
+    Bounded Store For Execution Results.
+
+    Recent results are kept in an in-memory LRU with a TTL. Entries evicted
+    from memory are spilled to a local SQLite database (WAL mode) so status
+    lookups keep working for older executions without memory growing over
+    the lifetime of the node. Spilled entries are pruned after the retention
+    period.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        db_path: Path,
+        max_memory_entries: int = 1024,
+        memory_ttl: int = 3600,
+        retention: int = 7 * 24 * 3600,
+    ):
+        self.logger = logger
+        self.db_path = Path(db_path)
+        self.max_memory_entries = max_memory_entries
+        self.memory_ttl = memory_ttl
+        self.retention = retention
+
+        # execution_id -> (stored_at, result), least recently used first
+        self._memory: "OrderedDict[str, Tuple[float, ComputeResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._spills_since_prune = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                execution_id TEXT PRIMARY KEY,
+                stored_at REAL NOT NULL,
+                result TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS results_stored_at ON results (stored_at)"
+        )
+
+    def put(self, result: ComputeResult) -> None:
+        """Store A Result, Spilling Evicted Entries To Disk."""
+        now = time.time()
+        with self._lock:
+            self._memory[result.execution_id] = (now, result)
+            self._memory.move_to_end(result.execution_id)
+            self._evict(now)
+
+    def get(self, execution_id: str) -> Optional[ComputeResult]:
+        """Get A Result From Memory Or, Failing That, From Disk."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(execution_id)
+            if entry is not None:
+                stored_at, result = entry
+                if now - stored_at <= self.memory_ttl:
+                    self._memory.move_to_end(execution_id)
+                    return result
+                # Expired in memory, wherever it is in the order, so spill this entry
+                self._spill([(execution_id, self._memory.pop(execution_id))])
+                return result
+
+            row = self._conn.execute(
+                "SELECT result FROM results WHERE execution_id = ?", (execution_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+        return ComputeResult.model_validate_json(row[0])
+
+    def __len__(self) -> int:
+        """Number Of Results Held In Memory."""
+        return len(self._memory)
+
+    def flush(self) -> None:
+        """Spill Every In-Memory Result To Disk."""
+        with self._lock:
+            entries = list(self._memory.items())
+            self._memory.clear()
+            self._spill(entries)
+
+    def close(self) -> None:
+        """Flush In-Memory Results And Close The Database."""
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self, now: float) -> None:
+        """Move Expired And Overflowing Entries From Memory To Disk."""
+        evicted = []
+
+        # Entries are ordered by last use, so those at the front are the likeliest
+        # to have expired; any others are spilled when next read
+        while self._memory:
+            execution_id, (stored_at, _) = next(iter(self._memory.items()))
+            if (
+                len(self._memory) <= self.max_memory_entries
+                and now - stored_at <= self.memory_ttl
+            ):
+                break
+            evicted.append((execution_id, self._memory.pop(execution_id)))
+
+        if evicted:
+            self._spill(evicted)
+
+    def _spill(self, entries) -> None:
+        """Write Entries To Disk And Prune Those Past Retention."""
+        if not entries:
+            return
+
+        try:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results (execution_id, stored_at, result) VALUES (?, ?, ?)",
+                [
+                    (execution_id, stored_at, result.model_dump_json())
+                    for execution_id, (stored_at, result) in entries
+                ],
+            )
+
+            # Prune occasionally rather than on every spill
+            self._spills_since_prune += len(entries)
+            if self._spills_since_prune >= self.max_memory_entries:
+                self._spills_since_prune = 0
+                self._conn.execute(
+                    "DELETE FROM results WHERE stored_at < ?",
+                    (time.time() - self.retention,),
+                )
+            self._conn.execute("COMMIT")
+        except Exception as e:
+            self._conn.execute("ROLLBACK")
+            self.logger.error(f"Failed To Spill Execution Results To Disk: {str(e)}")
@@ -0,0 +1,72 @@
+import logging
+import time
+from typing import Awaitable, Dict, List, Optional, TypeVar
+from .models import StartupStatus, StartupStep
+from .result import create_failure, Result
+
+T = TypeVar("T")
+
+
+# Startup progress tracking
+class StartupProgress:
+    """
+    Tracks The Steps Of Starting The Service.
+
+    The service answers requests while it starts, so probes can tell a node
+    that is still starting from one that is stuck or has failed to start.
+    """
+
+    def __init__(
+        self, logger: logging.Logger, steps: List[str], optional: Optional[List[str]] = None
+    ):
+        self.logger = logger
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.steps: Dict[str, StartupStep] = {name: StartupStep(name=name) for name in steps}
+        self.optional = set(optional or [])  # steps the service is ready without
+
+    @property
+    def ready(self) -> bool:
+        """Whether Every Required Step Has Completed."""
+        return all(
+            step.state == "done"
+            for name, step in self.steps.items()
+            if name not in self.optional
+        )
+
+    @property
+    def failed(self) -> bool:
+        """Whether A Step Has Failed, So The Service Will Never Be Ready."""
+        return any(step.state == "failed" for step in self.steps.values())
+
+    async def run(self, name: str, step: Awaitable[Result[T, str]]) -> Result[T, str]:
+        """Run One Step, Recording Its State And Duration."""
+        record = self.steps[name]
+        record.state = "running"
+        began = time.monotonic()
+        try:
+            result = await step
+        except Exception as e:
+            result = create_failure(f"{type(e).__name__}: {str(e)}")
+        record.duration = time.monotonic() - began
+
+        if result.status == "failure":
+            record.state = "failed"
+            record.error = result.error
+            self.logger.error(f"Startup Step {name} Failed: {result.error}")
+        else:
+            record.state = "done"
+            self.logger.info(f"Startup Step {name} Took {record.duration:.2f}s")
+        if self.ready or self.failed:
+            self.finished_at = self.finished_at or time.monotonic()
+        return result
+
+    def status(self) -> StartupStatus:
+        """Get The Progress Of Startup."""
+        end = self.finished_at or time.monotonic()
+        return StartupStatus(
+            ready=self.ready,
+            failed=self.failed,
+            elapsed=end - self.started_at,
+            steps=list(self.steps.values()),
+        )
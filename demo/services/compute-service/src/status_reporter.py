@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Callable, Optional
+import httpx
+from .models import ComputeStatus, StatusUpdateResponse
+from .result import create_success, create_failure, Result
+
+
+def get_free_host_memory() -> Optional[int]:
+    """Get The Available Host Memory In Bytes, If It Can Be Determined."""
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+# Status reporter
+class StatusReporter:
+    """
+    Periodically Reports Compute Status And Capacity To The Heartbeat Service.
+
+    Callers signal state changes with `request_update`; changes are coalesced
+    so at most one update is sent per `min_interval`, and an update is sent
+    at least every `interval` even if nothing changed. Each update is a
+    single attempt, a failed send is simply superseded by the next one.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        heartbeat_url: str,
+        snapshot: Callable[[], ComputeStatus],
+        min_interval: float = 1.0,
+        interval: float = 15.0,
+    ):
+        self.logger = logger
+        self.heartbeat_url = heartbeat_url
+        self.snapshot = snapshot
+        self.min_interval = min_interval
+        self.interval = interval
+
+        self._pending = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._last_sent = 0.0
+
+    def start(self) -> None:
+        """Start The Background Reporting Loop."""
+        if self._task is None:
+            self._client = httpx.AsyncClient(timeout=5.0)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop The Background Reporting Loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def request_update(self) -> None:
+        """Signal That The Reported State Has Changed."""
+        self._pending.set()
+
+    async def _run(self) -> None:
+        """Send Coalesced Status Updates Until Cancelled."""
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._pending.wait(), timeout=self.interval)
+                except asyncio.TimeoutError:
+                    pass
+
+                # Let further changes accumulate until the rate limit allows a send
+                wait = self._last_sent + self.min_interval - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                self._pending.clear()
+                self._last_sent = time.monotonic()
+
+                result = await self._send(self.snapshot())
+                if result.status == "failure":
+                    self.logger.warning(result.error)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Error Reporting Compute Status: {str(e)}")
+                await asyncio.sleep(self.min_interval)
+
+    async def _send(self, status: ComputeStatus) -> Result[bool, str]:
+        """Send A Single Status Update."""
+        try:
+            response = await self._client.post(
+                self.heartbeat_url, json=status.model_dump()
+            )
+            response.raise_for_status()
+            status_response = StatusUpdateResponse.model_validate(response.json())
+
+            if status_response.success:
+                return create_success(True)
+            else:
+                return create_failure(status_response.message)
+        except Exception as e:
+            return create_failure(f"Failed to Send Status Update: {str(e)}")
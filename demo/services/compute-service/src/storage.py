@@ -1,28 +1,49 @@
+import asyncio
+import hashlib
 import logging
+import tempfile
 import boto3
 from botocore.exceptions import ClientError
 from botocore.config import Config
 from pathlib import Path
-from typing import Optional, Union, Dict, Any, Literal, Callable, Awaitable
+from typing import Optional, Union, Dict, Any, Literal, Callable, Awaitable, List
 import aiohttp
 
 from .result import Result, create_success, create_failure
 from .util import with_exponential_backoff
 from .environment import EnvSettings, load_env_config
+from .chunking import ChunkManifest, CHUNKED_MAGIC, chunk_key, split_chunks
+from .local_store import LocalTensorStore
 from pydantic import BaseModel
 
 # Default download directory path
 DEFAULT_DOWNLOAD_DIR_PATH = Path.home() / ".splitup" / "objects"
 DEFAULT_DOWNLOAD_DIR = str(DEFAULT_DOWNLOAD_DIR_PATH.absolute())
 
+# Chunks of a chunked object transferred at once
+CHUNK_CONCURRENCY = 8
+
+# Seconds a peer may stall before its copy of an object is given up on
+PEER_STALL_TIMEOUT = 5.0
+
+
+def _stall_timeout(seconds: Optional[float]) -> aiohttp.ClientTimeout:
+    """Build A Client Timeout That Only Limits Connecting And Waiting For Data."""
+    return aiohttp.ClientTimeout(total=None, sock_connect=seconds, sock_read=seconds)
+
 
 class StorageConfig(BaseModel):
     """Storage configuration model."""
 
     SPLITUP_STORAGE_API_ENDPOINT: str
     SPLITUP_STORAGE_API_KEY: str
-    SPLITUP_STORAGE_REGION: str
+    SPLITUP_STORAGE_REGION: str = "eu-west-2"
     SPLITUP_STORAGE_S3_BUCKET: str
+    SPLITUP_STORAGE_CHUNKING: Literal["off", "fixed", "cdc"] = "off"
+    SPLITUP_STORAGE_CHUNK_SIZE: int = 1 << 20
+    SPLITUP_STORAGE_LOCAL_STORE_DIR: Optional[str] = None
+    SPLITUP_STORAGE_LOCAL_STORE_SIZE: int = 1 << 30
+    SPLITUP_STORAGE_LOCAL_STORE_TTL: float = 3600.0
 
 
 class S3ClientFactory:
@@ -47,7 +68,11 @@ class DownloadManager:
         self.logger = logger
 
     async def download_from_url(
-        self, url: str, local_filename: Optional[str] = None
+        self,
+        url: str,
+        local_filename: Optional[str] = None,
+        max_attempts: int = 5,
+        stall_timeout: Optional[float] = None,
     ) -> Result[Path, str]:
         """
         Download a file from a URL with exponential backoff.
@@ -55,6 +80,8 @@ class DownloadManager:
         Args:
             url: URL to download from
             local_filename: Optional local filename, defaults to the URL's basename
+            max_attempts: Attempts before giving up
+            stall_timeout: Seconds to wait to connect or for more data, None to wait indefinitely
 
         Returns:
             Result containing the local file path or an error message
@@ -62,12 +89,14 @@ class DownloadManager:
         if not local_filename:
             local_filename = url.split("/")[-1]
 
-        local_path = self.download_dir / local_filename
+        local_path = self.local_path(local_filename)
+        if local_path is None:
+            return create_failure(f"Invalid Local Filename: {local_filename}")
 
         async def download_operation() -> Result[Path, str]:
             try:
                 self.logger.info(f"Downloading {url} to {local_path}")
-                async with aiohttp.ClientSession() as session:
+                async with aiohttp.ClientSession(timeout=_stall_timeout(stall_timeout)) as session:
                     async with session.get(url) as response:
                         if response.status != 200:
                             return create_failure(
@@ -75,7 +104,12 @@ class DownloadManager:
                             )
 
                         content = await response.read()
-                        local_path.write_bytes(content)
+
+                # Write atomically so an interrupted download is never reused
+                local_path.parent.mkdir(parents=True, exist_ok=True)
+                partial_path = local_path.with_name(f".{local_path.name}.partial")
+                partial_path.write_bytes(content)
+                partial_path.replace(local_path)
 
                 return create_success(local_path)
             except aiohttp.ClientError as e:
@@ -91,13 +125,67 @@ class DownloadManager:
             download_operation,
             self.logger,
             f"Download: {url}",
-            max_attempts=5,
+            max_attempts=max_attempts,
             initial_backoff=1,
         )
 
+    async def download_range(
+        self,
+        url: str,
+        start: int,
+        end: int,
+        max_attempts: int = 5,
+        stall_timeout: Optional[float] = None,
+    ) -> Result[bytes, str]:
+        """
+        Download Bytes [start, end) Of A URL With An HTTP Range Request.
+
+        Returns fewer bytes if the object ends before `end`. Attempts and
+        stalls are limited as in `download_from_url`.
+        """
+
+        async def download_operation() -> Result[bytes, str]:
+            try:
+                headers = {"Range": f"bytes={start}-{end - 1}"}
+                async with aiohttp.ClientSession(timeout=_stall_timeout(stall_timeout)) as session:
+                    async with session.get(url, headers=headers) as response:
+                        if response.status == 206:
+                            return create_success(await response.read())
+                        if response.status == 200:
+                            # The server ignored the range and sent everything
+                            content = await response.read()
+                            return create_success(content[start:end])
+                        return create_failure(
+                            f"HTTP Error {response.status}: {response.reason}"
+                        )
+            except aiohttp.ClientError as e:
+                error_msg = f"HTTP Client Error: {str(e)}"
+                self.logger.error(error_msg)
+                return create_failure(error_msg)
+            except Exception as e:
+                error_msg = f"Unexpected Error Downloading Range Of {url}: {str(e)}"
+                self.logger.error(error_msg)
+                return create_failure(error_msg)
+
+        return await with_exponential_backoff(
+            download_operation,
+            self.logger,
+            f"Range Download: {start}-{end} Of {url}",
+            max_attempts=max_attempts,
+            initial_backoff=1,
+        )
+
+    def local_path(self, local_filename: str) -> Optional[Path]:
+        """Get The Local Path For A File, Or None If It Escapes The Download Directory."""
+        local_path = (self.download_dir / local_filename).resolve()
+        if not local_path.is_relative_to(self.download_dir.resolve()):
+            return None
+        return local_path
+
     def is_downloaded(self, key: str) -> bool:
         """Check if an object has been downloaded."""
-        return (self.download_dir / key).exists()
+        local_path = self.local_path(key)
+        return local_path is not None and local_path.exists()
 
 
 class S3Operations:
@@ -162,6 +250,34 @@ class S3Operations:
             self.logger.error(error_msg)
             return create_failure(error_msg)
 
+    async def object_exists(self, key: str, bucket: Optional[str] = None) -> Result[bool, str]:
+        """Check Whether An Object Exists Without Downloading It."""
+        if not self.s3_client:
+            return create_failure("S3 Client Not Initialized")
+
+        try:
+            self.s3_client.head_object(Bucket=bucket or self.default_bucket, Key=key)
+            return create_success(True)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return create_success(False)
+            return create_failure(f"S3 Client Error Checking {key}: {str(e)}")
+        except Exception as e:
+            return create_failure(f"Unexpected Error Checking {key}: {str(e)}")
+
+    async def delete_object(self, key: str, bucket: Optional[str] = None) -> Result[bool, str]:
+        """Delete An Object, Succeeding Whether Or Not It Existed."""
+        if not self.s3_client:
+            return create_failure("S3 Client Not Initialized")
+
+        try:
+            self.s3_client.delete_object(Bucket=bucket or self.default_bucket, Key=key)
+            return create_success(True)
+        except ClientError as e:
+            return create_failure(f"S3 Client Error Deleting {key}: {str(e)}")
+        except Exception as e:
+            return create_failure(f"Unexpected Error Deleting {key}: {str(e)}")
+
     async def put_object(
         self,
         key: str,
@@ -226,31 +342,42 @@ class S3Operations:
 class StorageService:
     """Service for interacting with S3 and other storage backends."""
 
-    def __init__(self):
+    def __init__(self, config: Optional[StorageConfig] = None):
+        """
+        Args:
+            config: Storage settings, read from the service's environment
+                settings when not given
+        """
         self.logger = logging.getLogger(__name__)
         self.s3_client = None
         self.s3_operations = None
         self.download_manager = None
+        self.local_store: Optional[LocalTensorStore] = None
 
-        self._init_storage()
+        self._init_storage(config)
 
-    def _init_storage(self) -> None:
+    def _init_storage(self, config: Optional[StorageConfig] = None) -> None:
         """Initialize storage configuration."""
-        env_result = load_env_config(EnvSettings)
+        if config is None:
+            env_result = load_env_config(EnvSettings)
 
-        if env_result.status == "failure":
-            self.logger.error(
-                f"Failed to Load Storage Configuration: {env_result.error}"
-            )
-            raise Exception(f"Failed to Load Storage Configuration: {env_result.error}")
-        else:
-            storage_config = StorageConfig(
+            if env_result.status == "failure":
+                self.logger.error(
+                    f"Failed to Load Storage Configuration: {env_result.error}"
+                )
+                raise Exception(f"Failed to Load Storage Configuration: {env_result.error}")
+            config = StorageConfig(
                 SPLITUP_STORAGE_API_ENDPOINT=env_result.data.SPLITUP_STORAGE_API_ENDPOINT,
                 SPLITUP_STORAGE_API_KEY=env_result.data.SPLITUP_STORAGE_API_KEY,
                 SPLITUP_STORAGE_S3_BUCKET=env_result.data.SPLITUP_STORAGE_S3_BUCKET,
                 SPLITUP_STORAGE_REGION=env_result.data.SPLITUP_STORAGE_REGION,
+                SPLITUP_STORAGE_CHUNKING=env_result.data.SPLITUP_STORAGE_CHUNKING,
+                SPLITUP_STORAGE_CHUNK_SIZE=env_result.data.SPLITUP_STORAGE_CHUNK_SIZE,
+                SPLITUP_STORAGE_LOCAL_STORE_DIR=env_result.data.SPLITUP_STORAGE_LOCAL_STORE_DIR,
+                SPLITUP_STORAGE_LOCAL_STORE_SIZE=env_result.data.SPLITUP_STORAGE_LOCAL_STORE_SIZE,
+                SPLITUP_STORAGE_LOCAL_STORE_TTL=env_result.data.SPLITUP_STORAGE_LOCAL_STORE_TTL,
             )
-            self.config = storage_config
+        self.config = config
 
         # Create download directory if it doesn't exist
         self.download_dir = DEFAULT_DOWNLOAD_DIR_PATH
@@ -259,6 +386,18 @@ class StorageService:
         # Initialize download manager
         self.download_manager = DownloadManager(self.download_dir, self.logger)
 
+        # Share objects with other processes on this host, if configured
+        if self.config.SPLITUP_STORAGE_LOCAL_STORE_DIR:
+            try:
+                self.local_store = LocalTensorStore(
+                    self.logger,
+                    self.config.SPLITUP_STORAGE_LOCAL_STORE_DIR,
+                    capacity=self.config.SPLITUP_STORAGE_LOCAL_STORE_SIZE,
+                    ttl=self.config.SPLITUP_STORAGE_LOCAL_STORE_TTL,
+                )
+            except Exception as e:
+                self.logger.error(f"Failed to Open Local Store: {str(e)}")
+
         # Initialize S3 client if endpoint is provided
         try:
             self.s3_client = S3ClientFactory.create_client(
@@ -276,23 +415,139 @@ class StorageService:
             self.logger.error(f"Failed to Initialize S3 Client: {str(e)}")
 
     async def get_object(
-        self, key: str, local_filename: Optional[str] = None
+        self,
+        key: str,
+        local_filename: Optional[str] = None,
+        use_cache: bool = False,
+        peer_url: Optional[str] = None,
     ) -> Result[Path, str]:
         """
         Download an object from S3 with exponential backoff.
 
+        Objects published to the local store by a process on this host are
+        copied from there, to the same local path a download would use.
+        Objects a peer node serves are fetched from it
+        first, falling back to S3 if the peer fails. Chunked objects are
+        reassembled, downloading only the chunks that are not already cached
+        locally.
+
         Args:
             key: S3 object key
-            local_filename: Optional local filename, defaults to the key's basename
+            local_filename: Optional local filename, defaults to the key
+            use_cache: Reuse a previously downloaded copy instead of fetching again
+            peer_url: URL of a peer node serving the object
 
         Returns:
             Result containing the local file path or an error message
         """
+        if self.local_store is not None and local_filename is None:
+            target = self.download_manager.local_path(key)
+            if target is not None and self.local_store.copy_to(key, target):
+                self.logger.debug(f"Using Local Store Copy Of {key}")
+                return create_success(target)
+
+        result = await self._get_stored_object(key, local_filename, use_cache, peer_url)
+        if result.status == "failure":
+            return result
+
+        with open(result.data, "rb") as f:
+            if f.read(len(CHUNKED_MAGIC)) != CHUNKED_MAGIC:
+                return result
+        return await self._assemble_chunked(result.data)
+
+    async def read_object(
+        self, key: str, use_cache: bool = False, peer_url: Optional[str] = None
+    ) -> Result[bytes, str]:
+        """
+        Read An Object's Contents.
+
+        Objects published to the local store are read straight from it,
+        without a copy on disk, holding a reference only while reading.
+        Others are downloaded as by `get_object`.
+        """
+        if self.local_store is not None:
+            shared = self.local_store.read(key)
+            if shared is not None:
+                self.logger.debug(f"Read {key} From The Local Store")
+                return create_success(shared)
+
+        result = await self.get_object(key, use_cache=use_cache, peer_url=peer_url)
+        if result.status == "failure":
+            return create_failure(result.error)
+        try:
+            with open(result.data, "rb") as f:
+                return create_success(f.read())
+        except OSError as e:
+            return create_failure(f"Failed To Read {key}: {str(e)}")
+
+    async def get_object_range(
+        self, key: str, start: int, end: int, peer_url: Optional[str] = None
+    ) -> Result[bytes, str]:
+        """
+        Download Bytes [start, end) Of An Object As Stored.
+
+        Chunked objects are not reassembled, so their range is of the manifest,
+        except when read from the local store or a peer, which hold whole objects.
+
+        Args:
+            key: S3 object key
+            start: First byte
+            end: Byte after the last, fewer bytes are returned if the object is shorter
+            peer_url: URL of a peer node serving the object, tried before S3
+
+        Returns:
+            Result containing the bytes or an error message
+        """
+        if self.local_store is not None:
+            shared = self.local_store.read_range(key, start, end)
+            if shared is not None:
+                return create_success(shared)
+
+        if peer_url is not None:
+            fetched = await self.download_manager.download_range(
+                peer_url, start, end, max_attempts=1, stall_timeout=PEER_STALL_TIMEOUT
+            )
+            if fetched.status == "success":
+                return fetched
+            self.logger.warning(f"Peer Copy Of {key} Unavailable, Falling Back To S3: {fetched.error}")
+
         if not self.s3_operations:
             return create_failure("S3 Client Not Initialized")
 
+        url_result = await self.s3_operations.generate_presigned_url(key, "download")
+        if url_result.status == "failure":
+            return create_failure(
+                f"Failed to Generate Presigned URL: {url_result.error}"
+            )
+
+        return await self.download_manager.download_range(url_result.data, start, end)
+
+    async def _get_stored_object(
+        self,
+        key: str,
+        local_filename: Optional[str] = None,
+        use_cache: bool = False,
+        peer_url: Optional[str] = None,
+    ) -> Result[Path, str]:
+        """Download An Object As Stored, Without Reassembling Chunked Objects."""
         if not local_filename:
-            local_filename = Path(key).name
+            local_filename = key
+
+        if use_cache and self.download_manager.is_downloaded(local_filename):
+            self.logger.debug(f"Using Cached Copy Of {key}")
+            return create_success(self.download_manager.local_path(local_filename))
+
+        # A peer is tried once and briefly, S3 remains the source of truth
+        if peer_url is not None:
+            fetched = await self.download_manager.download_from_url(
+                peer_url, local_filename, max_attempts=1, stall_timeout=PEER_STALL_TIMEOUT
+            )
+            if fetched.status == "success":
+                return fetched
+            self.logger.warning(f"Peer Copy Of {key} Unavailable, Falling Back To S3: {fetched.error}")
+
+        if not self.s3_operations:
+            return create_failure("S3 Client Not Initialized")
 
         # Generate presigned URL and download using it
         url_result = await self.s3_operations.generate_presigned_url(key, "download")
@@ -305,21 +560,77 @@ class StorageService:
             url_result.data, local_filename
         )
 
+    async def _get_chunk(self, digest: str) -> Result[Path, str]:
+        """Get A Chunk, From The Local Cache If Present, Checking Its Hash."""
+        result = await self._get_stored_object(chunk_key(digest), use_cache=True)
+        if result.status == "failure":
+            return result
+
+        if hashlib.sha256(result.data.read_bytes()).hexdigest() != digest:
+            result.data.unlink(missing_ok=True)
+            return create_failure(f"Chunk {digest} Does Not Match Its Hash")
+        return result
+
+    async def _assemble_chunked(self, manifest_path: Path) -> Result[Path, str]:
+        """Replace A Downloaded Chunk Manifest With The Object It Describes."""
+        manifest = ChunkManifest.from_bytes(manifest_path.read_bytes())
+        if isinstance(manifest, ValueError):
+            return create_failure(f"Error Reading {manifest_path}: {manifest}")
+
+        # Only chunks missing from the local cache are downloaded
+        missing = sorted(
+            {
+                chunk.hash
+                for chunk in manifest.chunks
+                if not self.download_manager.is_downloaded(chunk_key(chunk.hash))
+            }
+        )
+        semaphore = asyncio.Semaphore(CHUNK_CONCURRENCY)
+
+        async def fetch(digest: str) -> Result[Path, str]:
+            async with semaphore:
+                return await self._get_chunk(digest)
+
+        for result in await asyncio.gather(*(fetch(digest) for digest in missing)):
+            if result.status == "failure":
+                return create_failure(f"Failed To Download Chunk: {result.error}")
+        self.logger.info(
+            f"Assembling {manifest_path.name} From {len(manifest.chunks)} Chunks, {len(missing)} Downloaded"
+        )
+
+        # Write atomically so an interrupted assembly is never reused
+        partial_path = manifest_path.with_name(f".{manifest_path.name}.partial")
+        with open(partial_path, "wb") as out:
+            for chunk in manifest.chunks:
+                out.write(self.download_manager.local_path(chunk_key(chunk.hash)).read_bytes())
+        if partial_path.stat().st_size != manifest.size:
+            partial_path.unlink(missing_ok=True)
+            return create_failure(f"Assembled {manifest_path.name} Has The Wrong Size")
+        partial_path.replace(manifest_path)
+
+        return create_success(manifest_path)
+
     async def put_object(
         self,
         key: str,
         file_path: Union[str, Path],
         metadata: Optional[Dict[str, str]] = None,
         bucket: Optional[str] = None,
+        chunked: Optional[bool] = None,
     ) -> Result[str, str]:
         """
         Upload an object to S3 with exponential backoff.
 
+        The object is also published to the local store, if there is one, for
+        processes on this host to read without downloading it.
+
         Args:
             key: S3 object key
             file_path: Path to the local file
             metadata: Optional metadata to attach to the object
             bucket: Optional S3 bucket name, defaults to configured bucket
+            chunked: Store the object as deduplicated chunks, defaults to the
+                configured chunking mode
 
         Returns:
             Result containing the S3 URI or an error message
@@ -327,11 +638,116 @@ class StorageService:
         if not self.s3_operations:
             return create_failure("S3 Client Not Initialized")
 
-        return await self.s3_operations.put_object(key, file_path, metadata, bucket)
+        if chunked is None:
+            chunked = self.config.SPLITUP_STORAGE_CHUNKING != "off"
+        if chunked and bucket is None:
+            uploaded = await self.put_object_chunked(key, file_path, metadata=metadata)
+        else:
+            uploaded = await self.s3_operations.put_object(key, file_path, metadata, bucket)
+
+        if uploaded.status == "success" and self.local_store is not None and bucket is None:
+            published = self.local_store.publish(key, file_path)
+            if published.status == "failure":
+                self.logger.warning(published.error)
+        return uploaded
+
+    async def delete_object(self, key: str) -> Result[bool, str]:
+        """
+        Delete An Object From S3 And Forget Any Downloaded Copy.
 
-    async def is_downloaded(self, key: str) -> Result[bool, str]:
+        The chunks of a chunked object may be shared with others, so only
+        its manifest is deleted.
+        """
+        if not self.s3_operations:
+            return create_failure("S3 Client Not Initialized")
+
+        deleted = await self.s3_operations.delete_object(key)
+        local_path = self.download_manager.local_path(key)
+        if local_path is not None:
+            local_path.unlink(missing_ok=True)
+        return deleted
+
+    async def put_object_chunked(
+        self,
+        key: str,
+        file_path: Union[str, Path],
+        chunking: Optional[Literal["fixed", "cdc"]] = None,
+        chunk_size: Optional[int] = None,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> Result[str, str]:
+        """
+        Upload An Object As Chunks Stored Once Under Their Hash.
+
+        The object's key holds a manifest listing the chunks. Chunks that are
+        already stored are not uploaded again, and every chunk is kept in the
+        local cache so this node never downloads it back.
+
+        Args:
+            key: S3 object key of the manifest
+            file_path: Path to the local file
+            chunking: "fixed" or "cdc", defaults to the configured mode or "cdc"
+            chunk_size: Bytes per chunk (average for "cdc"), defaults to the configured size
+            metadata: Optional metadata to attach to the manifest
+
+        Returns:
+            Result containing the S3 URI of the manifest or an error message
+        """
+        if not self.s3_operations:
+            return create_failure("S3 Client Not Initialized")
+
+        if chunking is None:
+            configured = self.config.SPLITUP_STORAGE_CHUNKING
+            chunking = configured if configured != "off" else "cdc"
+        chunk_size = chunk_size or self.config.SPLITUP_STORAGE_CHUNK_SIZE
+
+        file_path = Path(file_path)
+        if not file_path.exists():
+            return create_failure(f"File Not Found: {file_path}")
+
+        manifest, chunks = split_chunks(file_path.read_bytes(), chunking, chunk_size)
+        unique = dict(chunks)
+        semaphore = asyncio.Semaphore(CHUNK_CONCURRENCY)
+
+        async def store(digest: str, data: memoryview) -> Result[bool, str]:
+            async with semaphore:
+                local_path = self.download_manager.local_path(chunk_key(digest))
+                if not local_path.exists():
+                    local_path.parent.mkdir(parents=True, exist_ok=True)
+                    partial_path = local_path.with_name(f".{local_path.name}.partial")
+                    partial_path.write_bytes(data)
+                    partial_path.replace(local_path)
+
+                exists = await self.s3_operations.object_exists(chunk_key(digest))
+                if exists.status == "failure":
+                    return exists
+                if exists.data:
+                    return create_success(False)
+
+                uploaded = await self.s3_operations.put_object(chunk_key(digest), local_path)
+                if uploaded.status == "failure":
+                    return uploaded
+                return create_success(True)
+
+        results: List[Result[bool, str]] = await asyncio.gather(
+            *(store(digest, data) for digest, data in unique.items())
+        )
+        for result in results:
+            if result.status == "failure":
+                return create_failure(f"Failed To Upload Chunk: {result.error}")
+
+        uploaded_count = sum(1 for result in results if result.data)
+        self.logger.info(
+            f"Stored {key} As {len(chunks)} Chunks, {uploaded_count} Of {len(unique)} Unique Chunks Uploaded"
+        )
+
+        with tempfile.NamedTemporaryFile(suffix=".manifest") as f:
+            f.write(manifest.to_bytes())
+            f.flush()
+            return await self.s3_operations.put_object(key, f.name, metadata)
+
+    def is_downloaded(self, key: str) -> bool:
         """Check if an object has been downloaded."""
-        return await self.download_manager.is_downloaded(key)
+        return self.download_manager.is_downloaded(key)
 
     async def generate_presigned_url(
         self,
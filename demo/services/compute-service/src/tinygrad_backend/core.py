@@ -5,7 +5,11 @@ from tinygrad.dtype import dtypes, DType
 from tinygrad.device import Device
 from tinygrad.ops import UOp, Ops
 from .types import ActualTensors
-from .graph_rewriting import substitute_placeholder_uop, find_all_placeholders
+from .graph_rewriting import (
+    substitute_placeholder_uop,
+    find_all_placeholders,
+    move_graph_to_device,
+)
 from tinygrad import Tensor
 from dataclasses import dataclass
 import pickle
@@ -85,9 +89,17 @@ class TensorTemplateManager:
 
     @staticmethod
     def create(
-        name: str, shape: Tuple[int, ...], dtype: DType = dtypes.float32
+        name: str,
+        shape: Tuple[int, ...],
+        dtype: DType = dtypes.float32,
+        device: Optional[str] = None,
     ) -> Tensor:
-        """Create a placeholder tensor with the given shape, dtype, and name."""
+        """Create a placeholder tensor with the given shape, dtype, and name.
+
+        The placeholder lives on `device`, the default device if not given.
+        Programs are moved to the device they run on when executed, so this
+        only matters for programs that are realized where they are built.
+        """
         placeholder_id = name
 
         # Create placeholder info
@@ -97,7 +109,7 @@ class TensorTemplateManager:
 
         # Create buffer UOp
         buffer_uop = UOp.new_buffer(
-            device=str(Device.DEFAULT),
+            device=Device.canonicalize(device),
             size=(st := ShapeTracker.from_shape(shape)).size,
             dtype=dtype,
         )
@@ -252,10 +264,14 @@ class TensorContext:
         self.placeholders: List[PlaceholderInfo] = []
 
     def add_graph_input(
-        self, name: str, shape: Tuple[int, ...], dtype: DType = dtypes.float32
+        self,
+        name: str,
+        shape: Tuple[int, ...],
+        dtype: DType = dtypes.float32,
+        device: Optional[str] = None,
     ) -> Tensor:
         """Create a new placeholder tensor and track it."""
-        tensor = TensorTemplateManager().create(name, shape, dtype)
+        tensor = TensorTemplateManager().create(name, shape, dtype, device)
         self.placeholders.append(
             PlaceholderInfo(placeholder=True, name=name, shape=shape, dtype=dtype)
         )
@@ -378,8 +394,13 @@ def execute_graph_on_gpu(
     task: GraphProgram,
     user_inputs: ActualTensors,
     weights: Optional[ActualTensors] = None,
+    device: Optional[str] = None,
 ) -> Tensor | ValueError:
-    """Complete a task with provided inputs and weights."""
+    """Complete a task with provided inputs and weights.
+
+    With `device` given, the program and every tensor bound to it are moved
+    to that device, whatever device the program was built on.
+    """
     real_tensors: ActualTensors = {}
     needed_inputs = {
         info.name: {"shape": info.shape, "dtype": info.dtype}
@@ -400,5 +421,12 @@ def execute_graph_on_gpu(
     if len(needed_inputs) > 0:
         return ValueError(f"Missing tensors: {needed_inputs}")
 
+    if device is not None:
+        try:
+            task.tensor.lazydata = move_graph_to_device(task.tensor.lazydata, device)
+        except Exception as e:
+            return ValueError(f"Failed to move program to {device}: {str(e)}")
+        real_tensors = {key: tensor.to(device) for key, tensor in real_tensors.items()}
+
     # Compute the result
     return TensorContext().finalize_lazy_tensor(task, real_tensors)
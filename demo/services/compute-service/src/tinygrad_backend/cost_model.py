@@ -0,0 +1,274 @@
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Union
+from dataclasses import dataclass, asdict
+from tinygrad.codegen.kernel import Kernel
+from tinygrad.device import Device
+from tinygrad.engine.schedule import ScheduleItem
+from tinygrad.helpers import to_function_name
+from tinygrad.ops import Ops, GroupOp
+from tinygrad.renderer import Estimates, Renderer
+from .core import GraphProgram
+from .memory_analysis import schedule_graph_program
+
+#####
+# Logic For Per-Node Calibration
+#####
+
+
+@dataclass(frozen=True)
+class NodeCalibration:
+    """Measured performance constants of a compute node."""
+
+    peak_flops: float = 1e12  # FLOP/s
+    memory_bandwidth: float = 1e11  # bytes/s within device memory
+    copy_bandwidth: float = 1e10  # bytes/s between devices
+    launch_overhead: float = 1e-5  # seconds per kernel
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "NodeCalibration":
+        """
+        Create a NodeCalibration from a dict, using defaults for missing constants.
+
+        Node profiles written by the benchmark keep their constants under
+        "calibration", so a whole profile can be loaded as well.
+        """
+        if isinstance(d.get("calibration"), dict):
+            d = d["calibration"]
+        known = {k: float(v) for k, v in d.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+    @classmethod
+    def load(cls, path: str) -> Union["NodeCalibration", ValueError]:
+        """Load calibration constants from a JSON file."""
+        try:
+            with open(path, "r") as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, TypeError, ValueError) as e:
+            return ValueError(f"Failed to load calibration from {path}: {str(e)}")
+
+
+#####
+# Logic For Counting Work Per Kernel
+#####
+
+
+@dataclass(frozen=True)
+class KernelCost:
+    """Work done by one item of a program's schedule."""
+
+    name: str
+    kind: str  # "kernel", "copy" or "view"
+    flops: int
+    bytes_read: int
+    bytes_written: int
+
+    @property
+    def bytes_moved(self) -> int:
+        return self.bytes_read + self.bytes_written
+
+    @property
+    def arithmetic_intensity(self) -> float:
+        """FLOPs per byte moved."""
+        return self.flops / self.bytes_moved if self.bytes_moved else 0.0
+
+    def predict_seconds(self, calibration: NodeCalibration) -> float:
+        """Predict runtime with a roofline: bound by either compute or memory."""
+        if self.kind == "view":
+            return 0.0
+        if self.kind == "copy":
+            return calibration.launch_overhead + self.bytes_moved / calibration.copy_bandwidth
+        return calibration.launch_overhead + max(
+            self.flops / calibration.peak_flops,
+            self.bytes_moved / calibration.memory_bandwidth,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "arithmetic_intensity": self.arithmetic_intensity,
+        }
+
+
+def _as_int(value: Any) -> int:
+    """Convert a possibly symbolic count to an int."""
+    if not isinstance(value, int):
+        raise ValueError(f"Symbolic sizes are not supported: {value}")
+    return value
+
+
+def _kernel_cost(item: ScheduleItem, renderer: Renderer) -> KernelCost:
+    """Count the FLOPs and global memory traffic of one schedule item."""
+    if item.ast.op is Ops.COPY:
+        nbytes = item.bufs[0].nbytes
+        return KernelCost("copy", "copy", 0, nbytes, nbytes)
+    if item.ast.op is not Ops.SINK:
+        return KernelCost(item.ast.op.name.lower(), "view", 0, 0, 0)
+
+    # Only the required optimizations are applied; they don't change the work done
+    kernel = Kernel(item.ast, opts=renderer).required_optimizations()
+    kernel.linearize()
+    flops = Estimates.from_uops(kernel.uops, ignore_indexing=True).simplify().ops
+
+    # Largest access of each global buffer, counted once, split by loads and stores
+    accessed: Dict[tuple, int] = {}
+    for u in item.ast.toposort:
+        if u.op in GroupOp.Buffer and u.src[0].op is Ops.DEFINE_GLOBAL:
+            key = (u.op, u.src[0].arg)
+            nbytes = u.src[0].dtype.itemsize * _as_int(u.st_arg.real_size())
+            accessed[key] = max(accessed.get(key, 0), nbytes)
+
+    return KernelCost(
+        name=to_function_name(kernel.name),
+        kind="kernel",
+        flops=_as_int(flops),
+        bytes_read=sum(n for (op, _), n in accessed.items() if op is not Ops.STORE),
+        bytes_written=sum(n for (op, _), n in accessed.items() if op is Ops.STORE),
+    )
+
+
+#####
+# Logic For Estimating Program Cost
+#####
+
+
+@dataclass(frozen=True)
+class ProgramCost:
+    """Work done by a program, kernel by kernel."""
+
+    kernels: List[KernelCost]
+
+    @property
+    def flops(self) -> int:
+        return sum(k.flops for k in self.kernels)
+
+    @property
+    def bytes_read(self) -> int:
+        return sum(k.bytes_read for k in self.kernels)
+
+    @property
+    def bytes_written(self) -> int:
+        return sum(k.bytes_written for k in self.kernels)
+
+    @property
+    def arithmetic_intensity(self) -> float:
+        moved = self.bytes_read + self.bytes_written
+        return self.flops / moved if moved else 0.0
+
+    def predict_seconds(self, calibration: NodeCalibration) -> float:
+        """Predict the runtime of the whole program on a calibrated node."""
+        return sum(k.predict_seconds(calibration) for k in self.kernels)
+
+    def to_dict(self, calibration: Optional[NodeCalibration] = None) -> Dict[str, Any]:
+        d: Dict[str, Any] = {
+            "flops": self.flops,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "arithmetic_intensity": self.arithmetic_intensity,
+            "kernels": [k.to_dict() for k in self.kernels],
+        }
+        if calibration is not None:
+            d["predicted_seconds"] = self.predict_seconds(calibration)
+            for kd, k in zip(d["kernels"], self.kernels):
+                kd["predicted_seconds"] = k.predict_seconds(calibration)
+        return d
+
+
+def estimate_program_cost(
+    program: GraphProgram, device: Optional[str] = None
+) -> Union[ProgramCost, ValueError]:
+    """
+    Count the FLOPs and bytes moved by each kernel of a program without running it.
+
+    Kernels are lowered for the renderer of the given device, or the default
+    device, to count operations; nothing is allocated or executed.
+
+    Args:
+        program: The program to analyse
+        device: Device whose kernels are counted, defaults to Device.DEFAULT
+
+    Returns:
+        Union[ProgramCost, ValueError]: The cost, or ValueError if the
+        program cannot be scheduled or lowered
+    """
+    schedule = schedule_graph_program(program)
+    if isinstance(schedule, ValueError):
+        return schedule
+
+    try:
+        renderer = Device[device or Device.DEFAULT].renderer
+        return ProgramCost([_kernel_cost(item, renderer) for item in schedule])
+    except Exception as e:
+        return ValueError(f"Failed to estimate program cost: {str(e)}")
+
+
+def predict_runtime(
+    program: GraphProgram,
+    calibration: NodeCalibration,
+    device: Optional[str] = None,
+) -> Union[float, ValueError]:
+    """Predict how many seconds a program takes on a calibrated node."""
+    cost = estimate_program_cost(program, device)
+    if isinstance(cost, ValueError):
+        return cost
+    return cost.predict_seconds(calibration)
+
+
+#####
+# Logic For The Command Line
+#####
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Estimate the FLOPs, memory traffic and runtime of a GraphProgram."
+    )
+    parser.add_argument("program", help="Path to a serialized GraphProgram")
+    parser.add_argument("--calibration", help="JSON file of node calibration constants")
+    parser.add_argument("--device", help="Device to lower kernels for")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args(argv)
+
+    calibration = NodeCalibration()
+    if args.calibration:
+        calibration = NodeCalibration.load(args.calibration)
+        if isinstance(calibration, ValueError):
+            print(calibration, file=sys.stderr)
+            return 1
+
+    with open(args.program, "rb") as f:
+        program = GraphProgram.from_bytes(f.read())
+    if isinstance(program, ValueError):
+        print(program, file=sys.stderr)
+        return 1
+
+    cost = estimate_program_cost(program, args.device)
+    if isinstance(cost, ValueError):
+        print(cost, file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(cost.to_dict(calibration), indent=2))
+        return 0
+
+    print(f"{'kernel':<32} {'GFLOP':>10} {'MB read':>10} {'MB written':>10} {'FLOP/B':>8} {'ms':>10}")
+    for k in cost.kernels:
+        print(
+            f"{k.name:<32} {k.flops / 1e9:>10.4f} {k.bytes_read / 1e6:>10.4f} "
+            f"{k.bytes_written / 1e6:>10.4f} {k.arithmetic_intensity:>8.2f} "
+            f"{k.predict_seconds(calibration) * 1e3:>10.4f}"
+        )
+    print(
+        f"{'total':<32} {cost.flops / 1e9:>10.4f} {cost.bytes_read / 1e6:>10.4f} "
+        f"{cost.bytes_written / 1e6:>10.4f} {cost.arithmetic_intensity:>8.2f} "
+        f"{cost.predict_seconds(calibration) * 1e3:>10.4f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -104,3 +104,21 @@ def find_all_placeholders(uop: UOp) -> set[str]:
 
     # Return the collected names
     return ctx["found_placeholders"]
+
+
+#####
+# Logic For Moving Graph To Another Device
+#####
+
+
+def retarget_device(ctx: str, d: UOp) -> UOp | None:
+    """Point a DEVICE UOp at the target device."""
+    return d.replace(arg=ctx) if d.arg != ctx else None
+
+
+move_devices = PatternMatcher([(UPat(Ops.DEVICE, name="d"), retarget_device)])
+
+
+def move_graph_to_device(uop: UOp, device: str) -> UOp:
+    """Place every buffer and constant of a UOp graph on `device`."""
+    return graph_rewrite(uop, move_devices, ctx=device)
@@ -0,0 +1,139 @@
+from typing import Any, Dict, List, Union
+from dataclasses import dataclass, asdict
+from tinygrad.engine.schedule import create_schedule_with_vars, ScheduleItem
+from tinygrad.device import Buffer
+from tinygrad.ops import UOp
+from tinygrad import Tensor
+from .core import GraphProgram
+from .graph_rewriting import substitute_placeholder_uop
+
+#####
+# Logic For Scheduling Programs Without Running Them
+#####
+
+
+def schedule_graph_program(
+    program: GraphProgram,
+) -> Union[List[ScheduleItem], ValueError]:
+    """
+    Create the kernel schedule of a program without allocating or running anything.
+
+    Placeholders are bound to unallocated buffers of the right shape and
+    dtype, and the schedule is created without being applied to any
+    tensor, so the program itself is left untouched.
+
+    Args:
+        program: The program to schedule
+
+    Returns:
+        Union[List[ScheduleItem], ValueError]: The schedule, or ValueError
+        if the program cannot be scheduled
+    """
+    try:
+        inputs = {
+            ph.name: Tensor.empty(*ph.shape, dtype=ph.dtype)
+            for ph in program.placeholders
+        }
+        uop = substitute_placeholder_uop(program.tensor.lazydata, inputs)
+        schedule, _, _ = create_schedule_with_vars(UOp.sink(uop))
+        return schedule
+    except Exception as e:
+        return ValueError(f"Failed to schedule program: {str(e)}")
+
+
+#####
+# Logic For Estimating Peak Memory
+#####
+
+# Version of the estimation method, bumped when it changes so cached estimates are redone
+ESTIMATE_VERSION = 2
+
+
+@dataclass(frozen=True)
+class MemoryEstimate:
+    """Device memory needed to run a program."""
+
+    peak_bytes: int
+    input_bytes: int
+    output_bytes: int
+    kernels: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "MemoryEstimate | None":
+        """Create a MemoryEstimate from a dict. Returns None if the dict is invalid."""
+        try:
+            return cls(
+                peak_bytes=int(d["peak_bytes"]),
+                input_bytes=int(d["input_bytes"]),
+                output_bytes=int(d["output_bytes"]),
+                kernels=int(d["kernels"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+def estimate_peak_memory(program: GraphProgram) -> Union[MemoryEstimate, ValueError]:
+    """
+    Estimate the peak device memory of a program from its schedule.
+
+    Each intermediate buffer is live from the first kernel that touches it
+    to the last one. Input buffers are live for the whole schedule, as the
+    caller's inputs and the resident weights keep them allocated, and so is
+    the output from the kernel writing it. The peak is the largest total
+    size of buffers live at once.
+
+    Args:
+        program: The program to analyse
+
+    Returns:
+        Union[MemoryEstimate, ValueError]: The estimate, or ValueError if
+        the program cannot be scheduled
+    """
+    schedule = schedule_graph_program(program)
+    if isinstance(schedule, ValueError):
+        return schedule
+
+    first_use: Dict[Buffer, int] = {}
+    last_use: Dict[Buffer, int] = {}
+    written = set()
+
+    for i, item in enumerate(schedule):
+        for buf in item.bufs:
+            base = buf.base
+            first_use.setdefault(base, i)
+            last_use[base] = i
+        written.update(buf.base for buf in item.outputs)
+
+    if not schedule:
+        return MemoryEstimate(0, 0, 0, 0)
+
+    # Buffers never written by the schedule are the program's inputs, held until it ends
+    inputs = [buf for buf in first_use if buf not in written]
+    for buf in inputs:
+        first_use[buf] = 0
+        last_use[buf] = len(schedule) - 1
+
+    # The program's output outlives the schedule
+    output = schedule[-1].outputs[0].base
+    last_use[output] = len(schedule) - 1
+
+    # Sweep over kernels, adding buffers as they become live and dropping them after
+    delta = [0] * (len(schedule) + 1)
+    for buf in first_use:
+        delta[first_use[buf]] += buf.nbytes
+        delta[last_use[buf] + 1] -= buf.nbytes
+
+    peak = live = 0
+    for change in delta[:-1]:
+        live += change
+        peak = max(peak, live)
+
+    return MemoryEstimate(
+        peak_bytes=peak,
+        input_bytes=sum(buf.nbytes for buf in inputs),
+        output_bytes=output.nbytes,
+        kernels=len(schedule),
+    )
@@ -0,0 +1,175 @@
+import hashlib
+import struct
+from typing import Callable, List, Tuple, Union
+from dataclasses import dataclass
+
+# Bytes of tensor data under each leaf, unless a task asks for another size
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Marks serialized leaf hashes, followed by the chunk size and data length
+MERKLE_MAGIC = b"splitup-merkle\n"
+
+# Domain separation, so a leaf can never be mistaken for an inner node
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+#####
+# Logic For Building Merkle Trees
+#####
+
+
+def _hash_leaf(chunk: bytes) -> bytes:
+    return hashlib.sha256(LEAF_PREFIX + chunk).digest()
+
+
+def _hash_node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+@dataclass(frozen=True)
+class MerkleTree:
+    """
+    A binary SHA-256 Merkle tree over fixed-size chunks of some data.
+
+    levels[0] holds the leaf hashes, one per chunk, and the last level holds
+    the root. A node without a sibling is carried up to the next level
+    unchanged.
+    """
+
+    chunk_size: int
+    length: int  # bytes of data hashed
+    levels: List[List[bytes]]
+
+    @classmethod
+    def build(cls, data: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE) -> "MerkleTree":
+        """Hash data chunk by chunk and build the tree over the chunks."""
+        if chunk_size <= 0:
+            raise ValueError(f"Chunk size must be positive: {chunk_size}")
+        view = memoryview(data)
+        leaves = [
+            _hash_leaf(view[start : start + chunk_size])
+            for start in range(0, len(data), chunk_size)
+        ] or [_hash_leaf(b"")]
+        return cls.from_leaves(leaves, chunk_size, len(data))
+
+    @classmethod
+    def from_leaves(cls, leaves: List[bytes], chunk_size: int, length: int) -> "MerkleTree":
+        """Build the inner levels of a tree over known leaf hashes."""
+        levels = [list(leaves)]
+        while len(levels[-1]) > 1:
+            below = levels[-1]
+            level = [_hash_node(below[i], below[i + 1]) for i in range(0, len(below) - 1, 2)]
+            if len(below) % 2:
+                level.append(below[-1])
+            levels.append(level)
+        return cls(chunk_size, length, levels)
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0]
+
+    @property
+    def root_hex(self) -> str:
+        return self.root.hex()
+
+    @property
+    def num_chunks(self) -> int:
+        return len(self.levels[0])
+
+    def node(self, level: int, index: int) -> bytes:
+        """Get the hash at an index of a level, counting levels up from the leaves."""
+        return self.levels[level][index]
+
+    def chunk_range(self, index: int) -> Tuple[int, int]:
+        """Get the byte range [start, end) of the data under a leaf."""
+        start = index * self.chunk_size
+        return start, min(start + self.chunk_size, self.length)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the leaf hashes, from which the whole tree can be rebuilt."""
+        return MERKLE_MAGIC + struct.pack("<QQ", self.chunk_size, self.length) + b"".join(self.levels[0])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Union["MerkleTree", ValueError]:
+        """
+        Rebuild a tree from its serialized leaf hashes.
+
+        Returns:
+            Union[MerkleTree, ValueError]: The tree, or ValueError if the
+            data is not serialized leaf hashes
+        """
+        if not data.startswith(MERKLE_MAGIC):
+            return ValueError("Data is not a serialized Merkle tree")
+        body = data[len(MERKLE_MAGIC) :]
+        if len(body) < 16 or (len(body) - 16) % 32:
+            return ValueError("Serialized Merkle tree is truncated")
+        chunk_size, length = struct.unpack("<QQ", body[:16])
+        leaves = [body[i : i + 32] for i in range(16, len(body), 32)]
+        return cls.from_leaves(leaves, chunk_size, length)
+
+
+#####
+# Logic For Comparing Trees
+#####
+
+
+def find_differing_chunks(
+    local: MerkleTree, remote_node: Callable[[int, int], bytes]
+) -> List[int]:
+    """
+    Find the chunks where two trees of the same shape differ.
+
+    Descends from the root, asking for a remote hash only below nodes that
+    differ, so when k chunks disagree about k * log2(chunks) hashes are
+    exchanged rather than every leaf.
+
+    Args:
+        local: The tree computed locally
+        remote_node: Gets the other tree's hash at (level, index), e.g. over the network
+
+    Returns:
+        List[int]: Indices of the differing chunks, in order
+    """
+    top = len(local.levels) - 1
+    if remote_node(top, 0) == local.root:
+        return []
+
+    differing = [0]
+    for level in range(top, 0, -1):
+        below = len(local.levels[level - 1])
+        children = [
+            child
+            for index in differing
+            for child in (2 * index, 2 * index + 1)
+            if child < below
+        ]
+        differing = [
+            child
+            for child in children
+            if remote_node(level - 1, child) != local.node(level - 1, child)
+        ]
+    return differing
+
+
+def compare_trees(a: MerkleTree, b: MerkleTree) -> List[int]:
+    """
+    Compare two trees by root and narrow a mismatch down to the differing chunks.
+
+    Chunks present in only one of the trees count as differing.
+
+    Returns:
+        List[int]: Indices of the differing chunks, empty if the data is identical
+    """
+    if a.chunk_size != b.chunk_size:
+        raise ValueError(
+            f"Trees with different chunk sizes cannot be compared: {a.chunk_size} and {b.chunk_size}"
+        )
+    if a.root == b.root and a.length == b.length:
+        return []
+    if a.num_chunks == b.num_chunks:
+        return find_differing_chunks(a, b.node)
+
+    # Trees of different shapes share no inner nodes, so compare their leaves
+    common = min(a.num_chunks, b.num_chunks)
+    differing = [i for i in range(common) if a.levels[0][i] != b.levels[0][i]]
+    return differing + list(range(common, max(a.num_chunks, b.num_chunks)))
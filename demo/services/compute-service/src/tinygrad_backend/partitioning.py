@@ -0,0 +1,268 @@
+from typing import Dict, List, Optional, Set, Tuple, Union
+from dataclasses import dataclass
+from tinygrad.ops import UOp, Ops, GroupOp
+from tinygrad.helpers import prod
+from tinygrad import Tensor
+from .core import GraphProgram, PlaceholderInfo, TensorTemplateManager
+from .graph_rewriting import (
+    buffer_uop_contains_placeholder,
+    get_placeholder_name,
+    find_all_placeholders,
+)
+
+#####
+# Logic For Estimating Buffer Footprints
+#####
+
+# Ops whose result is written to a buffer of its own rather than fused away
+MATERIALIZING_OPS = {Ops.REDUCE_AXIS, Ops.CONTIGUOUS, Ops.COPY, Ops.ASSIGN}
+
+
+def uop_nbytes(uop: UOp) -> int:
+    """Estimate the size in bytes of the tensor a UOp produces."""
+    if uop.op is Ops.BUFFER:
+        return uop.size * uop.dtype.itemsize
+    if uop.st is None:
+        return 0
+    return prod(uop.shape) * uop.dtype.itemsize
+
+
+@dataclass(frozen=True)
+class _GraphAnalysis:
+    """Per-node facts about a UOp graph used to choose cut points."""
+
+    order: List[UOp]  # topological order
+    computed: Dict[UOp, bool]
+    last_use: Dict[UOp, int]
+    placeholder_bytes: Dict[str, int]
+    # computed node -> placeholders it reads without going through other computation
+    direct_placeholders: Dict[UOp, Set[str]]
+
+
+def _analyse_graph(root: UOp) -> _GraphAnalysis:
+    """Collect topological order, liveness and placeholder use for a graph."""
+    order = list(root.toposort)
+    index = {u: i for i, u in enumerate(order)}
+
+    computed: Dict[UOp, bool] = {}
+    free_placeholders: Dict[UOp, Set[str]] = {}
+    placeholder_bytes: Dict[str, int] = {}
+    direct_placeholders: Dict[UOp, Set[str]] = {}
+    last_use: Dict[UOp, int] = {u: index[u] for u in order}
+
+    for i, u in enumerate(order):
+        for s in u.src:
+            last_use[s] = max(last_use[s], i)
+
+        if u.op is Ops.BUFFER and buffer_uop_contains_placeholder(u):
+            name = get_placeholder_name(u.arg)
+            placeholder_bytes[name] = uop_nbytes(u)
+            computed[u] = False
+            free_placeholders[u] = {name}
+            continue
+
+        is_computed = any(computed[s] for s in u.src) or (
+            u.op in GroupOp.ALU or u.op in MATERIALIZING_OPS
+        )
+        computed[u] = is_computed
+
+        reads: Set[str] = set()
+        for s in u.src:
+            if not computed[s]:
+                reads |= free_placeholders[s]
+        if is_computed:
+            direct_placeholders[u] = reads
+        else:
+            free_placeholders[u] = reads
+
+    return _GraphAnalysis(
+        order, computed, last_use, placeholder_bytes, direct_placeholders
+    )
+
+
+#####
+# Logic For Choosing Cut Points
+#####
+
+
+def _candidate_cuts(analysis: _GraphAnalysis) -> List[Tuple[int, UOp]]:
+    """
+    Find positions in topological order crossed by exactly one computed tensor.
+
+    Cutting there means the later part of the graph only needs that one
+    tensor (plus graph inputs and constants) from the earlier part.
+    """
+    live: Set[UOp] = set()
+    dying: Dict[int, List[UOp]] = {}
+    candidates: List[Tuple[int, UOp]] = []
+    seen: Set[UOp] = set()
+
+    for i, u in enumerate(analysis.order[:-1]):
+        if analysis.computed[u] and analysis.last_use[u] > i:
+            live.add(u)
+            dying.setdefault(analysis.last_use[u], []).append(u)
+        for d in dying.pop(i, []):
+            live.discard(d)
+
+        if len(live) == 1:
+            (boundary,) = live
+            if boundary not in seen:
+                seen.add(boundary)
+                candidates.append((i, boundary))
+
+    return candidates
+
+
+def _segment_bytes(
+    analysis: _GraphAnalysis,
+    start: int,
+    end: int,
+    boundary_in: Optional[UOp],
+) -> int:
+    """
+    Estimate the memory needed by the computed nodes in (start, end].
+
+    Counts the incoming boundary tensor, the graph inputs read and every
+    materialised intermediate, but not the segment's output unless it is
+    materialised anyway, so the estimate only grows as the segment grows.
+    """
+    total = uop_nbytes(boundary_in) if boundary_in is not None else 0
+    placeholders: Set[str] = set()
+
+    for u in analysis.order[start + 1 : end + 1]:
+        if not analysis.computed[u]:
+            continue
+        placeholders |= analysis.direct_placeholders[u]
+        if u.op in MATERIALIZING_OPS:
+            total += uop_nbytes(u)
+
+    return total + sum(analysis.placeholder_bytes[p] for p in placeholders)
+
+
+def _output_bytes(boundary_out: UOp) -> int:
+    """Bytes of a segment's output not already counted by _segment_bytes."""
+    return 0 if boundary_out.op in MATERIALIZING_OPS else uop_nbytes(boundary_out)
+
+
+def _choose_cuts(
+    analysis: _GraphAnalysis, target_vram: int
+) -> Union[List[Tuple[int, UOp]], ValueError]:
+    """
+    Choose cut points so every segment fits the budget.
+
+    Minimises the total bytes of boundary tensors with a dynamic programme
+    over the candidate cut points. Returns the chosen cuts, ending with the
+    position of the graph's root.
+    """
+    root = analysis.order[-1]
+    points: List[Tuple[int, Optional[UOp]]] = [(-1, None)]
+    points += _candidate_cuts(analysis)
+    points.append((len(analysis.order) - 1, root))
+
+    # best[j] = (bytes crossing cuts to reach point j, previous point)
+    best: List[Optional[Tuple[int, int]]] = [None] * len(points)
+    best[0] = (0, -1)
+
+    for a in range(len(points) - 1):
+        if best[a] is None:
+            continue
+        start, boundary_in = points[a]
+        crossing = best[a][0] + (
+            uop_nbytes(boundary_in) if boundary_in is not None else 0
+        )
+
+        for b in range(a + 1, len(points)):
+            end, boundary_out = points[b]
+            footprint = _segment_bytes(analysis, start, end, boundary_in)
+            # The footprint only grows as the segment grows
+            if footprint > target_vram:
+                break
+            if footprint + _output_bytes(boundary_out) > target_vram:
+                continue
+            if best[b] is None or crossing < best[b][0]:
+                best[b] = (crossing, a)
+
+    if best[-1] is None:
+        return ValueError(
+            f"Cannot Partition Graph: Some Operation Needs More Than {target_vram} Bytes"
+        )
+
+    chosen: List[Tuple[int, UOp]] = []
+    j = len(points) - 1
+    while j > 0:
+        chosen.append(points[j])
+        j = best[j][1]
+    return list(reversed(chosen))
+
+
+#####
+# Logic For Building Partition Programs
+#####
+
+
+def auto_partition(
+    graph_program: GraphProgram,
+    target_vram: int,
+    boundary_prefix: str = "partition",
+) -> Union[List[GraphProgram], ValueError]:
+    """
+    Split a graph program into a chain of programs that each fit a memory budget.
+
+    Cuts are only made where a single intermediate tensor flows from the
+    earlier part of the graph to the later part. Among those, cut points are
+    chosen to minimise the bytes of intermediate tensors crossing cuts.
+    The output of program k becomes the placeholder named
+    "{boundary_prefix}_{k}" of program k + 1, created through
+    TensorTemplateManager.create. Graph inputs (weights and user inputs)
+    remain placeholders of whichever programs read them.
+
+    Memory estimates are conservative: every materialised intermediate of a
+    program is counted as live at once.
+
+    Args:
+        graph_program: The program to partition
+        target_vram: Memory budget for each program, in bytes
+
+    Returns:
+        Union[List[GraphProgram], ValueError]: The programs in execution order,
+        or ValueError if the graph cannot be split to fit the budget
+    """
+    root = graph_program.tensor.lazydata
+    analysis = _analyse_graph(root)
+
+    cuts = _choose_cuts(analysis, target_vram)
+    if isinstance(cuts, ValueError):
+        return cuts
+
+    known = {ph.name: ph for ph in graph_program.placeholders}
+    programs: List[GraphProgram] = []
+    previous: Optional[Tuple[UOp, UOp, PlaceholderInfo]] = None
+
+    for k, (_, boundary) in enumerate(cuts):
+        uop = boundary
+        boundary_inputs: List[PlaceholderInfo] = []
+
+        if previous is not None:
+            prev_boundary, prev_placeholder, prev_info = previous
+            uop = uop.substitute({prev_boundary: prev_placeholder})
+            boundary_inputs.append(prev_info)
+
+        # The output of this program is an input of the next
+        if k < len(cuts) - 1:
+            name = f"{boundary_prefix}_{k}"
+            shape = tuple(int(x) for x in boundary.shape)
+            placeholder = TensorTemplateManager.create(name, shape, boundary.dtype)
+            info = PlaceholderInfo(
+                placeholder=True, name=name, shape=shape, dtype=boundary.dtype
+            )
+            previous = (boundary, placeholder.lazydata, info)
+
+        found = find_all_placeholders(uop)
+        unknown = found - set(known) - {ph.name for ph in boundary_inputs}
+        if unknown:
+            return ValueError(f"Unknown Placeholders Detected: {unknown}")
+
+        placeholders = boundary_inputs + [known[n] for n in known if n in found]
+        programs.append(GraphProgram(Tensor(uop), placeholders))
+
+    return programs
@@ -0,0 +1,234 @@
+import argparse
+import json
+import pathlib
+import sys
+from typing import Any, Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass
+import numpy as np
+from tinygrad import Tensor, dtypes
+from tinygrad.dtype import DType
+from tinygrad.nn.state import safe_load
+from .core import TensorContext
+
+# Marks serialized quantized tensors, which TensorSerializer cannot read
+QUANTIZED_MAGIC = b"splitup-quantized\n"
+
+# Largest magnitude of each supported width, symmetric around zero
+QUANTIZED_MAX = {8: 127, 4: 7}
+
+# Suffixes of the placeholders bound to a quantized weight's parts
+QWEIGHT_SUFFIX = ".qweight"
+QSCALE_SUFFIX = ".qscale"
+
+#####
+# Logic For Quantizing Tensors
+#####
+
+
+@dataclass(frozen=True)
+class QuantizedTensor:
+    """
+    A tensor stored as int8 or int4 values with one scale per output channel.
+
+    Channels run along the first axis. int4 values are packed two per byte,
+    low nibble first, offset by 8 so they are unsigned.
+    """
+
+    bits: int
+    shape: Tuple[int, ...]
+    dtype: DType  # dtype of the original tensor
+    scales: np.ndarray  # float32, one per channel
+    data: np.ndarray  # int8 for 8 bits, packed uint8 for 4 bits
+
+    def values(self) -> np.ndarray:
+        """Get the quantized values as int8, unpacking int4."""
+        if self.bits == 8:
+            return self.data.reshape(self.shape)
+        unpacked = np.empty(self.data.size * 2, dtype=np.int8)
+        unpacked[0::2] = (self.data & 0x0F).astype(np.int8) - 8
+        unpacked[1::2] = (self.data >> 4).astype(np.int8) - 8
+        return unpacked[: int(np.prod(self.shape))].reshape(self.shape)
+
+    def qweight(self) -> Tensor:
+        """Get the quantized values as an int8 tensor, for dequantizing in the graph."""
+        return Tensor(self.values(), dtype=dtypes.int8)
+
+    def qscale(self) -> Tensor:
+        """Get the per-channel scales as a float32 tensor."""
+        return Tensor(self.scales, dtype=dtypes.float32)
+
+    def dequantize(self) -> Tensor:
+        """Rebuild a tensor of the original dtype."""
+        return dequantize_tensor(self.qweight(), self.qscale(), self.dtype)
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + self.scales.nbytes
+
+    def to_bytes(self) -> bytes:
+        """Convert the quantized tensor to bytes for storage."""
+        header = json.dumps(
+            {"bits": self.bits, "shape": list(self.shape), "dtype": self.dtype.name}
+        ).encode()
+        return (
+            QUANTIZED_MAGIC
+            + header
+            + b"\n"
+            + self.scales.astype(np.float32).tobytes()
+            + self.data.tobytes()
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Union["QuantizedTensor", ValueError]:
+        """
+        Import a quantized tensor from bytes.
+
+        Returns:
+            Union[QuantizedTensor, ValueError]: The tensor, or ValueError if
+            the data is not a quantized tensor
+        """
+        try:
+            if not is_quantized(data):
+                return ValueError("Data is not a quantized tensor")
+            header, body = data[len(QUANTIZED_MAGIC) :].split(b"\n", 1)
+            meta: Dict[str, Any] = json.loads(header)
+
+            bits = int(meta["bits"])
+            if bits not in QUANTIZED_MAX:
+                return ValueError(f"Unsupported quantization width: {bits}")
+            shape = tuple(int(x) for x in meta["shape"])
+            dtype = getattr(dtypes, meta["dtype"])
+
+            channels = shape[0] if shape else 1
+            scales = np.frombuffer(body[: channels * 4], dtype=np.float32)
+            raw = body[channels * 4 :]
+            values = np.frombuffer(raw, dtype=np.int8 if bits == 8 else np.uint8)
+            return cls(bits, shape, dtype, scales, values)
+        except Exception as e:
+            return ValueError(f"Failed to parse quantized tensor: {str(e)}")
+
+
+def is_quantized(data: bytes) -> bool:
+    """Check whether serialized tensor bytes hold a quantized tensor."""
+    return data.startswith(QUANTIZED_MAGIC)
+
+
+def quantize_tensor(tensor: Tensor, bits: int = 8) -> QuantizedTensor:
+    """
+    Quantize a tensor symmetrically with one scale per output channel.
+
+    Args:
+        tensor: The tensor to quantize, with channels along the first axis
+        bits: 8 or 4
+
+    Returns:
+        QuantizedTensor: The quantized tensor
+    """
+    if bits not in QUANTIZED_MAX:
+        raise ValueError(f"Unsupported quantization width: {bits}")
+    qmax = QUANTIZED_MAX[bits]
+
+    shape = tuple(int(x) for x in tensor.shape)
+    values = tensor.float().numpy().reshape(shape[0] if shape else 1, -1)
+
+    scales = np.abs(values).max(axis=1) / qmax
+    scales[scales == 0] = 1.0
+    q = np.clip(np.round(values / scales[:, None]), -qmax, qmax).astype(np.int8)
+
+    data = q.reshape(-1)
+    if bits == 4:
+        offset = (data + 8).astype(np.uint8)
+        if offset.size % 2:
+            offset = np.append(offset, np.uint8(8))
+        data = offset[0::2] | (offset[1::2] << 4)
+
+    return QuantizedTensor(bits, shape, tensor.dtype, scales.astype(np.float32), data)
+
+
+def dequantize_tensor(qweight: Tensor, qscale: Tensor, dtype: DType) -> Tensor:
+    """Multiply int8 values by their per-channel scales, as lazy tensor operations."""
+    scale = qscale.reshape(qscale.shape[0], *([1] * (qweight.ndim - 1)))
+    return (qweight.cast(dtypes.float32) * scale).cast(dtype)
+
+
+#####
+# Logic For Dequantizing Inside Programs
+#####
+
+
+def add_quantized_graph_input(
+    context: TensorContext,
+    name: str,
+    shape: Tuple[int, ...],
+    dtype: DType = dtypes.float32,
+) -> Tensor:
+    """
+    Create a weight input that stays quantized until the program runs.
+
+    The program gets two placeholders, "{name}.qweight" (int8 values) and
+    "{name}.qscale" (per-channel scales), and the returned tensor
+    dequantizes them, so the conversion is fused into the kernels that
+    read the weight and only the int8 values occupy device memory.
+    """
+    qweight = context.add_graph_input(f"{name}{QWEIGHT_SUFFIX}", shape, dtypes.int8)
+    qscale = context.add_graph_input(f"{name}{QSCALE_SUFFIX}", (shape[0],), dtypes.float32)
+    return dequantize_tensor(qweight, qscale, dtype)
+
+
+#####
+# Logic For The Command Line
+#####
+
+
+def should_quantize(tensor: Tensor, min_elements: int) -> bool:
+    """Quantize only floating point matrices; biases and norms stay exact."""
+    return (
+        dtypes.is_float(tensor.dtype)
+        and tensor.ndim >= 2
+        and tensor.numel() >= min_elements
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .weight_shards import shard_weights
+
+    parser = argparse.ArgumentParser(
+        description="Write quantized weight shards and a manifest from a safetensors file."
+    )
+    parser.add_argument("safetensors", help="Path to the safetensors file")
+    parser.add_argument("output", help="Directory to write the shards and manifest to")
+    parser.add_argument("--bits", type=int, choices=sorted(QUANTIZED_MAX), default=8)
+    parser.add_argument("--key-prefix", default="weights", help="Storage key prefix of the shards")
+    parser.add_argument(
+        "--min-elements",
+        type=int,
+        default=4096,
+        help="Smaller tensors are stored at full precision",
+    )
+    args = parser.parse_args(argv)
+
+    weights = safe_load(args.safetensors)
+    quantize = [
+        name for name, tensor in weights.items() if should_quantize(tensor, args.min_elements)
+    ]
+    manifest, blobs = shard_weights(
+        weights, key_prefix=args.key_prefix, bits=args.bits, quantize=quantize
+    )
+
+    output = pathlib.Path(args.output)
+    for key, data in blobs.items():
+        path = output / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    (output / args.key_prefix / "manifest.json").write_bytes(manifest.to_bytes())
+
+    original = sum(t.nbytes() for t in weights.values())
+    print(
+        f"Quantized {len(quantize)} of {len(weights)} tensors to int{args.bits}: "
+        f"{original / 1e6:.1f} MB -> {manifest.nbytes / 1e6:.1f} MB"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,147 @@
+import itertools
+import json
+from typing import Any, Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass
+import numpy as np
+import zstandard
 from tinygrad import Tensor, dtypes
+from tinygrad.dtype import DType
 from numpy import ndarray
+from .merkle import MerkleTree, DEFAULT_CHUNK_SIZE
+
+# Marks tensors written with an encoding; tensors without it are raw
+ENCODED_MAGIC = b"splitup-tensor\n"
+
+# Supported compression methods and lossy downcasts
+COMPRESSIONS = ("zstd",)
+DOWNCASTS = ("float16", "bfloat16")
+
+###
+# Tools For Describing Tensor Encodings
+###
+
+
+@dataclass(frozen=True)
+class TensorEncoding:
+    """How a tensor is encoded for transfer.
+
+    Encodings are written as "+"-separated parts, for example "zstd",
+    "float16" or "zstd+bfloat16". Compression is lossless; downcasting
+    float32 to float16 or bfloat16 is lossy.
+    """
+
+    compression: Optional[str] = None
+    downcast: Optional[str] = None
+    level: int = 3  # zstd compression level
+    block_size: int = 1 << 20  # bytes compressed independently
+
+    @classmethod
+    def parse(cls, spec: Optional[str]) -> Union["TensorEncoding", ValueError]:
+        """Create a TensorEncoding from its string form.
+
+        Args:
+            spec: The encoding, e.g. "zstd+float16", or None or "raw" for none
+
+        Returns:
+            Union[TensorEncoding, ValueError]: The encoding, or ValueError if
+            any part is not supported
+        """
+        compression = downcast = None
+        for part in (spec or "raw").split("+"):
+            if part == "raw":
+                continue
+            elif part in COMPRESSIONS and compression is None:
+                compression = part
+            elif part in DOWNCASTS and downcast is None:
+                downcast = part
+            else:
+                return ValueError(f"Unsupported tensor encoding: {spec}")
+        return cls(compression=compression, downcast=downcast)
+
+    def __str__(self) -> str:
+        parts = [p for p in (self.compression, self.downcast) if p is not None]
+        return "+".join(parts) or "raw"
+
+    @property
+    def is_raw(self) -> bool:
+        return self.compression is None and self.downcast is None
+
+
+###
+# Tools For Encoding Raw Tensor Data
+###
+
+
+def _downcast(data: ndarray, downcast: str) -> ndarray:
+    """Downcast float32 data, rounding to nearest even for bfloat16."""
+    if downcast == "float16":
+        return data.astype(np.float16)
+    bits = data.astype(np.float32).view(np.uint32)
+    rounding = ((bits >> 16) & 1) + np.uint32(0x7FFF)
+    return ((bits + rounding) >> 16).astype(np.uint16)
+
+
+def _upcast(data: bytes, downcast: str) -> ndarray:
+    """Restore float32 data from its downcast bytes."""
+    if downcast == "float16":
+        return np.frombuffer(data, dtype=np.float16).astype(np.float32)
+    bits = np.frombuffer(data, dtype=np.uint16).astype(np.uint32) << 16
+    return bits.view(np.float32)
+
+
+def _shuffle(raw: bytes, itemsize: int) -> bytes:
+    """Group bytes by significance, which makes numeric data compress better."""
+    if itemsize <= 1 or len(raw) % itemsize:
+        return raw
+    return np.frombuffer(raw, dtype=np.uint8).reshape(-1, itemsize).T.tobytes()
+
+
+def _unshuffle(raw: bytes, itemsize: int) -> bytes:
+    """Undo _shuffle."""
+    if itemsize <= 1 or len(raw) % itemsize:
+        return raw
+    return np.frombuffer(raw, dtype=np.uint8).reshape(itemsize, -1).T.tobytes()
+
+
+def _compress_blocks(
+    raw: bytes, encoding: TensorEncoding
+) -> Tuple[List[Tuple[str, int]], List[bytes]]:
+    """Compress each block, keeping it raw when compression does not help."""
+    compressor = zstandard.ZstdCompressor(level=encoding.level)
+    blocks: List[Tuple[str, int]] = []
+    payload: List[bytes] = []
+
+    for start in range(0, len(raw), encoding.block_size):
+        block = raw[start : start + encoding.block_size]
+        compressed = compressor.compress(block)
+        if len(compressed) < len(block):
+            blocks.append(("zstd", len(compressed)))
+            payload.append(compressed)
+        else:
+            blocks.append(("raw", len(block)))
+            payload.append(block)
+
+    return blocks, payload
+
+
+def _decompress_blocks(blocks: List[Tuple[str, int]], body: bytes) -> bytes:
+    """Reassemble data written by _compress_blocks."""
+    decompressor = zstandard.ZstdDecompressor()
+    parts: List[bytes] = []
+    offset = 0
+
+    for method, length in blocks:
+        block = body[offset : offset + length]
+        offset += length
+        if method == "zstd":
+            parts.append(decompressor.decompress(block))
+        elif method == "raw":
+            parts.append(block)
+        else:
+            raise ValueError(f"Unknown block encoding: {method}")
+
+    return b"".join(parts)
+
 
 ###
 # Tools For Serializing/Deserializing Tensors
@@ -10,11 +152,14 @@ class TensorSerializer:
     """Class for serializing and deserializing realized tensors to/from bytes."""
 
     @staticmethod
-    def tensor_to_bytes(tensor: Tensor) -> bytes:
+    def tensor_to_bytes(
+        tensor: Tensor, encoding: Optional[TensorEncoding] = None
+    ) -> bytes:
         """Convert a realized tensor to bytes.
 
         Args:
             tensor: The tensor to serialize
+            encoding: How to encode the data, defaults to raw bytes
 
         Returns:
             Bytes containing the serialized tensor
@@ -24,6 +169,46 @@ class TensorSerializer:
 
         # Get raw buffer data
         np_data: ndarray = tensor.numpy()
+        return TensorSerializer._serialize(tensor, np_data, encoding)
+
+    @staticmethod
+    def tensor_to_bytes_with_merkle(
+        tensor: Tensor,
+        encoding: Optional[TensorEncoding] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Tuple[bytes, MerkleTree]:
+        """Convert a realized tensor to bytes and hash its data into a Merkle tree.
+
+        The tree covers the tensor's raw data before encoding, so results
+        computed by different nodes compare equal whatever encoding each
+        one uploaded with.
+
+        Args:
+            tensor: The tensor to serialize
+            encoding: How to encode the data, defaults to raw bytes
+            chunk_size: Bytes of tensor data under each leaf
+
+        Returns:
+            The serialized tensor and the Merkle tree of its data
+        """
+        tensor.realize()
+        np_data: ndarray = tensor.numpy()
+        tree = MerkleTree.build(np_data.tobytes(), chunk_size)
+        return TensorSerializer._serialize(tensor, np_data, encoding), tree
+
+    @staticmethod
+    def merkle_tree(tensor: Tensor, chunk_size: int = DEFAULT_CHUNK_SIZE) -> MerkleTree:
+        """Hash a tensor's raw data into a Merkle tree, as tensor_to_bytes_with_merkle does."""
+        return MerkleTree.build(tensor.numpy().tobytes(), chunk_size)
+
+    @staticmethod
+    def _serialize(
+        tensor: Tensor, np_data: ndarray, encoding: Optional[TensorEncoding]
+    ) -> bytes:
+        """Serialize realized data, encoded or as raw bytes behind a short header."""
+        if encoding is not None and not encoding.is_raw:
+            return TensorSerializer._encode(tensor, np_data, encoding)
+
         raw_data = np_data.tobytes()
 
         # Build metadata and buffer
@@ -36,7 +221,7 @@ class TensorSerializer:
 
     @staticmethod
     def tensor_from_bytes(data: bytes) -> Tensor:
-        """Create a tensor from bytes.
+        """Create a tensor from bytes, decoding it if it was encoded.
 
         Args:
             data: Bytes containing the serialized tensor
@@ -44,6 +229,9 @@ class TensorSerializer:
         Returns:
             The deserialized tensor
         """
+        if data.startswith(ENCODED_MAGIC):
+            return TensorSerializer._decode(data)
+
         # Split metadata and raw data
         lines = data.split(b"\n", 2)
 
@@ -54,3 +242,159 @@ class TensorSerializer:
 
         # Create tensor from bytes
         return Tensor(raw_data, dtype=dtype).reshape(shape)
+
+    @staticmethod
+    def _encode(tensor: Tensor, np_data: ndarray, encoding: TensorEncoding) -> bytes:
+        """Serialize with an encoding, behind a header describing it."""
+        # Only float32 data is downcast
+        downcast = encoding.downcast if tensor.dtype == dtypes.float32 else None
+        if downcast is not None:
+            np_data = _downcast(np_data, downcast)
+
+        raw = np_data.tobytes()
+        header: Dict[str, Any] = {
+            "shape": [int(x) for x in tensor.shape],
+            "dtype": tensor.dtype.name,
+            "downcast": downcast,
+            "compression": encoding.compression,
+            "itemsize": np_data.itemsize,
+        }
+
+        if encoding.compression is None:
+            payload = [raw]
+        else:
+            blocks, payload = _compress_blocks(_shuffle(raw, np_data.itemsize), encoding)
+            header["blocks"] = blocks
+
+        return ENCODED_MAGIC + json.dumps(header).encode() + b"\n" + b"".join(payload)
+
+    @staticmethod
+    def _decode(data: bytes) -> Tensor:
+        """Deserialize a tensor written by _encode."""
+        header_bytes, body = data[len(ENCODED_MAGIC) :].split(b"\n", 1)
+        header: Dict[str, Any] = json.loads(header_bytes)
+
+        shape = tuple(int(x) for x in header["shape"])
+        dtype = getattr(dtypes, header["dtype"])
+
+        raw = body
+        if header["compression"] is not None:
+            raw = _unshuffle(
+                _decompress_blocks(header["blocks"], body), int(header["itemsize"])
+            )
+
+        if header["downcast"] is not None:
+            return Tensor(_upcast(raw, header["downcast"]), dtype=dtype).reshape(shape)
+        return Tensor(raw, dtype=dtype).reshape(shape)
+
+
+###
+# Tools For Reading Parts Of Serialized Tensors
+###
+
+
+@dataclass(frozen=True)
+class TensorLayout:
+    """Where the data of a serialized tensor lies, so parts of it can be read."""
+
+    shape: Tuple[int, ...]
+    dtype: DType  # dtype of the tensor
+    data_offset: int  # bytes before the first element
+    itemsize: int  # bytes per stored element
+    downcast: Optional[str] = None  # float32 stored as float16 or bfloat16
+
+    @classmethod
+    def parse(cls, prefix: bytes) -> Union["TensorLayout", ValueError]:
+        """Read the layout from the first bytes of a serialized tensor.
+
+        Args:
+            prefix: The start of the serialized tensor, long enough to hold its header
+
+        Returns:
+            Union[TensorLayout, ValueError]: The layout, or ValueError if the
+            header is incomplete or the data is compressed, so elements
+            cannot be located by offset
+        """
+        try:
+            if prefix.startswith(ENCODED_MAGIC):
+                end = prefix.find(b"\n", len(ENCODED_MAGIC))
+                if end < 0:
+                    return ValueError("Tensor header is longer than the bytes given")
+                header: Dict[str, Any] = json.loads(prefix[len(ENCODED_MAGIC) : end])
+                if header["compression"] is not None:
+                    return ValueError("Compressed tensors cannot be read in parts")
+                return cls(
+                    shape=tuple(int(x) for x in header["shape"]),
+                    dtype=getattr(dtypes, header["dtype"]),
+                    data_offset=end + 1,
+                    itemsize=int(header["itemsize"]),
+                    downcast=header["downcast"],
+                )
+
+            shape_end = prefix.find(b"\n")
+            dtype_end = prefix.find(b"\n", shape_end + 1)
+            if shape_end < 0 or dtype_end < 0:
+                return ValueError("Tensor header is longer than the bytes given")
+            dtype = getattr(dtypes, prefix[shape_end + 1 : dtype_end].decode())
+            return cls(
+                shape=tuple(int(x) for x in prefix[:shape_end].decode().split(",")),
+                dtype=dtype,
+                data_offset=dtype_end + 1,
+                itemsize=dtype.itemsize,
+            )
+        except Exception as e:
+            return ValueError(f"Failed to parse tensor header: {str(e)}")
+
+    def slice_byte_ranges(
+        self, ranges: List[Tuple[int, int]]
+    ) -> Union[Tuple[List[Tuple[int, int]], Tuple[int, ...]], ValueError]:
+        """Find the contiguous byte ranges holding a slice of the tensor.
+
+        Args:
+            ranges: [start, stop) per leading axis; axes not given are whole
+
+        Returns:
+            The byte ranges [start, end) in row-major order of the slice, so
+            their concatenation is the slice's data, and the slice's shape;
+            or ValueError if the ranges do not fit the tensor
+        """
+        if len(ranges) > len(self.shape):
+            return ValueError(f"Slice has {len(ranges)} axes, tensor has {len(self.shape)}")
+        bounds = [(int(start), int(stop)) for start, stop in ranges]
+        bounds += [(0, size) for size in self.shape[len(bounds) :]]
+        for axis, ((start, stop), size) in enumerate(zip(bounds, self.shape)):
+            if not 0 <= start < stop <= size:
+                return ValueError(f"Slice [{start}, {stop}) does not fit axis {axis} of size {size}")
+
+        strides = [int(np.prod(self.shape[axis + 1 :])) for axis in range(len(self.shape))]
+        slice_shape = tuple(stop - start for start, stop in bounds)
+
+        # Trailing whole axes are contiguous with the last partial one
+        partial = len(self.shape)
+        while partial > 0 and bounds[partial - 1] == (0, self.shape[partial - 1]):
+            partial -= 1
+
+        if partial == 0:
+            runs = [(0, int(np.prod(self.shape)))]
+        else:
+            start, stop = bounds[partial - 1]
+            length = (stop - start) * strides[partial - 1]
+            runs = []
+            for index in itertools.product(*(range(s, e) for s, e in bounds[: partial - 1])):
+                offset = sum(i * stride for i, stride in zip(index, strides)) + start * strides[partial - 1]
+                runs.append((offset, offset + length))
+
+        byte_ranges: List[Tuple[int, int]] = []
+        for start, end in runs:
+            start, end = self.data_offset + start * self.itemsize, self.data_offset + end * self.itemsize
+            if byte_ranges and byte_ranges[-1][1] == start:
+                byte_ranges[-1] = (byte_ranges[-1][0], end)
+            else:
+                byte_ranges.append((start, end))
+        return byte_ranges, slice_shape
+
+    def tensor_from_slice(self, data: bytes, slice_shape: Tuple[int, ...]) -> Tensor:
+        """Create a tensor from the concatenated bytes of slice_byte_ranges."""
+        if self.downcast is not None:
+            return Tensor(_upcast(data, self.downcast), dtype=self.dtype).reshape(slice_shape)
+        return Tensor(data, dtype=self.dtype).reshape(slice_shape)
@@ -0,0 +1,227 @@
+import json
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+from dataclasses import dataclass, asdict
+from .core import GraphProgram
+from .types import ActualTensors
+from .graph_rewriting import find_all_placeholders
+from .serialize_tensors import TensorSerializer
+from .storage_manager import get_uuid_from_bytes
+from .quantization import (
+    QuantizedTensor,
+    quantize_tensor,
+    QWEIGHT_SUFFIX,
+    QSCALE_SUFFIX,
+)
+
+# Version of the manifest format written by shard_weights
+MANIFEST_VERSION = 1
+
+#####
+# Logic For Describing Sharded Weights
+#####
+
+
+@dataclass(frozen=True)
+class WeightShard:
+    """One weight tensor stored as its own blob."""
+
+    name: str  # placeholder name the tensor is bound to
+    key: str  # storage key of the serialized tensor
+    shape: Tuple[int, ...]
+    dtype: str
+    nbytes: int  # bytes stored
+    bits: Optional[int] = None  # quantization width, None if stored at full precision
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "shape": list(self.shape)}
+
+    def placeholder_names(self) -> Tuple[str, ...]:
+        """Names of the placeholders this shard can be bound to."""
+        if self.bits is None:
+            return (self.name,)
+        return (self.name, self.name + QWEIGHT_SUFFIX, self.name + QSCALE_SUFFIX)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "WeightShard | None":
+        """Create a WeightShard from a dict. Returns None if the dict is invalid."""
+        try:
+            return cls(
+                name=str(d["name"]),
+                key=str(d["key"]),
+                shape=tuple(int(x) for x in d["shape"]),
+                dtype=str(d["dtype"]),
+                nbytes=int(d["nbytes"]),
+                bits=int(d["bits"]) if d.get("bits") is not None else None,
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+@dataclass(frozen=True)
+class WeightManifest:
+    """Index of a model's weights, sharded one tensor per blob."""
+
+    shards: Dict[str, WeightShard]
+
+    def to_bytes(self) -> bytes:
+        """Convert the manifest to JSON bytes for storage."""
+        return json.dumps(
+            {
+                "version": MANIFEST_VERSION,
+                "shards": [shard.to_dict() for shard in self.shards.values()],
+            }
+        ).encode()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Union["WeightManifest", ValueError]:
+        """
+        Import a manifest from JSON bytes.
+
+        Returns:
+            Union[WeightManifest, ValueError]: The manifest, or ValueError if
+            the data is not a valid manifest
+        """
+        try:
+            d = json.loads(data)
+            if d.get("version") != MANIFEST_VERSION:
+                return ValueError(f"Unsupported manifest version: {d.get('version')}")
+
+            shards: Dict[str, WeightShard] = {}
+            for entry in d["shards"]:
+                shard = WeightShard.from_dict(entry)
+                if shard is None:
+                    return ValueError(f"Invalid manifest entry: {entry}")
+                shards[shard.name] = shard
+            return cls(shards)
+        except Exception as e:
+            return ValueError(f"Failed to parse weight manifest: {str(e)}")
+
+    @property
+    def nbytes(self) -> int:
+        return sum(shard.nbytes for shard in self.shards.values())
+
+    def referenced_by(self, programs: Iterable[GraphProgram]) -> Set[str]:
+        """Placeholder names referenced by some programs."""
+        referenced: Set[str] = set()
+        for program in programs:
+            referenced |= find_all_placeholders(program.tensor.lazydata)
+        return referenced
+
+    def shards_for(
+        self, programs: Iterable[GraphProgram], exclude: Iterable[str] = ()
+    ) -> List[WeightShard]:
+        """
+        Get the shards referenced by the placeholders of some programs.
+
+        Args:
+            programs: Programs whose placeholders should be bound to weights
+            exclude: Placeholder names supplied some other way, e.g. user inputs
+
+        Returns:
+            List[WeightShard]: The shards to fetch, in manifest order
+        """
+        referenced = self.referenced_by(programs) - set(exclude)
+        return [
+            shard
+            for shard in self.shards.values()
+            if referenced.intersection(shard.placeholder_names())
+        ]
+
+
+#####
+# Logic For Sharding Weights
+#####
+
+
+def shard_weights(
+    weights: ActualTensors,
+    key_prefix: str = "weights",
+    bits: Optional[int] = None,
+    quantize: Optional[Iterable[str]] = None,
+) -> Tuple[WeightManifest, Dict[str, bytes]]:
+    """
+    Split a model's weights into one serialized blob per tensor.
+
+    Blob keys are derived from their content, so shards shared between
+    models or unchanged between deployments are stored and downloaded once.
+
+    Args:
+        weights: Dictionary mapping placeholder names to realized tensors
+        key_prefix: Storage key prefix of the blobs
+        bits: Quantize to this many bits (8 or 4), None to store every tensor as is
+        quantize: Names of the tensors to quantize, defaults to all of them
+
+    Returns:
+        Tuple[WeightManifest, Dict[str, bytes]]: The manifest, and the blobs
+        to upload keyed by storage key
+    """
+    shards: Dict[str, WeightShard] = {}
+    blobs: Dict[str, bytes] = {}
+    to_quantize = set(weights if quantize is None else quantize) if bits else set()
+
+    for name, tensor in weights.items():
+        if name in to_quantize:
+            quantized = quantize_tensor(tensor, bits)
+            data, nbytes, shard_bits = quantized.to_bytes(), quantized.nbytes, bits
+        else:
+            data = TensorSerializer.tensor_to_bytes(tensor)
+            nbytes, shard_bits = tensor.nbytes(), None
+
+        key = f"{key_prefix}/{get_uuid_from_bytes(data)}.tensor"
+        shards[name] = WeightShard(
+            name=name,
+            key=key,
+            shape=tuple(int(x) for x in tensor.shape),
+            dtype=tensor.dtype.name,
+            nbytes=nbytes,
+            bits=shard_bits,
+        )
+        blobs[key] = data
+
+    return WeightManifest(shards), blobs
+
+
+#####
+# Logic For Loading Shards
+#####
+
+
+def bind_shard(
+    shard: WeightShard, data: bytes, referenced: Set[str]
+) -> Union[ActualTensors, ValueError]:
+    """
+    Load a shard as the tensors bound to the placeholders a program references.
+
+    Quantized shards are dequantized when the program references the weight
+    itself, and left quantized when it references "{name}.qweight" and
+    "{name}.qscale" to dequantize inside the graph.
+
+    Args:
+        shard: The manifest entry of the shard
+        data: The shard's stored bytes
+        referenced: Placeholder names referenced by the program
+
+    Returns:
+        Union[ActualTensors, ValueError]: Tensors keyed by placeholder name,
+        or ValueError if the data does not match the manifest entry
+    """
+    if shard.bits is None:
+        tensor = TensorSerializer.tensor_from_bytes(data)
+        if tuple(tensor.shape) != shard.shape or tensor.dtype.name != shard.dtype:
+            return ValueError(f"Weight shard {shard.name} does not match its manifest entry")
+        return {shard.name: tensor}
+
+    quantized = QuantizedTensor.from_bytes(data)
+    if isinstance(quantized, ValueError):
+        return quantized
+    if quantized.shape != shard.shape or quantized.bits != shard.bits:
+        return ValueError(f"Weight shard {shard.name} does not match its manifest entry")
+
+    tensors: ActualTensors = {}
+    if shard.name in referenced:
+        tensors[shard.name] = quantized.dequantize()
+    if shard.name + QWEIGHT_SUFFIX in referenced:
+        tensors[shard.name + QWEIGHT_SUFFIX] = quantized.qweight()
+    if shard.name + QSCALE_SUFFIX in referenced:
+        tensors[shard.name + QSCALE_SUFFIX] = quantized.qscale()
+    return tensors
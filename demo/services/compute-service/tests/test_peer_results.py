@@ -0,0 +1,243 @@
+"""
+Serving Results To Peers, Between Two Local Service Instances.
+
+Node A produces a result and serves it from its peer cache. Node B reads a
+slice of it through Range requests to A, then, once A no longer has it,
+falls back to S3. Storage is a moto server; heartbeats, notifications and
+the configuration come from a stub server.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+import numpy as np
+import pytest
+
+moto_server = pytest.importorskip("moto.server")
+boto3 = pytest.importorskip("boto3")
+
+SERVICE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SERVICE_DIR))
+
+from src.tinygrad_backend.core import TensorContext  # noqa: E402
+from src.tinygrad_backend.serialize_tensors import TensorSerializer  # noqa: E402
+from tinygrad import Tensor  # noqa: E402
+
+BUCKET = "peer-results"
+STARTUP_TIMEOUT = 120.0
+TASK_TIMEOUT = 120.0
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class AuxHandler(BaseHTTPRequestHandler):
+    """Answers The Heartbeat, Listener And Configuration URLs."""
+
+    def do_GET(self):
+        self._reply({"weights_data_key": "weights.bin"})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply({"success": True, "message": "ok"})
+
+    def _reply(self, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class Node:
+    """One Service Instance Running In Its Own Process."""
+
+    def __init__(self, name: str, env: Dict[str, str], state_dir: Path, peer: bool):
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.env = {
+            **env,
+            "SPLITUP_COMPUTE_SERVICE_NAME": name,
+            "SPLITUP_COMPUTE_SERVICE_API_PORT": str(self.port),
+            "SPLITUP_COMPUTE_SERVICE_STATE_DIR": str(state_dir),
+            "SPLITUP_COMPUTE_SERVICE_NODE_PROFILE": str(state_dir / "node-profile.json"),
+        }
+        if peer:
+            self.env["SPLITUP_COMPUTE_SERVICE_PEER_URL"] = self.url
+        self.log_path = state_dir.parent / f"{name}.log"
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self) -> None:
+        log = open(self.log_path, "ab")
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "src.main"],
+            cwd=SERVICE_DIR,
+            env=self.env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        log.close()
+
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            assert self.process.poll() is None, f"Node Exited, See {self.log_path}"
+            try:
+                if httpx.get(f"{self.url}/health/ready").status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        raise TimeoutError(f"Node Not Ready After {STARTUP_TIMEOUT}s, See {self.log_path}")
+
+    def stop(self) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            self.process.wait(timeout=30)
+        self.process = None
+
+    def run(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Submit A Task And Wait For Its Result."""
+        response = httpx.post(f"{self.url}/task_execution", json=body)
+        assert response.status_code == 200, response.text
+
+        deadline = time.monotonic() + TASK_TIMEOUT
+        while time.monotonic() < deadline:
+            status = httpx.get(f"{self.url}/execution/{body['execution_id']}/status")
+            if status.status_code == 200:
+                return status.json()
+            time.sleep(0.2)
+        raise TimeoutError(f"Execution {body['execution_id']} Did Not Finish, See {self.log_path}")
+
+
+@pytest.fixture(scope="module")
+def cluster(tmp_path_factory) -> Iterator[Dict[str, Any]]:
+    tmp_path = tmp_path_factory.mktemp("peers")
+
+    s3_port = free_port()
+    s3_server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=s3_port)
+    s3_server.start()
+    aux = ThreadingHTTPServer(("127.0.0.1", 0), AuxHandler)
+    threading.Thread(target=aux.serve_forever, daemon=True).start()
+    aux_url = f"http://127.0.0.1:{aux.server_address[1]}"
+
+    s3 = boto3.client(
+        "s3",
+        endpoint_url=f"http://127.0.0.1:{s3_port}",
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+    )
+    s3.create_bucket(Bucket=BUCKET)
+    s3.put_object(Bucket=BUCKET, Key="weights.bin", Body=b"weights")
+
+    # A produces x @ w, B adds one to the first rows of it
+    ctx = TensorContext()
+    x = ctx.add_graph_input("x", (8, 16))
+    w = ctx.add_graph_input("w", (16, 16))
+    s3.put_object(Bucket=BUCKET, Key="tasks/produce.pkl", Body=ctx.compile_to_graph(x @ w).to_bytes())
+    ctx = TensorContext()
+    rows = ctx.add_graph_input("rows", (2, 16))
+    s3.put_object(Bucket=BUCKET, Key="tasks/consume.pkl", Body=ctx.compile_to_graph(rows + 1).to_bytes())
+
+    rng = np.random.default_rng(0)
+    arrays = {name: rng.standard_normal(shape).astype(np.float32) for name, shape in [("x", (8, 16)), ("w", (16, 16))]}
+    for name, array in arrays.items():
+        data = TensorSerializer.tensor_to_bytes(Tensor(array).realize())
+        s3.put_object(Bucket=BUCKET, Key=f"inputs/{name}.tensor", Body=data)
+
+    env = {
+        **os.environ,
+        "AWS_ACCESS_KEY_ID": "test",
+        "AWS_SECRET_ACCESS_KEY": "test",
+        "SPLITUP_STORAGE_S3_BUCKET": BUCKET,
+        "SPLITUP_STORAGE_API_ENDPOINT": f"http://127.0.0.1:{s3_port}",
+        "SPLITUP_STORAGE_API_KEY": "test",
+        "SPLITUP_STORAGE_REGION": "us-east-1",
+        "SPLITUP_COMPUTE_SERVICE_HEARTBEAT_URL": f"{aux_url}/heartbeat",
+        "SPLITUP_COMPUTE_SERVICE_LISTENER_URL": f"{aux_url}/listener",
+        "SPLITUP_COMPUTE_SERVICE_CONFIG_URL": f"{aux_url}/config",
+    }
+    producer = Node("producer", env, tmp_path / "producer", peer=True)
+    consumer = Node("consumer", env, tmp_path / "consumer", peer=False)
+    try:
+        producer.start()
+        consumer.start()
+        yield {
+            "s3": s3,
+            "producer": producer,
+            "consumer": consumer,
+            "expected": arrays["x"] @ arrays["w"],
+        }
+    finally:
+        producer.stop()
+        consumer.stop()
+        aux.shutdown()
+        s3_server.stop()
+
+
+def consume(cluster: Dict[str, Any], execution_id: str, key: str, peer_url: str) -> np.ndarray:
+    """Run B On The First Two Rows Of A's Result, Returning B's Output."""
+    result = cluster["consumer"].run(
+        {
+            "execution_id": execution_id,
+            "task_id": "consume",
+            "task_storage_key": "tasks/consume.pkl",
+            "input_storage_keys": [{"key": key, "ranges": [[0, 2]], "name": "rows"}],
+            "input_peers": {key: peer_url},
+        }
+    )
+    assert result["status"] == "success", result
+    output_key = result["tensor_urls"][0].split("/", 3)[3]
+    data = cluster["s3"].get_object(Bucket=BUCKET, Key=output_key)["Body"].read()
+    return TensorSerializer.tensor_from_bytes(data).numpy()
+
+
+def test_peer_serves_results_and_falls_back_to_s3(cluster):
+    s3 = cluster["s3"]
+    produced = cluster["producer"].run(
+        {
+            "execution_id": "produce",
+            "task_id": "produce",
+            "task_storage_key": "tasks/produce.pkl",
+            "input_storage_keys": ["inputs/x.tensor", "inputs/w.tensor"],
+        }
+    )
+    assert produced["status"] == "success", produced
+    key = produced["tensor_urls"][0].split("/", 3)[3]
+    peer_url: str = produced["peer_urls"][0]
+    assert peer_url.startswith(cluster["producer"].url)
+
+    # The peer serves the same bytes as S3, whole and in ranges
+    stored = s3.get_object(Bucket=BUCKET, Key=key)["Body"].read()
+    assert httpx.get(peer_url).content == stored
+    ranged = httpx.get(peer_url, headers={"Range": "bytes=10-99"})
+    assert ranged.status_code == 206
+    assert ranged.content == stored[10:100]
+
+    # With the result gone from S3, B can only have read it from A
+    s3.delete_object(Bucket=BUCKET, Key=key)
+    expected = cluster["expected"][:2] + 1
+    np.testing.assert_allclose(consume(cluster, "from-peer", key, peer_url), expected, rtol=1e-5)
+
+    # A restarted has an empty peer cache, so B falls back to S3
+    s3.put_object(Bucket=BUCKET, Key=key, Body=stored)
+    cluster["producer"].stop()
+    cluster["producer"].start()
+    assert httpx.get(peer_url).status_code == 404
+    np.testing.assert_allclose(consume(cluster, "from-s3", key, peer_url), expected, rtol=1e-5)
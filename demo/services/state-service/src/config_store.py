@@ -0,0 +1,106 @@
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+from .result import create_success, create_failure, Result
+from .models import SystemConfig
+from .storage import load_config_file, save_config_file
+
+
+def config_etag(config: SystemConfig) -> str:
+    """Get The Entity Tag Of A Configuration, Derived From Its Contents."""
+    digest = hashlib.sha256(config.model_dump_json().encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+# In-memory configuration
+class ConfigStore:
+    """
+    Serves The Configuration From Memory.
+
+    The file is read once, then again only when it changes on disk, which
+    a background task checks by polling its modification time and size.
+    Every change bumps the version and the entity tag, so clients can ask
+    whether their copy is current without downloading it again.
+    """
+
+    def __init__(self, logger: logging.Logger, config_path: Path, poll_interval: float = 1.0):
+        self.logger = logger
+        self.config_path = config_path
+        self.poll_interval = poll_interval
+        self.config: Optional[SystemConfig] = None
+        self.etag: Optional[str] = None
+        self.version = 0
+        self._signature: Optional[Tuple[int, int]] = None  # mtime_ns, size of the loaded file
+        self._watcher: Optional[asyncio.Task] = None
+        self.on_change: Optional[Callable[[], None]] = None  # called when the version changes
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        """Get The Modification Time And Size Of The File, None If It Is Missing."""
+        try:
+            stat = self.config_path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _set(self, config: SystemConfig) -> None:
+        """Replace The Configuration, Bumping The Version If It Changed."""
+        etag = config_etag(config)
+        changed = etag != self.etag
+        if changed:
+            self.version += 1
+            self.etag = etag
+        self.config = config
+        self._signature = self._file_signature()
+        if changed and self.on_change is not None:
+            self.on_change()
+
+    def load(self) -> Result[SystemConfig, str]:
+        """Read The Configuration From Disk."""
+        config_result = load_config_file(self.config_path)
+        if config_result.status == "failure":
+            return config_result
+        self._set(config_result.data)
+        return create_success(config_result.data)
+
+    def get(self) -> Result[SystemConfig, str]:
+        """Get The Current Configuration, Loading It If It Has Not Been Yet."""
+        if self.config is None:
+            return self.load()
+        return create_success(self.config)
+
+    def save(self, config: SystemConfig) -> Result[SystemConfig, str]:
+        """Write A Configuration To Disk And Serve It From Now On."""
+        save_result = save_config_file(config, self.config_path)
+        if save_result.status == "failure":
+            return create_failure(save_result.error)
+        self._set(config)
+        return create_success(config)
+
+    def start(self) -> None:
+        """Start Watching The File For Changes Made Outside The Service."""
+        self._watcher = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        """Stop Watching The File."""
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+
+    async def _watch(self) -> None:
+        """Reload The Configuration Whenever The File Changes."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            signature = self._file_signature()
+            if signature is None or signature == self._signature:
+                continue
+
+            previous = self.version
+            loaded = self.load()
+            if loaded.status == "failure":
+                # Keep serving the last valid configuration until the file is fixed
+                self.logger.error(f"Ignoring Invalid Configuration File: {loaded.error}")
+                self._signature = signature
+            elif self.version != previous:
+                self.logger.info(f"Configuration File Changed, Now At Version {self.version}")
@@ -1,20 +1,25 @@
-import httpx
 import uvicorn
 import logging
 import sys
+from contextlib import asynccontextmanager
+from typing import List, Optional
 from urllib.parse import urlparse
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Response
 from pydantic import BaseModel, model_validator
 from functools import lru_cache
 from .result import create_success, create_failure, Result
 from .logger import setup_logger
-from .storage import (
-    load_config_file,
-    save_config_file,
-    get_config_path,
-)
+from .storage import get_config_path
+from .config_store import ConfigStore
+from .notifier import ConfigNotifier
 from .environment import load_env_config
-from .models import SystemConfig, SystemConfigUpdateRequest, ErrorResponse
+from .models import (
+    SystemConfig,
+    SystemConfigUpdateRequest,
+    ErrorResponse,
+    SubscriberRequest,
+    SubscriberStatus,
+)
 
 
 # Dependency for logger
@@ -32,6 +37,10 @@ class EnvSettings(BaseModel):
     SPLITUP_STATE_SERVICE_LOG_LEVEL: str = "INFO"
     SPLITUP_STATE_SERVICE_API_PORT: int = 8000
     SPLITUP_STATE_SERVICE_NOTIFICATION_URL: str
+    SPLITUP_STATE_SERVICE_CONFIG_POLL_INTERVAL: float = 1.0
+    SPLITUP_STATE_SERVICE_NOTIFY_CONCURRENCY: int = 32
+    SPLITUP_STATE_SERVICE_NOTIFY_MAX_ATTEMPTS: int = 5
+    SPLITUP_STATE_SERVICE_NOTIFY_TIMEOUT: float = 5.0
 
     class Config:
         """Pydantic Model Configuration."""
@@ -50,43 +59,18 @@ class EnvSettings(BaseModel):
             raise ValueError(f"Invalid URL: {str(e)}")
 
 
-# Notification service
-async def notify_config_change(
-    config: SystemConfig, notification_url: str, logger: logging.Logger
-) -> Result[None, str]:
-    """Notify Another Service About Configuration Changes."""
-    try:
-        logger.info(f"Notifying {notification_url} about configuration change")
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                notification_url,
-                json={"event": "config_changed", "data": config.model_dump()},
-            )
-            response.raise_for_status()
-        return create_success(None)
-    except Exception as e:
-        logger.error(f"Failed to Notify About Configuration Change: {str(e)}")
-        return create_failure(f"Failed to Notify About Configuration Change: {str(e)}")
-
-
 # Configuration service
 class ConfigService:
     """Service Class To Handle Configuration Operations."""
 
-    def __init__(self, logger: logging.Logger, notification_url: str):
+    def __init__(self, logger: logging.Logger, config_store: ConfigStore):
         self.logger = logger
-        self.notification_url = notification_url
+        self.config_store = config_store
 
     def get_config(self) -> Result[SystemConfig, str]:
         """Get The Current Configuration."""
-        self.logger.info("Retrieving Configuration")
-
-        config_path_result = get_config_path()
-        if config_path_result.status == "failure":
-            self.logger.error(config_path_result.error)
-            return create_failure(config_path_result.error)
-
-        return load_config_file(config_path_result.data)
+        self.logger.debug("Retrieving Configuration")
+        return self.config_store.get()
 
     def update_config(
         self, update: SystemConfigUpdateRequest
@@ -94,18 +78,14 @@ class ConfigService:
         """Update The Configuration with Provided Values."""
         self.logger.info(f"Updating Configuration: {update}")
 
-        config_path_result = get_config_path()
-        if config_path_result.status == "failure":
-            self.logger.error(config_path_result.error)
-            return create_failure(config_path_result.error)
-
-        config_result = load_config_file(config_path_result.data)
+        config_result = self.config_store.get()
 
         if config_result.status == "failure":
             self.logger.error(config_result.error)
             return create_failure(config_result.error)
 
-        current_config = config_result.data
+        # The served copy is never modified in place
+        current_config = config_result.data.model_copy()
 
         # Update only the fields that are provided
         update_dict = update.model_dump(exclude_unset=True)
@@ -114,59 +94,101 @@ class ConfigService:
                 setattr(current_config, key, value)
 
         # Save the updated configuration
-        save_result = save_config_file(current_config, config_path_result.data)
+        save_result = self.config_store.save(current_config)
         if save_result.status == "failure":
             self.logger.error(save_result.error)
             return create_failure(save_result.error)
 
         return create_success(current_config)
 
-    async def notify_config_change(self) -> Result[None, str]:
-        """Notify Another Service about Configuration Changes."""
-        config_result = self.get_config()
-        if config_result.status == "failure":
-            self.logger.error(config_result.error)
-            return create_failure(config_result.error)
 
-        return await notify_config_change(
-            config_result.data, self.notification_url, self.logger
-        )
+# Application setup
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application Lifespan Manager for Startup and Shutdown Events."""
+    logger = get_logger()
+    config_store: ConfigStore = app.state.config_store
+    env_config = app.state.env_config
+
+    # Changes reach subscribers in the background, never delaying the request
+    app.state.notifier = ConfigNotifier(
+        logger=logger,
+        config_store=config_store,
+        registry_path=config_store.config_path.with_name("subscribers.json"),
+        concurrency=env_config.SPLITUP_STATE_SERVICE_NOTIFY_CONCURRENCY,
+        max_attempts=env_config.SPLITUP_STATE_SERVICE_NOTIFY_MAX_ATTEMPTS,
+        timeout=env_config.SPLITUP_STATE_SERVICE_NOTIFY_TIMEOUT,
+    )
+    started = app.state.notifier.start([env_config.SPLITUP_STATE_SERVICE_NOTIFICATION_URL])
+    if started.status == "failure":
+        raise Exception(f"Failed To Load Subscribers: {started.error}")
+    config_store.on_change = app.state.notifier.notify
+    config_store.start()
 
+    yield
+
+    await config_store.stop()
+    await app.state.notifier.stop()
 
-# Application setup
-app = FastAPI(title="State Service API")
+
+app = FastAPI(title="State Service API", lifespan=lifespan)
 
 # Store environment config at app state level
 app.state.env_config = None
 
 
-# Dependency to get notification URL
-def get_notification_url():
-    """Get Notification URL From Environment Configuration."""
-    if app.state.env_config is None:
-        raise RuntimeError("Environment Configuration Not Initialized")
-    return app.state.env_config.SPLITUP_STATE_SERVICE_NOTIFICATION_URL
+# Dependency for config store
+def get_config_store() -> ConfigStore:
+    """Get The Shared Configuration Store."""
+    return app.state.config_store
+
+
+# Dependency for config notifier
+def get_notifier() -> ConfigNotifier:
+    """Get The Shared Configuration Notifier."""
+    return app.state.notifier
 
 
 # Dependency for config service
 def get_config_service(
     logger: logging.Logger = Depends(get_logger),
-    notification_url: str = Depends(get_notification_url),
+    config_store: ConfigStore = Depends(get_config_store),
 ) -> ConfigService:
     """Get The Configuration Service Instance."""
-    return ConfigService(logger, notification_url)
+    return ConfigService(logger, config_store)
+
+
+def set_version_headers(response: Response, config_store: ConfigStore) -> None:
+    """Tag A Response With The Version Of The Configuration It Carries."""
+    response.headers["ETag"] = config_store.etag
+    response.headers["X-Config-Version"] = str(config_store.version)
 
 
 @app.get(
-    "/config", response_model=SystemConfig, responses={500: {"model": ErrorResponse}}
+    "/config",
+    response_model=SystemConfig,
+    responses={304: {"description": "Not Modified"}, 500: {"model": ErrorResponse}},
 )
-async def get_config(config_service: ConfigService = Depends(get_config_service)):
-    """Get The Current Configuration."""
+async def get_config(
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    config_service: ConfigService = Depends(get_config_service),
+):
+    """Get The Current Configuration, Or 304 If The Client's Copy Is Current."""
     result = config_service.get_config()
 
     if result.status == "failure":
         raise HTTPException(status_code=500, detail=result.error)
 
+    config_store = config_service.config_store
+    if if_none_match is not None and config_store.etag in {
+        tag.strip() for tag in if_none_match.split(",")
+    }:
+        not_modified = Response(status_code=304)
+        set_version_headers(not_modified, config_store)
+        return not_modified
+
+    set_version_headers(response, config_store)
     return result.data
 
 
@@ -175,24 +197,60 @@ async def get_config(config_service: ConfigService = Depends(get_config_service)
 )
 async def update_config(
     update: SystemConfigUpdateRequest,
+    response: Response,
     config_service: ConfigService = Depends(get_config_service),
 ):
-    """Update The Configuration."""
+    """Update The Configuration, Notifying Subscribers In The Background."""
     result = config_service.update_config(update)
 
     if result.status == "failure":
         raise HTTPException(status_code=500, detail=result.error)
+    set_version_headers(response, config_service.config_store)
+
+    return result.data
+
+
+@app.get("/subscribers", response_model=List[SubscriberStatus])
+async def list_subscribers(notifier: ConfigNotifier = Depends(get_notifier)):
+    """List Configuration Subscribers And What Has Been Delivered To Them."""
+    return notifier.statuses()
 
-    # Notify About The Configuration Change
-    notify_result = await config_service.notify_config_change()
-    if notify_result.status == "failure":
-        config_service.logger.warning(
-            f"Failed to Notify About Configuration Change: {notify_result.error}"
-        )
+
+@app.post(
+    "/subscribers",
+    response_model=SubscriberStatus,
+    responses={500: {"model": ErrorResponse}},
+)
+async def add_subscriber(
+    request: SubscriberRequest, notifier: ConfigNotifier = Depends(get_notifier)
+):
+    """Register A Service To Be Notified Of Configuration Changes."""
+    result = notifier.subscribe(request.url)
+
+    if result.status == "failure":
+        raise HTTPException(status_code=500, detail=result.error)
 
     return result.data
 
 
+@app.delete(
+    "/subscribers",
+    responses={404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+)
+async def remove_subscriber(
+    url: str = Query(...), notifier: ConfigNotifier = Depends(get_notifier)
+):
+    """Stop Notifying A Service Of Configuration Changes."""
+    result = notifier.unsubscribe(url)
+
+    if result.status == "failure":
+        raise HTTPException(status_code=500, detail=result.error)
+    if not result.data:
+        raise HTTPException(status_code=404, detail=f"Subscriber {url} Not Found")
+
+    return {"success": True, "message": f"Removed Subscriber {url}"}
+
+
 def main():
     """Main Entry Point For The Application."""
     # Load Configuration From Environment
@@ -216,7 +274,13 @@ def main():
         logger.error(config_path_result.error)
         sys.exit(1)
 
-    config_result = load_config_file(config_path_result.data)
+    # Serve the configuration from memory, reloading it when the file changes
+    app.state.config_store = ConfigStore(
+        logger=logger,
+        config_path=config_path_result.data,
+        poll_interval=app.state.env_config.SPLITUP_STATE_SERVICE_CONFIG_POLL_INTERVAL,
+    )
+    config_result = app.state.config_store.load()
 
     if config_result.status == "failure":
         logger.error(config_result.error)
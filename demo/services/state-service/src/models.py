@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from typing import Optional
+from urllib.parse import urlparse
 
 
 class SystemConfig(BaseModel):
@@ -35,3 +36,27 @@ class ErrorResponse(BaseModel):
     """Response model for errors."""
 
     error: str
+
+
+# Subscriber models
+class SubscriberRequest(BaseModel):
+    """Request model for registering a configuration subscriber."""
+
+    url: str
+
+    @model_validator(mode="after")
+    def validate_url(self):
+        """Validate That The Subscriber URL Is A Valid URL."""
+        result = urlparse(self.url)
+        if not all([result.scheme, result.netloc]):
+            raise ValueError(f"URL {self.url} Must Have A Scheme And Host")
+        return self
+
+
+class SubscriberStatus(BaseModel):
+    """Delivery state of one configuration subscriber."""
+
+    url: str
+    delivered_version: int  # latest configuration version the subscriber acknowledged
+    pending: bool  # a newer version has not been delivered yet
+    last_error: Optional[str] = None
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+import httpx
+from .result import create_success, create_failure, Result
+from .config_store import ConfigStore
+from .models import SubscriberStatus
+from .storage import load_subscribers_file, save_subscribers_file
+
+# Seconds before the first retry of a failed notification, doubled after each
+INITIAL_BACKOFF = 0.5
+
+
+class Subscriber:
+    """One Service Told About Configuration Changes, Delivered To In Order."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.delivered_version = 0
+        self.last_error: Optional[str] = None
+        self.changed = asyncio.Event()  # set when a newer version is waiting
+        self.task: Optional[asyncio.Task] = None
+
+
+# Configuration change fan-out
+class ConfigNotifier:
+    """
+    Pushes Configuration Changes To Every Registered Subscriber.
+
+    Each subscriber has its own delivery loop, so a slow or failing
+    subscriber never holds up the others, and at most `concurrency`
+    notifications are in flight at once. Changes are coalesced: a
+    subscriber that is busy or retrying while the configuration changes
+    again is sent only the latest version.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        config_store: ConfigStore,
+        registry_path: Path,
+        concurrency: int = 32,
+        max_attempts: int = 5,
+        timeout: float = 5.0,
+    ):
+        self.logger = logger
+        self.config_store = config_store
+        self.registry_path = registry_path
+        self.max_attempts = max_attempts
+        self.subscribers: Dict[str, Subscriber] = {}
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._client = httpx.AsyncClient(
+            timeout=timeout, limits=httpx.Limits(max_connections=concurrency)
+        )
+
+    def start(self, initial: List[str]) -> Result[None, str]:
+        """Start Delivering To Registered Subscribers And The Given URLs."""
+        registry = load_subscribers_file(self.registry_path)
+        if registry.status == "failure":
+            return create_failure(registry.error)
+        for url in [*registry.data, *initial]:
+            self._add(url)
+        return self._save()
+
+    async def stop(self) -> None:
+        """Stop Every Delivery Loop And Close Connections."""
+        for subscriber in self.subscribers.values():
+            subscriber.task.cancel()
+        await asyncio.gather(
+            *(subscriber.task for subscriber in self.subscribers.values()),
+            return_exceptions=True,
+        )
+        await self._client.aclose()
+
+    def _add(self, url: str) -> Subscriber:
+        """Start Delivering To A Subscriber, Which Is Up To Date From Now On."""
+        subscriber = self.subscribers.get(url)
+        if subscriber is None:
+            subscriber = Subscriber(url)
+            subscriber.delivered_version = self.config_store.version
+            subscriber.task = asyncio.create_task(self._deliver(subscriber))
+            self.subscribers[url] = subscriber
+        return subscriber
+
+    def _save(self) -> Result[None, str]:
+        """Persist The Subscriber URLs."""
+        return save_subscribers_file(sorted(self.subscribers), self.registry_path)
+
+    def subscribe(self, url: str) -> Result[SubscriberStatus, str]:
+        """Register A Subscriber."""
+        subscriber = self._add(url)
+        saved = self._save()
+        if saved.status == "failure":
+            return create_failure(saved.error)
+        self.logger.info(f"Registered Configuration Subscriber {url}")
+        return create_success(self._status(subscriber))
+
+    def unsubscribe(self, url: str) -> Result[bool, str]:
+        """Remove A Subscriber, Returning Whether It Was Registered."""
+        subscriber = self.subscribers.pop(url, None)
+        if subscriber is None:
+            return create_success(False)
+        subscriber.task.cancel()
+        saved = self._save()
+        if saved.status == "failure":
+            return create_failure(saved.error)
+        self.logger.info(f"Removed Configuration Subscriber {url}")
+        return create_success(True)
+
+    def notify(self) -> None:
+        """Schedule Delivery Of The Current Configuration To Every Subscriber."""
+        for subscriber in self.subscribers.values():
+            subscriber.changed.set()
+
+    def statuses(self) -> List[SubscriberStatus]:
+        """Get The Delivery State Of Every Subscriber."""
+        return [self._status(subscriber) for subscriber in self.subscribers.values()]
+
+    def _status(self, subscriber: Subscriber) -> SubscriberStatus:
+        """Get The Delivery State Of One Subscriber."""
+        return SubscriberStatus(
+            url=subscriber.url,
+            delivered_version=subscriber.delivered_version,
+            pending=subscriber.delivered_version < self.config_store.version,
+            last_error=subscriber.last_error,
+        )
+
+    async def _deliver(self, subscriber: Subscriber) -> None:
+        """Send A Subscriber Each Newer Configuration, Retrying With Backoff."""
+        while True:
+            await subscriber.changed.wait()
+            subscriber.changed.clear()
+
+            attempt = 0
+            backoff = INITIAL_BACKOFF
+            while subscriber.delivered_version < self.config_store.version:
+                sent = await self._send(subscriber)
+                if sent.status == "success":
+                    subscriber.last_error = None
+                    break
+
+                attempt += 1
+                subscriber.last_error = sent.error
+                if attempt >= self.max_attempts:
+                    self.logger.error(
+                        f"Giving Up Notifying {subscriber.url} After {attempt} Attempts: {sent.error}"
+                    )
+                    break
+
+                # A newer change cuts the wait short, and is what gets sent next
+                try:
+                    await asyncio.wait_for(subscriber.changed.wait(), timeout=backoff)
+                    subscriber.changed.clear()
+                except asyncio.TimeoutError:
+                    pass
+                backoff *= 2
+
+    async def _send(self, subscriber: Subscriber) -> Result[None, str]:
+        """Send The Current Configuration To A Subscriber."""
+        config_result = self.config_store.get()
+        if config_result.status == "failure":
+            return create_failure(config_result.error)
+        version = self.config_store.version
+
+        try:
+            async with self._semaphore:
+                response = await self._client.post(
+                    subscriber.url,
+                    json={
+                        "event": "config_changed",
+                        "version": version,
+                        "etag": self.config_store.etag,
+                        "data": config_result.data.model_dump(),
+                    },
+                )
+                response.raise_for_status()
+        except Exception as e:
+            return create_failure(f"Failed to Notify {subscriber.url}: {str(e)}")
+
+        subscriber.delivered_version = max(subscriber.delivered_version, version)
+        return create_success(None)
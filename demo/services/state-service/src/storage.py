@@ -1,6 +1,7 @@
 import json
 import os
 from pathlib import Path
+from typing import List
 from .result import create_success, create_failure, Result
 from .models import SystemConfig, DefaultConfig
 
@@ -53,3 +54,31 @@ def save_config_file(config: SystemConfig, config_path: Path) -> Result[None, st
         return create_success(None)
     except Exception as e:
         return create_failure(f"Failed to Save Config File: {str(e)}")
+
+
+def load_subscribers_file(subscribers_path: Path) -> Result[List[str], str]:
+    """Load the URLs of configuration subscribers from a JSON file."""
+    try:
+        if not subscribers_path.exists():
+            return create_success([])
+
+        with open(subscribers_path, "r") as f:
+            subscribers = json.load(f)
+
+        if not isinstance(subscribers, list) or not all(
+            isinstance(url, str) for url in subscribers
+        ):
+            return create_failure("Subscribers File Must Hold A List Of URLs")
+        return create_success(subscribers)
+    except Exception as e:
+        return create_failure(f"Failed to Load Subscribers File: {str(e)}")
+
+
+def save_subscribers_file(subscribers: List[str], subscribers_path: Path) -> Result[None, str]:
+    """Save the URLs of configuration subscribers to a JSON file."""
+    try:
+        with open(subscribers_path, "w") as f:
+            json.dump(subscribers, f, indent=2)
+        return create_success(None)
+    except Exception as e:
+        return create_failure(f"Failed to Save Subscribers File: {str(e)}")